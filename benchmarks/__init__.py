@@ -0,0 +1,2 @@
+"""Stand-alone performance scripts. Run them from the repo root, e.g.
+``python -m benchmarks.board_backend``."""
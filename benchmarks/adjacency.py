@@ -0,0 +1,59 @@
+"""
+Bulk adjacency counting vs. the old per-cell neighbour loop.
+
+Both Board implementations are timed at 600x600; the bulk result is
+checked cell-for-cell against the reference loop (including the -1 marker).
+"""
+import random
+import time
+
+import classic_board
+import ms_board
+
+ROWS, COLS = 600, 600
+MINES = ROWS * COLS // 6
+
+
+def reference_counts(board, neighbors):
+    """The per-cell generator loop both boards used before grid_utils.adjacency_counts."""
+    counts = []
+    for r in range(board.rows):
+        for c in range(board.cols):
+            if board.grid[r][c].is_mine:
+                counts.append(-1)
+                continue
+            counts.append(sum(1 for n in neighbors(r, c) if n.is_mine))
+    return counts
+
+
+def current_counts(board, attr):
+    return [getattr(cell, attr) for row in board.grid for cell in row]
+
+
+def bench(name, board, neighbors, attr):
+    start = time.perf_counter()
+    expected = reference_counts(board, neighbors)
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    board._compute_adjacencies()
+    bulk_s = time.perf_counter() - start
+
+    assert current_counts(board, attr) == expected, f"{name}: adjacency mismatch"
+    print(f"{name:<24} per-cell {loop_s * 1000:9.1f} ms   bulk {bulk_s * 1000:8.1f} ms   "
+          f"speedup {loop_s / bulk_s:5.1f}x")
+
+
+def main():
+    random.seed(1234)
+    board = ms_board.Board(ROWS, COLS, MINES)
+    bench("ms_board.Board", board, board._neighbors, "adjacent_mines")
+
+    random.seed(1234)
+    board = classic_board.Board(ROWS, COLS, MINES)
+    board.place_mines(ROWS // 2, COLS // 2)
+    bench("classic_board.Board", board, board.neighbors, "adj")
+
+
+if __name__ == "__main__":
+    main()
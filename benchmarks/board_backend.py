@@ -0,0 +1,81 @@
+"""
+Memory and latency comparison between the object-grid ms_board.Board and
+the NumPy-backed np_board.ArrayBoard on the game.py presets.
+"""
+import random
+import time
+import tracemalloc
+
+from grid_utils import neighbor_table
+from ms_board import Board
+from np_board import ArrayBoard
+
+PRESETS = [
+    ("9x9", 9, 9, 10),
+    ("50x80", 50, 80, 400),
+    ("600x600", 600, 600, 600 * 600 // 6),
+]
+
+
+def _measure_memory(board_cls, rows, cols, mines):
+    tracemalloc.start()
+    board = board_cls(rows, cols, mines)
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return board, current
+
+
+def _first_zero(board):
+    for r in range(board.rows):
+        for c in range(board.cols):
+            cell = board.grid[r][c]
+            if not cell.is_mine and cell.adjacent_mines == 0:
+                return r, c
+    return 0, 0
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000.0
+
+
+def bench(board_cls, rows, cols, mines):
+    # The neighbour table is shared per board shape; build it up front so
+    # the memory column only shows what each board allocates itself.
+    neighbor_table(rows, cols)
+
+    random.seed(1234)
+    _, mem_bytes = _measure_memory(board_cls, rows, cols, mines)
+
+    random.seed(1234)
+    start = time.perf_counter()
+    board = board_cls(rows, cols, mines)
+    build_ms = (time.perf_counter() - start) * 1000.0
+
+    r, c = _first_zero(board)
+    reveal_ms = _timed(board.reveal_cell, r, c)
+    victory_ms = _timed(board._check_victory)
+    return {
+        "memory_kb": mem_bytes / 1024.0,
+        "build_ms": build_ms,
+        "first_reveal_ms": reveal_ms,
+        "check_victory_ms": victory_ms,
+    }
+
+
+def main():
+    header = f"{'preset':<9} {'backend':<11} {'memory KB':>11} {'build ms':>10} {'reveal ms':>10} {'victory ms':>11}"
+    print(header)
+    print("-" * len(header))
+    for name, rows, cols, mines in PRESETS:
+        for label, cls in (("Board", Board), ("ArrayBoard", ArrayBoard)):
+            res = bench(cls, rows, cols, mines)
+            print(
+                f"{name:<9} {label:<11} {res['memory_kb']:>11.1f} {res['build_ms']:>10.2f} "
+                f"{res['first_reveal_ms']:>10.2f} {res['check_victory_ms']:>11.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
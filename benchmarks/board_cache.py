@@ -0,0 +1,66 @@
+"""
+Dealing a seeded board cold vs. from the on-disk board cache.
+
+For each preset, place_mines() runs on classic_board.Board for a few
+fixed seeds twice: first with an empty cache (generation, adjacency
+counting and the cache write), then again with every key cached. Both
+runs must deal identical layouts. The no-guess rows use an in-process
+NoGuessGenerator, where a hit skips the whole search.
+
+    python -m benchmarks.board_cache --seeds 5
+"""
+import argparse
+import tempfile
+import time
+
+import classic_board
+from board_cache import BoardCache
+from classic_board import Board
+from no_guess import NoGuessGenerator
+
+PRESETS = [
+    ("16x30", 16, 30, 99),
+    ("50x80", 50, 80, 600),
+    ("600x600", 600, 600, 60000),
+]
+NO_GUESS_PRESETS = [("16x30", 16, 30, 99), ("24x30", 24, 30, 130)]
+SEEDS = 5
+
+
+def deal(rows, cols, mines, seeds, generator=None):
+    """(mean ms per place_mines() call, layouts) over every seed."""
+    layouts = []
+    total = 0.0
+    for seed in seeds:
+        board = Board(rows, cols, mines, generator, seed)
+        start = time.perf_counter()
+        board.place_mines(rows // 2, cols // 2)
+        total += time.perf_counter() - start
+        layouts.append(bytes(cell.is_mine for cell in board._cells))
+    return total / len(seeds) * 1000, layouts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seeds", type=int, default=SEEDS)
+    args = parser.parse_args(argv)
+    seeds = range(args.seeds)
+
+    print(f"{'preset':<10} {'kind':<9} {'cold ms':>9} {'cached ms':>10} {'speedup':>8}")
+    rows_to_run = [(p, None) for p in PRESETS] + [(p, "no-guess") for p in NO_GUESS_PRESETS]
+    for (name, rows, cols, mines), kind in rows_to_run:
+        with tempfile.TemporaryDirectory() as directory:
+            classic_board.CACHE = BoardCache(directory)
+            generator = NoGuessGenerator(workers=0) if kind else None
+            try:
+                cold_ms, cold = deal(rows, cols, mines, seeds, generator)
+                warm_ms, warm = deal(rows, cols, mines, seeds, generator)
+            finally:
+                classic_board.CACHE = None
+            assert cold == warm, f"{name}: cached layouts differ"
+            print(f"{name:<10} {kind or 'plain':<9} {cold_ms:9.1f} {warm_ms:10.1f} "
+                  f"{cold_ms / warm_ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
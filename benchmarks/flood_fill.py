@@ -0,0 +1,83 @@
+"""
+Scanline flood fill vs. the old one-cell-at-a-time stack fill.
+
+Each engine opens a sparse board from a zero cell, so the cascade
+reveals nearly the whole board. The reference fill from tests.helpers
+runs first and its revealed cells and hidden-safe counter are checked
+against the scanline fill's on the same board.
+"""
+import random
+import time
+
+import classic_board
+import ms_board
+from tests.helpers import cell_state, reference_fill
+
+try:
+    from np_board import ArrayBoard
+except ImportError:
+    ArrayBoard = None
+
+SIZES = [(200, 200), (600, 600)]
+# Mines per cell: none at all, and sparse enough for one cascade to open almost everything.
+DENSITIES = [0.0, 0.001]
+
+
+def revealed_now(board):
+    if hasattr(board, "_revealed_buf"):
+        return bytes(board._revealed_buf)
+    return bytes(c.revealed for c in board._cells)
+
+
+def bench(name, board, start):
+    r, c = divmod(start, board.cols)
+    state = cell_state(board)
+    state[0][start] = 1
+    hidden_safe = board._hidden_safe
+    t = time.perf_counter()
+    expected = reference_fill(board, start, state)
+    stack_s = time.perf_counter() - t
+    expected_safe, board._hidden_safe = board._hidden_safe, hidden_safe
+
+    if hasattr(board, "_revealed_buf"):
+        board._revealed_buf[start] = 1
+    else:
+        board._cells[start].revealed = True
+    t = time.perf_counter()
+    changed = board._flood_fill(r, c)
+    scan_s = time.perf_counter() - t
+
+    assert sorted(changed) == sorted(expected), f"{name}: revealed cells differ"
+    assert revealed_now(board) == bytes(state[0]), f"{name}: board state differs"
+    assert board._hidden_safe == expected_safe, f"{name}: hidden-safe counter differs"
+    print(f"{name:<22} {board.rows}x{board.cols:<5} {len(changed):>7} cells   "
+          f"stack {stack_s * 1000:8.1f} ms   scanline {scan_s * 1000:7.1f} ms   "
+          f"speedup {stack_s / scan_s:4.1f}x")
+
+
+def first_zero(board):
+    state = cell_state(board)
+    return next(i for i in range(len(state[2])) if state[2][i] and not state[1][i])
+
+
+def main():
+    for rows, cols in SIZES:
+        for density in DENSITIES:
+            mines = int(rows * cols * density)
+            random.seed(1234)
+            board = ms_board.Board(rows, cols, mines)
+            bench("ms_board.Board", board, first_zero(board))
+
+            random.seed(1234)
+            board = classic_board.Board(rows, cols, mines)
+            board.place_mines(rows // 2, cols // 2)
+            bench("classic_board.Board", board, (rows // 2) * cols + cols // 2)
+
+            if ArrayBoard is not None:
+                random.seed(1234)
+                board = ArrayBoard(rows, cols, mines)
+                bench("np_board.ArrayBoard", board, first_zero(board))
+
+
+if __name__ == "__main__":
+    main()
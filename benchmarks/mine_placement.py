@@ -0,0 +1,49 @@
+"""
+Mine placement: full-shuffle (the old approach) vs grid_utils.sample_mines
+across mine densities on a 1000x1000 board, with a forbidden first-click zone.
+"""
+import random
+import time
+
+from grid_utils import DENSE_PLACEMENT_THRESHOLD, sample_mines
+
+ROWS, COLS = 1000, 1000
+DENSITIES = [0.001, 0.01, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.50, 0.80]
+
+
+def full_shuffle(total, count, forbidden):
+    positions = [i for i in range(total) if i not in forbidden]
+    random.shuffle(positions)
+    return positions[:count]
+
+
+def _best_of(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def main():
+    total = ROWS * COLS
+    centre = (ROWS // 2) * COLS + COLS // 2
+    forbidden = {centre + dr * COLS + dc for dr in (-1, 0, 1) for dc in (-1, 0, 1)}
+
+    print(f"{ROWS}x{COLS}, dense fallback above {DENSE_PLACEMENT_THRESHOLD:.0%}")
+    print(f"{'density':>8} {'mines':>8} {'shuffle ms':>11} {'sample ms':>10} {'speedup':>8}")
+    for density in DENSITIES:
+        count = int(total * density)
+        random.seed(1234)
+        mines = sample_mines(total, count, forbidden)
+        assert len(set(mines)) == count and not forbidden & set(mines)
+
+        shuffle_ms = _best_of(full_shuffle, total, count, forbidden)
+        sample_ms = _best_of(sample_mines, total, count, forbidden)
+        print(f"{density:>8.1%} {count:>8} {shuffle_ms:>11.1f} {sample_ms:>10.1f} "
+              f"{shuffle_ms / sample_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
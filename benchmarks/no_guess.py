@@ -0,0 +1,64 @@
+"""
+No-guess generation: acceptance rate and latency per board size.
+
+Generates --boards layouts per preset with no_guess.NoGuessGenerator,
+first in the calling process (workers=0) and then on a process pool, and
+reports the share of candidates the solver accepted, the mean and p95
+time to a board, and how many searches hit the timeout.
+
+    python -m benchmarks.no_guess --boards 20 --workers 4
+"""
+import argparse
+import os
+import random
+
+from no_guess import GENERATION_TIMEOUT, NoGuessGenerator
+
+PRESETS = [
+    ("9x9", 9, 9, 10),
+    ("16x16", 16, 16, 40),
+    ("16x30", 16, 30, 99),
+    ("24x30", 24, 30, 130),
+    ("50x80", 50, 80, 600),
+]
+BOARDS = 10
+SEED = 1234
+
+
+def bench(generator, rows, cols, mines, boards):
+    for _ in range(boards):
+        generator.generate(rows, cols, mines, rows // 2, cols // 2)
+    ordered = sorted(generator.latencies)
+    return {
+        "rate": generator.accepted / generator.candidates if generator.candidates else 0.0,
+        "candidates": generator.candidates,
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "fallbacks": generator.fallbacks,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boards", type=int, default=BOARDS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--timeout", type=float, default=GENERATION_TIMEOUT)
+    args = parser.parse_args(argv)
+
+    print(f"{'preset':<8} {'workers':>7} {'accepted':>9} {'candidates':>11} "
+          f"{'mean ms':>9} {'p95 ms':>9} {'fallbacks':>10}")
+    for workers in (0, args.workers):
+        for name, rows, cols, mines in PRESETS:
+            random.seed(SEED)
+            generator = NoGuessGenerator(workers, args.timeout)
+            if workers:
+                generator.generate(rows, cols, mines, 0, 0)  # start the pool
+                generator.reset_stats()
+            res = bench(generator, rows, cols, mines, args.boards)
+            generator.close()
+            print(f"{name:<8} {workers:>7} {res['rate']:>9.1%} {res['candidates']:>11} "
+                  f"{res['mean_ms']:>9.1f} {res['p95_ms']:>9.1f} {res['fallbacks']:>10}")
+
+
+if __name__ == "__main__":
+    main()
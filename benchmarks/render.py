@@ -0,0 +1,203 @@
+"""
+Offscreen rendering benchmark for both front-ends (SDL dummy video driver).
+
+Draws a fixed number of frames with minesweeper.draw_board and
+game.draw_game (a full repaint, as on the first frame or after a
+restart) for each window size, board size and board state:
+
+    fresh  nothing revealed
+    half   about half of the safe cells revealed
+    lost   a mine hit, then every cell revealed (reveal_all_cells)
+
+and reports frames per second, p95 frame time and allocations per frame.
+Allocations come from a second, traced pass with tracemalloc: "peak KB"
+is the transient Python allocation high-water mark of one frame, and
+"blocks" is the number of Python memory blocks still alive after it, so
+anything other than ~0 there means a frame leaks objects or grows a cache.
+SDL surface pixels are allocated in C and are not included.
+
+Run from the repository root (the game.py images are loaded from assets/):
+
+    python -m benchmarks.render --frames 120 --windows 800x600,1280x800
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import random
+import time
+import tracemalloc
+
+import pygame
+
+import game
+import minesweeper
+from classic_board import reveal_all_cells
+from viewport import Camera
+
+BOARDS = [
+    ("9x9", 9, 9, 10),
+    ("16x30", 16, 30, 99),
+    ("50x80", 50, 80, 400),
+    ("600x600", 600, 600, 600 * 600 // 6),
+]
+WINDOWS = [(800, 600), (1280, 800)]
+STATES = ["fresh", "half", "lost"]
+FRAMES = 60
+TRACED_FRAMES = 10
+SEED = 1234
+
+
+def _reveal_all(board):
+    if hasattr(board, "reveal_all"):
+        reveal_all_cells(board)
+        return
+    for row in board.grid:
+        for cell in row:
+            cell.revealed = True
+
+
+def prepare(board, reveal, state: str, seed: int = SEED):
+    """Bring a fresh board into one of STATES using its own reveal method."""
+    if state == "fresh":
+        return board
+    rows, cols = board.rows, board.cols
+    rng = random.Random(seed)
+    if not getattr(board, "mines_placed", True):
+        reveal(rows // 2, cols // 2)  # classic boards place their mines on the first click
+    safe = rows * cols - board.mines_count
+    order = [(r, c) for r in range(rows) for c in range(cols)]
+    rng.shuffle(order)
+    for r, c in order:
+        if safe - board._hidden_safe >= safe // 2:
+            break
+        cell = board.grid[r][c]
+        if not cell.is_mine and not cell.revealed:
+            reveal(r, c)
+    if state == "lost":
+        for r, c in order:
+            if board.grid[r][c].is_mine and not board.grid[r][c].revealed:
+                reveal(r, c)
+                break
+        _reveal_all(board)
+    return board
+
+
+class _MinesweeperView:
+    name = "minesweeper"
+
+    def __init__(self, screen, rows, cols, mines, state):
+        random.seed(SEED)
+        self.board = minesweeper.Board(rows, cols, mines)
+        prepare(self.board, self.board.reveal, state)
+        self.screen = screen
+        self.font = minesweeper.resources.get_font("consolas", 18, bold=True)
+        self.digit_font = minesweeper.resources.get_font("consolas", 22, bold=True)
+        self.camera = Camera(rows, cols, minesweeper.MIN_CELL_SIZE, *screen.get_size())
+        self.lost = state == "lost"
+        minesweeper.SEASIDE.invalidate()
+
+    def frame(self, i: int):
+        minesweeper.fit_board(*self.screen.get_size(), self.camera)
+        face = minesweeper.FACE_LOSE if self.lost else minesweeper.FACE_NEUTRAL
+        minesweeper.draw_board(self.screen, self.board, self.font, self.digit_font, 0.0, face,
+                               show_quit_button=self.lost, camera=self.camera, t=i / 60.0)
+        pygame.display.flip()
+
+
+class _GameView:
+    name = "game"
+
+    def __init__(self, screen, rows, cols, mines, state):
+        random.seed(SEED)
+        self.board = game.Board(rows, cols, mines)
+        prepare(self.board, self.board.reveal_cell, state)
+        self.screen = screen
+        self.cell_size, _, _ = game.compute_geometry(rows, cols)
+        width, height = screen.get_size()
+        self.font = game.resources.get_font("consolas", 22)
+        self.mine_img, self.flag_img = game.load_images(self.cell_size)
+        self.camera = Camera(rows, cols, self.cell_size, width - 2 * game.MARGIN,
+                             height - game.TOP_UI - game.MARGIN,
+                             origin=(game.MARGIN, game.TOP_UI))
+
+    def frame(self, i: int):
+        game.draw_game(self.screen, self.font, self.board, self.mine_img, self.flag_img,
+                       self.cell_size, None, self.camera)
+
+
+def bench(view, frames: int = FRAMES, traced_frames: int = TRACED_FRAMES) -> dict:
+    view.frame(0)  # warm-up: fills the background, tile and font caches
+
+    times = []
+    for i in range(1, frames + 1):
+        start = time.perf_counter()
+        view.frame(i)
+        times.append(time.perf_counter() - start)
+    times.sort()
+
+    ignore_self = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    tracemalloc.start()
+    peaks, blocks = [], []
+    for i in range(traced_frames):
+        before = tracemalloc.take_snapshot().filter_traces(ignore_self)
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        view.frame(frames + i)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(ignore_self)
+        peaks.append(peak - base)
+        blocks.append(sum(stat.count_diff for stat in after.compare_to(before, "filename")))
+    tracemalloc.stop()
+
+    return {
+        "fps": len(times) / sum(times),
+        "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+        "peak_kb": sum(peaks) / len(peaks) / 1024,
+        "blocks": sum(blocks) / len(blocks),
+    }
+
+
+def _parse_window(text: str):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offscreen rendering benchmark")
+    parser.add_argument("--frames", type=int, default=FRAMES)
+    parser.add_argument("--windows", default=",".join(f"{w}x{h}" for w, h in WINDOWS),
+                        help="comma-separated WxH list")
+    parser.add_argument("--boards", default=",".join(name for name, *_ in BOARDS),
+                        help=f"comma-separated subset of {', '.join(n for n, *_ in BOARDS)}")
+    parser.add_argument("--renderer", choices=["both", "minesweeper", "game"], default="both")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    boards = [b for b in BOARDS if b[0] in args.boards.split(",")]
+    views = [v for v in (_MinesweeperView, _GameView)
+             if args.renderer in ("both", v.name)]
+
+    print(f"{'renderer':<12} {'window':<10} {'board':<8} {'state':<6} "
+          f"{'fps':>8} {'p95 ms':>8} {'peak KB':>8} {'blocks':>7}")
+    for window in map(_parse_window, args.windows.split(",")):
+        screen = pygame.display.set_mode(window)
+        for view_cls in views:
+            for name, rows, cols, mines in boards:
+                for state in STATES:
+                    try:
+                        view = view_cls(screen, rows, cols, mines, state)
+                    except FileNotFoundError as exc:
+                        print(f"{view_cls.name:<12} skipped: {exc}")
+                        break
+                    res = bench(view, args.frames)
+                    print(f"{view_cls.name:<12} {window[0]}x{window[1]:<6} {name:<8} {state:<6} "
+                          f"{res['fps']:>8.1f} {res['p95_ms']:>8.2f} {res['peak_kb']:>8.1f} "
+                          f"{res['blocks']:>7.1f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Headless benchmark suite for the board engines (no pygame needed).
+
+Times the hot paths of ms_board.Board, classic_board.Board (the engine
+minesweeper.py uses) and, when NumPy is installed, np_board.ArrayBoard:
+
+    build        constructor
+    place_mines  mine placement (classic: place_mines(), which also counts adjacency)
+    adjacency    _compute_adjacencies() on a placed board
+    first_click  first reveal, flood fill included (classic: placement too)
+    chord_storm  chord() on every cell after the first click, all mines flagged
+    win_check    one _check_victory() / _check_win() call, in microseconds
+
+on the built-in presets and stress sizes up to 600x600, with fixed seeds.
+Every number is the best of --repeat runs.
+
+    python -m benchmarks.run                       # table on stdout
+    python -m benchmarks.run --json results.json   # also save machine-readable results
+    python -m benchmarks.run --baseline results.json
+                                 # compare, exit 1 if a metric regressed
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+import classic_board
+import ms_board
+from grid_utils import neighbor_table
+
+try:
+    from np_board import ArrayBoard
+except ImportError:
+    ArrayBoard = None
+
+PRESETS = [
+    ("9x9", 9, 9, 10),
+    ("16x16", 16, 16, 40),
+    ("16x30", 16, 30, 99),
+    ("50x80", 50, 80, 400),
+]
+STRESS = [
+    ("200x200", 200, 200, 200 * 200 // 6),
+    ("600x600", 600, 600, 600 * 600 // 6),
+]
+METRICS = ["build_ms", "place_mines_ms", "adjacency_ms", "first_click_ms",
+           "chord_storm_ms", "win_check_us"]
+
+SEED = 1234
+REPEAT = 5
+WIN_CHECK_CALLS = 10000
+# Differences below this many ms (or us for win_check) are treated as noise.
+NOISE_FLOOR = 0.5
+TOLERANCE = 0.25
+
+
+class _Engine:
+    """Uniform access to the two board APIs (row/col vs r/c naming)."""
+
+    def __init__(self, name, cls, reveal, check_win, adj_attr, first_click_places):
+        self.name = name
+        self.cls = cls
+        self.reveal = reveal
+        self.check_win = check_win
+        self.adj_attr = adj_attr
+        self.first_click_places = first_click_places
+
+
+def _engines():
+    engines = [
+        _Engine("ms_board", ms_board.Board, "reveal_cell", "_check_victory",
+                "adjacent_mines", False),
+        _Engine("classic_board", classic_board.Board, "reveal", "_check_win",
+                "adj", True),
+    ]
+    if ArrayBoard is not None:
+        engines.append(_Engine("np_board", ArrayBoard, "reveal_cell", "_check_victory",
+                               "adjacent_mines", False))
+    return engines
+
+
+def _timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000.0
+
+
+def _start_cell(engine, board):
+    """The zero cell closest to the centre: the classic engine guarantees the centre itself."""
+    rows, cols = board.rows, board.cols
+    if engine.first_click_places:
+        return rows // 2, cols // 2
+    best, best_d = (0, 0), None
+    for r in range(rows):
+        for c in range(cols):
+            cell = board.grid[r][c]
+            if cell.is_mine or getattr(cell, engine.adj_attr) != 0:
+                continue
+            d = abs(r - rows // 2) + abs(c - cols // 2)
+            if best_d is None or d < best_d:
+                best, best_d = (r, c), d
+    return best
+
+
+def _pos(cell):
+    return (cell.row, cell.col) if hasattr(cell, "row") else (cell.r, cell.c)
+
+
+def run_once(engine, rows, cols, mines, seed) -> dict:
+    res = {}
+
+    random.seed(seed)
+    start = time.perf_counter()
+    board = engine.cls(rows, cols, mines)
+    res["build_ms"] = (time.perf_counter() - start) * 1000.0
+
+    if engine.first_click_places:
+        res["place_mines_ms"] = _timed(board.place_mines, rows // 2, cols // 2)
+    else:
+        empty = engine.cls(rows, cols, 0)
+        empty.mines_count = mines
+        random.seed(seed)
+        res["place_mines_ms"] = _timed(empty._place_mines)
+    res["adjacency_ms"] = _timed(board._compute_adjacencies)
+
+    # First click on a fresh board with the same seed.
+    random.seed(seed)
+    board = engine.cls(rows, cols, mines)
+    r, c = _start_cell(engine, board)
+    res["first_click_ms"] = _timed(getattr(board, engine.reveal), r, c)
+
+    # Chord storm: flag every mine, then chord each cell in row-major order.
+    for row in board.grid:
+        for cell in row:
+            if cell.is_mine:
+                board.toggle_flag(*_pos(cell))
+    chord = board.chord
+    cells = [(r, c) for r in range(rows) for c in range(cols)]
+    start = time.perf_counter()
+    for r, c in cells:
+        chord(r, c)
+    res["chord_storm_ms"] = (time.perf_counter() - start) * 1000.0
+
+    check = getattr(board, engine.check_win)
+    start = time.perf_counter()
+    for _ in range(WIN_CHECK_CALLS):
+        check()
+    res["win_check_us"] = (time.perf_counter() - start) / WIN_CHECK_CALLS * 1e6
+    return res
+
+
+def bench(engine, rows, cols, mines, seed=SEED, repeat=REPEAT) -> dict:
+    # Neighbour tables are shared per shape; keep their one-off build out of the numbers.
+    neighbor_table(rows, cols)
+    best = {}
+    for _ in range(repeat):
+        for metric, value in run_once(engine, rows, cols, mines, seed).items():
+            best[metric] = min(value, best.get(metric, value))
+    return best
+
+
+def compare(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list:
+    """(key, metric, old, new) for every metric more than `tolerance` slower than the baseline."""
+    regressions = []
+    for key, metrics in results.items():
+        old_metrics = baseline.get(key)
+        if old_metrics is None:
+            continue
+        for metric, new in metrics.items():
+            old = old_metrics.get(metric)
+            if old is None:
+                continue
+            if new > old * (1 + tolerance) and new - old > NOISE_FLOOR:
+                regressions.append((key, metric, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true", help="presets only, no stress sizes")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--json", metavar="PATH", help="write the results to PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved --json file")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed slowdown before a metric counts as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = PRESETS if args.quick else PRESETS + STRESS
+    results = {}
+    header = f"{'engine':<14} {'size':<8}" + "".join(f"{m:>16}" for m in METRICS)
+    print(header)
+    print("-" * len(header))
+    for engine in _engines():
+        for name, rows, cols, mines in sizes:
+            res = bench(engine, rows, cols, mines, args.seed, args.repeat)
+            results[f"{engine.name}/{name}"] = res
+            print(f"{engine.name:<14} {name:<8}" + "".join(f"{res[m]:>16.3f}" for m in METRICS))
+
+    if args.json:
+        payload = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "seed": args.seed,
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(payload, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for key, metric, old, new in regressions:
+            print(f"REGRESSION {key} {metric}: {old:.3f} -> {new:.3f} ({new / old:.2f}x)")
+        if regressions:
+            return 1
+        print(f"no regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Per-move cost of the incremental solver.Solver.
+
+Plays whole games on classic_board.Board: reveal a deduced safe cell,
+flag a deduced mine, or - when deduction is stuck - open a random safe
+cell (the harness may peek at the mines, the solver never does). Every
+Solver.update() is timed, along with a from-scratch rebuild at the end
+for comparison. Every acted-on deduction is checked against the real mines.
+"""
+import random
+import time
+
+from classic_board import Board
+from solver import Solver
+
+PRESETS = [
+    ("9x9", 9, 9, 10),
+    ("16x16", 16, 16, 40),
+    ("16x30", 16, 30, 99),
+    ("50x80", 50, 80, 400),
+    ("200x200", 200, 200, 200 * 200 // 6),
+    ("600x600", 600, 600, 600 * 600 // 6),
+]
+SEED = 1234
+
+
+def play(rows, cols, mines, seed=SEED):
+    random.seed(seed)
+    board = Board(rows, cols, mines)
+    cells = board._cells
+    rng = random.Random(seed)
+
+    solver = Solver(board)
+    times = []
+    changed = board.reveal(rows // 2, cols // 2)
+    guesses = 0
+    while True:
+        start = time.perf_counter()
+        solver.update(changed)
+        times.append(time.perf_counter() - start)
+        if board.game_over:
+            break
+
+        if solver.safe:
+            i = solver.safe.pop()  # update() would drop it anyway
+            assert not cells[i].is_mine
+            changed = board.reveal(*divmod(i, cols))
+        elif solver.mines:
+            i = solver.mines.pop()
+            assert cells[i].is_mine
+            changed = board.toggle_flag(*divmod(i, cols))
+        else:
+            guesses += 1
+            hidden = [i for i, cell in enumerate(cells)
+                      if not cell.revealed and not cell.is_mine]
+            changed = board.reveal(*divmod(rng.choice(hidden), cols))
+
+    start = time.perf_counter()
+    solver.rebuild()
+    rebuild_s = time.perf_counter() - start
+    return times, guesses, rebuild_s
+
+
+def main():
+    print(f"{'preset':<9} {'moves':>7} {'guesses':>8} {'mean ms':>9} {'p95 ms':>8} "
+          f"{'max ms':>8} {'total ms':>9} {'rebuild ms':>11}")
+    for name, rows, cols, mines in PRESETS:
+        times, guesses, rebuild_s = play(rows, cols, mines)
+        ordered = sorted(times)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        print(f"{name:<9} {len(times):>7} {guesses:>8} {sum(times) / len(times) * 1000:>9.3f} "
+              f"{p95 * 1000:>8.3f} {ordered[-1] * 1000:>8.3f} {sum(times) * 1000:>9.1f} "
+              f"{rebuild_s * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
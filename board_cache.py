@@ -0,0 +1,115 @@
+"""
+On-disk LRU cache of generated layouts, keyed by board code.
+
+An entry holds a board's mine plane and adjacency counts (packed as in
+savefile), so a board dealt again from the same BoardKey - a shared
+code, the daily challenge, a benchmark board - skips both generation
+and counting. That matters most for no-guess layouts, which can take
+seconds to find. Entries are files named "<kind>-<board code>.msc"; a
+hit bumps the file's mtime, and the least recently used files are
+removed once the directory holds more than max_bytes.
+
+Set MINESWEEPER_CACHE_DIR to turn the cache on for classic_board.Board.
+"""
+import os
+import struct
+import zlib
+from array import array
+from collections import OrderedDict
+
+from board_code import encode
+from savefile import pack_bits, pack_nibbles, unpack_bits, unpack_nibbles
+
+CACHE_DIR = os.environ.get("MINESWEEPER_CACHE_DIR", "")
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+SUFFIX = ".msc"
+
+MAGIC = b"MSBC"
+VERSION = 1
+_HEADER = struct.Struct("<4sBI")
+
+
+class BoardCache:
+    """get()/put() layouts by (BoardKey, kind), e.g. kind "plain" or "no-guess"."""
+
+    def __init__(self, directory: str, max_bytes: int = MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        # name -> size, least recently used first (by mtime from earlier runs).
+        entries = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(SUFFIX) and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name, stat.st_size))
+        entries.sort()
+        self._entries = OrderedDict((name, size) for _, name, size in entries)
+        self.bytes = sum(self._entries.values())
+
+    def _name(self, key, kind: str) -> str:
+        return f"{kind}-{encode(key)}{SUFFIX}"
+
+    def get(self, key, kind: str):
+        """(mine flags as 0/1 bytes, adjacency as array('b')), or None on a miss."""
+        name = self._name(key, kind)
+        if name not in self._entries:
+            self.misses += 1
+            return None
+        path = os.path.join(self.directory, name)
+        n = key.rows * key.cols
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            magic, version, cells = _HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION or cells != n:
+                raise ValueError(name)
+            planes = zlib.decompress(data[_HEADER.size:])
+            split = (n + 7) // 8
+            mines = unpack_bits(planes[:split], n)
+            counts = array("b", unpack_nibbles(planes[split:], n))
+            if len(mines) != n or len(counts) != n:
+                raise ValueError(name)
+            os.utime(path)
+        except (OSError, ValueError, struct.error, zlib.error):
+            self._drop(name)  # gone or damaged: regenerate it
+            self.misses += 1
+            return None
+        self._entries.move_to_end(name)
+        self.hits += 1
+        return mines, counts
+
+    def put(self, key, kind: str, mines, counts):
+        """Store a layout; counts are adjacency bytes with 0xFF for a mine."""
+        name = self._name(key, kind)
+        data = (_HEADER.pack(MAGIC, VERSION, key.rows * key.cols)
+                + zlib.compress(pack_bits(mines) + pack_nibbles(counts)))
+        path = os.path.join(self.directory, name)
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            return  # a read-only or full disk just means no caching
+        self.bytes -= self._entries.pop(name, 0)
+        self._entries[name] = len(data)
+        self.bytes += len(data)
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, name: str):
+        self.bytes -= self._entries.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in list(self._entries):
+            self._drop(name)
+
+
+CACHE = BoardCache(CACHE_DIR) if CACHE_DIR else None
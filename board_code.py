@@ -0,0 +1,100 @@
+"""
+Seeds and shareable codes for boards.
+
+Every board is identified by a BoardKey (rows, cols, mines, first_click,
+seed), and its mines are drawn from layout_rng(key), so the same key
+always deals the same layout. first_click is the flat index of the
+first reveal on boards that lay their mines on it (classic_board), and
+None on boards that lay them up front (ms_board, np_board).
+
+A board code is the key as varints plus a check byte, in base32 with a
+dash every four characters:
+
+    >>> encode(BoardKey(16, 30, 99, 255, 1234))
+    'CAPG-HAAC-2IE2-U'
+"""
+import base64
+import datetime
+import random
+import zlib
+from collections import namedtuple
+
+BoardKey = namedtuple("BoardKey", "rows cols mines first_click seed")
+
+SEED_BITS = 32
+GROUP = 4
+# Largest rows or cols a front-end plays (game.py's custom boards).
+MAX_SIDE = 600
+
+
+def new_seed() -> int:
+    # Drawn from the module RNG, so random.seed() still makes runs reproducible.
+    return random.getrandbits(SEED_BITS)
+
+
+def daily_seed(day: datetime.date = None) -> int:
+    """The same seed for everyone on a given day, e.g. 20261017."""
+    day = day or datetime.date.today()
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+def key_of(board) -> BoardKey:
+    return BoardKey(board.rows, board.cols, board.mines_count,
+                    getattr(board, "first_click", None), board.seed)
+
+
+def layout_rng(key: BoardKey) -> random.Random:
+    # String seeds are hashed with SHA-512, so neighbouring keys get unrelated streams.
+    return random.Random(layout_seed(key))
+
+
+def layout_seed(key: BoardKey) -> str:
+    return f"{key.rows}x{key.cols}:{key.mines}:{key.first_click}:{key.seed}"
+
+
+def _varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode(key: BoardKey) -> str:
+    out = bytearray()
+    first_click = 0 if key.first_click is None else key.first_click + 1
+    for value in (key.rows, key.cols, key.mines, first_click, key.seed):
+        _varint(out, value)
+    out.append(zlib.crc32(out) & 0xFF)
+    text = base64.b32encode(bytes(out)).decode().rstrip("=")
+    return "-".join(text[i:i + GROUP] for i in range(0, len(text), GROUP))
+
+
+def decode(code: str, max_rows: int = MAX_SIDE, max_cols: int = MAX_SIDE) -> BoardKey:
+    """
+    Inverse of encode(); case, spaces and dashes don't matter. Raises
+    ValueError, also for boards larger than max_rows x max_cols.
+    """
+    text = "".join(code.split()).replace("-", "").upper()
+    try:
+        data = base64.b32decode(text + "=" * (-len(text) % 8))
+    except ValueError:
+        raise ValueError(f"not a board code: {code!r}") from None
+    if len(data) < 6 or zlib.crc32(data[:-1]) & 0xFF != data[-1]:
+        raise ValueError(f"not a board code: {code!r}")
+
+    values, value, shift = [], 0, 0
+    for byte in data[:-1]:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            values.append(value)
+            value = shift = 0
+    if len(values) != 5 or shift:
+        raise ValueError(f"not a board code: {code!r}")
+    rows, cols, mines, first_click, seed = values
+    if not rows or not cols or mines >= rows * cols or first_click > rows * cols:
+        raise ValueError(f"board code {code!r} describes an impossible board")
+    if rows > max_rows or cols > max_cols:
+        raise ValueError(f"board code {code!r} is for a {rows}x{cols} board; "
+                         f"the largest is {max_rows}x{max_cols}")
+    return BoardKey(rows, cols, mines, first_click - 1 if first_click else None, seed)
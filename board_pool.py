@@ -0,0 +1,108 @@
+"""
+Boards built ahead of time so a restart doesn't build one in the frame loop.
+
+A BoardPool keeps up to `capacity` fresh boards for one (rows, cols,
+mines) setting, filled by a daemon thread. take() hands one over and
+wakes the worker to replace it; asking for another setting discards
+what was prepared. Boards are counted against `max_bytes` using
+board_bytes(), so a setting whose boards are too big keeps fewer of
+them, or none at all.
+"""
+import sys
+import threading
+from collections import deque
+
+POOL_SIZE = 2
+MAX_POOL_BYTES = 128 * 1024 * 1024
+
+
+def board_bytes(board) -> int:
+    """
+    Estimated size of a board's own cell storage, leaving out the shared
+    neighbour table. For object boards it runs about a third above what
+    tracemalloc reports, so the cap errs on the safe side.
+    """
+    if hasattr(board, "_mine_buf"):  # np_board.ArrayBoard
+        return sum(sys.getsizeof(buf) for buf in (board._mine_buf, board._adj_buf,
+                                                  board._revealed_buf, board._flagged_buf))
+    cell = board._cells[0]
+    per_cell = sys.getsizeof(cell) + sys.getsizeof(cell.__dict__)
+    # Each cell is referenced from its grid row and from _cells.
+    return len(board._cells) * (per_cell + 2 * 8)
+
+
+class BoardPool:
+    """
+    make_board(rows, cols, mines) builds a board; it runs on the worker
+    thread, so it must not touch pygame. Call close() when done.
+    """
+
+    def __init__(self, make_board, capacity: int = POOL_SIZE,
+                 max_bytes: int = MAX_POOL_BYTES):
+        self.make_board = make_board
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self._ready = deque()
+        self._key = None
+        self._target = 0
+        self._generation = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="board-pool", daemon=True)
+        self._thread.start()
+
+    def prepare(self, rows, cols, mines):
+        """Start filling the pool for this setting (drops boards for any other)."""
+        with self._cond:
+            self._switch((rows, cols, mines))
+
+    def take(self, rows, cols, mines):
+        """A fresh board for this setting; built right here if none is ready."""
+        key = (rows, cols, mines)
+        with self._cond:
+            self._switch(key)
+            board = self._ready.popleft() if self._ready else None
+            self._cond.notify()
+        if board is None:
+            board = self.make_board(rows, cols, mines)
+            with self._cond:
+                self._fit(board)
+        return board
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._ready.clear()
+            self._cond.notify()
+        self._thread.join()
+
+    def _switch(self, key):
+        if key == self._key:
+            return
+        self._key = key
+        self._generation += 1  # a board being built for the old key is dropped
+        self._ready.clear()
+        self._target = self.capacity  # until the first board shows its size
+        self._cond.notify()
+
+    def _fit(self, board):
+        """Size the pool from a board of the current setting."""
+        size = max(1, board_bytes(board))
+        self._target = min(self.capacity, self.max_bytes // size)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and (self._key is None
+                                            or len(self._ready) >= self._target):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                key, generation = self._key, self._generation
+            board = self.make_board(*key)
+            with self._cond:
+                if generation != self._generation:
+                    continue
+                self._fit(board)
+                if len(self._ready) < self._target:
+                    self._ready.append(board)
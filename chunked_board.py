@@ -0,0 +1,353 @@
+import hashlib
+import os
+import random
+import shutil
+import tempfile
+import zlib
+from array import array
+from collections import OrderedDict, namedtuple
+
+from grid_utils import adjacency_counts, sample_mines
+
+CHUNK_SIZE = 32
+MAX_LIVE_CHUNKS = 256
+MAX_CACHED_LAYOUTS = 64
+# Evicted chunks kept compressed in memory; older ones go to disk.
+MAX_COLD_CHUNKS = 1024
+
+# Below roughly this density the zero cells of an infinite board percolate
+# (8-connected site percolation threshold ~0.407 for (1 - p) ** 9), so a
+# single click could flood-fill forever.
+MIN_DENSITY = 0.12
+
+ChunkCell = namedtuple(
+    "ChunkCell", "row col is_mine adjacent_mines revealed flagged"
+)
+
+
+class _Chunk:
+    __slots__ = ("mines", "adj", "revealed", "flagged")
+
+    def __init__(self, mines: bytearray, adj: array):
+        self.mines = mines
+        self.adj = adj
+        self.revealed = bytearray(len(mines))
+        self.flagged = bytearray(len(mines))
+
+
+class ChunkedBoard:
+    """
+    Endless board split into chunk_size x chunk_size chunks.
+
+    A chunk's mines are a pure function of (seed, chunk row, chunk col), so
+    nothing is stored for chunks the player never touched. A chunk is only
+    materialised when a reveal, flood fill or flag reaches it; at most
+    max_chunks stay live (a flood fill evicts as it goes), the least
+    recently used ones are packed into a compressed cold store and rebuilt
+    on demand. The cold store keeps at most max_cold chunks in memory and
+    writes older ones to spill_dir (a temporary directory unless given,
+    removed by close()), so memory stays bounded however far the player
+    goes. With spill_dir given, every evicted chunk goes straight to disk.
+
+    Coordinates are unbounded world (row, col) pairs, negatives included;
+    the actions return the (row, col) of the cells they changed.
+    The first reveal is guaranteed to be a zero, as on the regular boards.
+    grid[row][col] returns a ChunkCell, so the game.py drawing code works
+    on it with an endless viewport.Camera.
+    """
+
+    def __init__(self, density: float = 0.16, seed: int | None = None,
+                 chunk_size: int = CHUNK_SIZE, max_chunks: int = MAX_LIVE_CHUNKS,
+                 spill_dir: str | None = None, max_cold: int = MAX_COLD_CHUNKS):
+        if not MIN_DENSITY <= density < 1:
+            raise ValueError(f"density must be in [{MIN_DENSITY}, 1), got {density}")
+        self.density = density
+        self.seed = random.getrandbits(63) if seed is None else seed
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.max_cold = 0 if spill_dir else max_cold
+        self.spill_dir = spill_dir
+        self._own_spill_dir = False
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        self.mines_per_chunk = round(density * chunk_size * chunk_size)
+        self.mines_placed = False
+        self.game_over = False
+        self.victory = False
+        self.revealed_count = 0
+
+        self._safe_zone = frozenset()
+        self._chunks = OrderedDict()   # (cr, cc) -> _Chunk, in LRU order
+        self._cold = OrderedDict()     # (cr, cc) -> compressed state, in LRU order
+        self._spilled = set()          # (cr, cc) of the states written to spill_dir
+        self._layouts = OrderedDict()  # (cr, cc) -> mine bytearray, in LRU order
+        self.grid = _GridView(self)
+
+    # -- chunk management -------------------------------------------------
+
+    def _chunk_seed(self, cr: int, cc: int) -> int:
+        key = f"{self.seed}:{cr}:{cc}".encode()
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+    def _layout(self, cr: int, cc: int) -> bytearray:
+        """Mine layout of a chunk, regenerated deterministically when not cached."""
+        key = (cr, cc)
+        mines = self._layouts.get(key)
+        if mines is not None:
+            self._layouts.move_to_end(key)
+            return mines
+
+        size = self.chunk_size
+        top, left = cr * size, cc * size
+        forbidden = [
+            (r - top) * size + (c - left)
+            for r, c in self._safe_zone
+            if top <= r < top + size and left <= c < left + size
+        ]
+        rng = random.Random(self._chunk_seed(cr, cc))
+        mines = bytearray(size * size)
+        for i in sample_mines(size * size, self.mines_per_chunk, forbidden, rng=rng):
+            mines[i] = 1
+
+        self._layouts[key] = mines
+        if len(self._layouts) > MAX_CACHED_LAYOUTS:
+            self._layouts.popitem(last=False)
+        return mines
+
+    def _build_chunk(self, cr: int, cc: int) -> _Chunk:
+        size = self.chunk_size
+        mines = self._layout(cr, cc)
+
+        # Adjacency needs the one-cell border from the 8 surrounding chunks:
+        # count over a padded (size + 2)^2 window and keep the centre.
+        padded_w = size + 2
+        padded = bytearray(padded_w * padded_w)
+        for dcr in (-1, 0, 1):
+            for dcc in (-1, 0, 1):
+                layout = mines if dcr == dcc == 0 else self._layout(cr + dcr, cc + dcc)
+                rows = range(size) if dcr == 0 else ([size - 1] if dcr < 0 else [0])
+                cols = range(size) if dcc == 0 else ([size - 1] if dcc < 0 else [0])
+                for r in rows:
+                    pr = r + 1 + dcr * size
+                    for c in cols:
+                        padded[pr * padded_w + c + 1 + dcc * size] = layout[r * size + c]
+
+        counts = adjacency_counts(padded, padded_w, padded_w)
+        adj = array("b")
+        for r in range(1, size + 1):
+            adj.extend(counts[r * padded_w + 1:r * padded_w + 1 + size])
+        return _Chunk(mines, adj)
+
+    def _chunk(self, cr: int, cc: int) -> _Chunk:
+        """Return the live chunk at (cr, cc), materialising or thawing it."""
+        key = (cr, cc)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+
+        chunk = self._build_chunk(cr, cc)
+        if key in self._cold or key in self._spilled:
+            self._thaw(key, chunk)
+        self._chunks[key] = chunk
+        return chunk
+
+    def _spill_path(self, key) -> str:
+        return os.path.join(self.spill_dir, f"{key[0]}_{key[1]}.chunk")
+
+    def _thaw(self, key, chunk: _Chunk):
+        packed = self._cold.pop(key, None)
+        if packed is None:
+            path = self._spill_path(key)
+            with open(path, "rb") as f:
+                packed = f.read()
+            os.remove(path)
+            self._spilled.discard(key)
+        state = zlib.decompress(packed)
+        n = len(chunk.mines)
+        chunk.revealed[:] = state[:n]
+        chunk.flagged[:] = state[n:]
+
+    def _evict_cold_chunks(self):
+        """Push the least recently used chunks out until max_chunks are live."""
+        while len(self._chunks) > self.max_chunks:
+            key, chunk = self._chunks.popitem(last=False)
+            if not any(chunk.revealed) and not any(chunk.flagged):
+                continue  # nothing but regenerable mines: just drop it
+            self._cold[key] = zlib.compress(bytes(chunk.revealed) + bytes(chunk.flagged))
+        while len(self._cold) > self.max_cold:
+            key, packed = self._cold.popitem(last=False)
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="minesweeper-chunks-")
+                self._own_spill_dir = True
+            with open(self._spill_path(key), "wb") as f:
+                f.write(packed)
+            self._spilled.add(key)
+
+    def close(self):
+        """Remove the spill directory if the board created it."""
+        if self._own_spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+            self._own_spill_dir = False
+            self._spilled.clear()
+
+    def live_chunks(self) -> int:
+        return len(self._chunks)
+
+    def _locate(self, row: int, col: int):
+        size = self.chunk_size
+        cr, r = divmod(row, size)
+        cc, c = divmod(col, size)
+        return self._chunk(cr, cc), r * size + c
+
+    @staticmethod
+    def _neighbors(row: int, col: int):
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if dr == 0 and dc == 0:
+                    continue
+                yield row + dr, col + dc
+
+    # -- public API ---------------------------------------------------------
+
+    def cell(self, row: int, col: int) -> ChunkCell:
+        """Snapshot of one cell for rendering; never materialises an untouched chunk."""
+        size = self.chunk_size
+        cr, r = divmod(row, size)
+        cc, c = divmod(col, size)
+        chunk = self._chunks.get((cr, cc))
+        if chunk is None:
+            if (cr, cc) not in self._cold and (cr, cc) not in self._spilled:
+                return ChunkCell(row, col, False, 0, False, False)
+            chunk = self._chunk(cr, cc)
+            self._evict_cold_chunks()
+        i = r * size + c
+        return ChunkCell(row, col, bool(chunk.mines[i]), chunk.adj[i],
+                         bool(chunk.revealed[i]), bool(chunk.flagged[i]))
+
+    def _place_mines(self, row: int, col: int):
+        """Fix the first-click safe zone; layouts built before it are stale."""
+        self._safe_zone = frozenset([(row, col), *self._neighbors(row, col)])
+        self._layouts.clear()
+        for (cr, cc), chunk in self._chunks.items():
+            fresh = self._build_chunk(cr, cc)
+            chunk.mines, chunk.adj = fresh.mines, fresh.adj
+        self.mines_placed = True
+
+    def reveal_cell(self, row: int, col: int) -> list:
+        """
+        Reveal a cell and flood-fill if it's a zero. Handle game over.
+        Returns the (row, col) of the cells that changed.
+        """
+        changed = []
+        if self.game_over:
+            return changed
+        if not self.mines_placed:
+            self._place_mines(row, col)
+        self._reveal(row, col, changed)
+        self._evict_cold_chunks()
+        return changed
+
+    def _reveal(self, row: int, col: int, changed: list):
+        # Callers evict afterwards: chunks must stay live while we hold them.
+        chunk, i = self._locate(row, col)
+        if chunk.revealed[i] or chunk.flagged[i]:
+            return
+
+        chunk.revealed[i] = 1
+        changed.append((row, col))
+        if chunk.mines[i]:
+            self.game_over = True
+            self.victory = False
+            return
+
+        self.revealed_count += 1
+        if chunk.adj[i] == 0:
+            self._flood_fill(row, col, changed)
+
+    def _flood_fill(self, row: int, col: int, changed: list):
+        stack = [(row, col)]
+        while stack:
+            # Only coordinates are held across iterations, so chunks can go cold mid-fill.
+            self._evict_cold_chunks()
+            r, c = stack.pop()
+            for nr, nc in self._neighbors(r, c):
+                chunk, i = self._locate(nr, nc)
+                if chunk.revealed[i] or chunk.flagged[i] or chunk.mines[i]:
+                    continue
+                chunk.revealed[i] = 1
+                changed.append((nr, nc))
+                self.revealed_count += 1
+                if chunk.adj[i] == 0:
+                    stack.append((nr, nc))
+
+    def toggle_flag(self, row: int, col: int) -> list:
+        if self.game_over:
+            return []
+        chunk, i = self._locate(row, col)
+        changed = []
+        if not chunk.revealed[i]:
+            chunk.flagged[i] ^= 1
+            changed.append((row, col))
+        self._evict_cold_chunks()
+        return changed
+
+    def chord(self, row: int, col: int) -> list:
+        """Windows-style chord, same rules as ms_board.Board.chord."""
+        changed = []
+        if self.game_over:
+            return changed
+        self._chord(row, col, changed)
+        self._evict_cold_chunks()
+        return changed
+
+    def _chord(self, row: int, col: int, changed: list):
+        chunk, i = self._locate(row, col)
+        number = chunk.adj[i]
+        if not chunk.revealed[i] or number <= 0:
+            return
+
+        flags = 0
+        for nr, nc in self._neighbors(row, col):
+            n_chunk, ni = self._locate(nr, nc)
+            flags += n_chunk.flagged[ni]
+        if flags != number:
+            return
+
+        for nr, nc in self._neighbors(row, col):
+            # Located again each time: a flood fill from an earlier neighbour may evict chunks.
+            n_chunk, ni = self._locate(nr, nc)
+            if n_chunk.flagged[ni] or n_chunk.revealed[ni]:
+                continue
+            if n_chunk.mines[ni]:
+                n_chunk.revealed[ni] = 1
+                changed.append((nr, nc))
+                self.game_over = True
+                self.victory = False
+            else:
+                self._reveal(nr, nc, changed)
+
+
+class _GridRow:
+    __slots__ = ("_board", "_row")
+
+    def __init__(self, board, row: int):
+        self._board = board
+        self._row = row
+
+    def __getitem__(self, col: int) -> ChunkCell:
+        return self._board.cell(self._row, col)
+
+
+class _GridView:
+    """board.grid[r][c] -> ChunkCell, for code written against the bounded boards."""
+
+    __slots__ = ("_board",)
+
+    def __init__(self, board):
+        self._board = board
+
+    def __getitem__(self, row: int) -> _GridRow:
+        return _GridRow(self._board, row)
@@ -0,0 +1,285 @@
+from board_cache import CACHE
+from board_code import BoardKey, layout_rng, layout_seed, new_seed
+from grid_utils import DEBUG, adjacency_counts, neighbor_table, sample_mines
+
+
+class Cell:
+    def __init__(self, r, c):
+        self.r = r
+        self.c = c
+        self.is_mine = False
+        self.adj = 0
+        self.revealed = False
+        self.flagged = False
+
+    def reset(self):
+        self.is_mine = False
+        self.adj = 0
+        self.revealed = False
+        self.flagged = False
+
+
+class Board:
+    debug = DEBUG
+
+    def __init__(self, rows, cols, mines, generator=None, seed=None):
+        self.rows = rows
+        self.cols = cols
+        self.mines_count = mines
+        self.grid = [[Cell(r, c) for c in range(cols)] for r in range(rows)]
+        self._cells = [cell for row in self.grid for cell in row]
+        self._nbr_offsets, self._nbr_indices = neighbor_table(rows, cols)
+        # Optional layout source for place_mines(), e.g. no_guess.NoGuessGenerator.
+        self.generator = generator
+        # With the first click, the seed fixes the layout (see board_code).
+        self.seed = new_seed() if seed is None else seed
+        self.first_click = None
+        self.mines_placed = False
+        self.game_over = False
+        self.victory = False
+
+        # Running counters so the win check and the HUD mine counter
+        # never rescan the grid.
+        self._hidden_safe = rows * cols
+        self._flag_count = 0
+
+    def in_bounds(self, r, c):
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    def neighbors(self, r, c):
+        i = r * self.cols + c
+        cells = self._cells
+        for j in self._nbr_indices[self._nbr_offsets[i]:self._nbr_offsets[i + 1]]:
+            yield cells[j]
+
+    def _compute_adjacencies(self):
+        cells = self._cells
+        counts = adjacency_counts([cell.is_mine for cell in cells], self.rows, self.cols)
+        for cell, count in zip(cells, counts):
+            cell.adj = count
+
+    def place_mines(self, safe_r, safe_c):
+        """
+        Windows-7-style: first click is guaranteed a 0.
+        We generate mines AFTER the first click, and ensure that
+        the clicked cell and its neighbors have no mines.
+        """
+        self.first_click = safe_r * self.cols + safe_c
+        key = BoardKey(self.rows, self.cols, self.mines_count, self.first_click, self.seed)
+        kind = "plain" if self.generator is None else "no-guess"
+        cached = CACHE.get(key, kind) if CACHE is not None else None
+        if cached is not None:
+            mines, counts = cached
+            self.set_mines([i for i, m in enumerate(mines) if m], counts)
+        else:
+            if self.generator is not None:
+                placed = self.generator.layout(self.rows, self.cols, self.mines_count,
+                                               safe_r, safe_c, layout_seed(key))
+            else:
+                placed = sample_mines(self.rows * self.cols, self.mines_count,
+                                      first_click_zone(self.rows, self.cols, safe_r, safe_c),
+                                      layout_rng(key))
+            self.set_mines(placed)
+            # A timed-out no-guess search deals an ordinary layout: don't keep that.
+            if CACHE is not None and (self.generator is None or self.generator.last.no_guess):
+                cells = self._cells
+                CACHE.put(key, kind, bytes(cell.is_mine for cell in cells),
+                          bytes(cell.adj & 0xFF for cell in cells))
+        assert self.grid[safe_r][safe_c].adj == 0
+
+    def set_mines(self, placed, counts=None):
+        """Lay mines on the given flat indices; counts (if known) saves counting adjacency."""
+        cells = self._cells
+        for i in placed:
+            cells[i].is_mine = True
+        self._hidden_safe = self.rows * self.cols - len(placed)
+
+        if counts is None:
+            self._compute_adjacencies()
+        else:
+            for cell, count in zip(cells, counts):
+                cell.adj = count
+        self.mines_placed = True
+
+    def clear_mines(self):
+        """Take the layout back off a board with nothing revealed (undo of the first click)."""
+        for cell in self._cells:
+            cell.is_mine = False
+            cell.adj = 0
+        self._hidden_safe = self.rows * self.cols
+        self.first_click = None
+        self.mines_placed = False
+
+    def reveal(self, r, c):
+        """
+        Reveal a cell (placing the mines on the first click) and flood-fill
+        zeros. Returns the flat indices (r * cols + c) of the cells that changed.
+        """
+        if not self.in_bounds(r, c) or self.game_over:
+            return []
+
+        cell = self.grid[r][c]
+        # Checked first, so clicking a flag before the first click deals nothing.
+        if cell.revealed or cell.flagged:
+            return []
+
+        if not self.mines_placed:
+            self.place_mines(r, c)
+
+        cell.revealed = True
+        changed = [r * self.cols + c]
+
+        if cell.is_mine:
+            self.game_over = True
+            self.victory = False
+            return changed
+
+        self._hidden_safe -= 1
+        if cell.adj == 0:
+            changed.extend(self._flood_fill(r, c))
+
+        if self._check_win():
+            self.game_over = True
+            self.victory = True
+
+        if self.debug:
+            self._verify_counters()
+        return changed
+
+    def _flood_fill(self, r, c):
+        """
+        Reveal the region around a zero; returns the newly revealed indices.
+        A scanline fill, see np_board.ArrayBoard._flood_fill.
+        """
+        cells = self._cells
+        rows, cols = self.rows, self.cols
+        revealed = []
+        hidden_safe = self._hidden_safe
+
+        spans = [(r, c, c)]
+        while spans:
+            row, lo, hi = spans.pop()
+            c0 = lo - 1 if lo else 0
+            c1 = hi + 1 if hi + 1 < cols else hi
+            for rr in range(row - 1 if row else 0, row + 2 if row + 1 < rows else row + 1):
+                base = rr * cols
+                i, end = base + c0, base + c1
+                while i <= end:
+                    cell = cells[i]
+                    if cell.revealed or cell.flagged or cell.is_mine:
+                        i += 1
+                        continue
+                    cell.revealed = True
+                    revealed.append(i)
+                    hidden_safe -= 1
+                    if cell.adj:
+                        i += 1
+                        continue
+                    left = i - 1
+                    while left >= base:
+                        cell = cells[left]
+                        if cell.revealed or cell.flagged or cell.adj:
+                            break
+                        cell.revealed = True
+                        revealed.append(left)
+                        left -= 1
+                    right, last = i + 1, base + cols
+                    while right < last:
+                        cell = cells[right]
+                        if cell.revealed or cell.flagged or cell.adj:
+                            break
+                        cell.revealed = True
+                        revealed.append(right)
+                        right += 1
+                    hidden_safe -= right - left - 2
+                    spans.append((rr, left + 1 - base, right - 1 - base))
+                    i = right
+        self._hidden_safe = hidden_safe
+        return revealed
+
+    def toggle_flag(self, r, c):
+        if not self.in_bounds(r, c) or self.game_over:
+            return []
+        cell = self.grid[r][c]
+        if cell.revealed:
+            return []
+        cell.flagged = not cell.flagged
+        self._flag_count += 1 if cell.flagged else -1
+
+        if self.debug:
+            self._verify_counters()
+        return [r * self.cols + c]
+
+    def chord(self, r, c):
+        """
+        Windows-style chord:
+        If we are on a revealed number and the number of
+        flagged neighbors equals that number, reveal the others.
+        """
+        if not self.in_bounds(r, c) or self.game_over:
+            return []
+        cell = self.grid[r][c]
+        if not cell.revealed or cell.adj <= 0:
+            return []
+
+        neigh = list(self.neighbors(r, c))
+        flagged = sum(1 for n in neigh if n.flagged)
+
+        if flagged != cell.adj:
+            return []
+
+        changed = []
+        for n in neigh:
+            if n.flagged or n.revealed:
+                continue
+            n.revealed = True
+            changed.append(n.r * self.cols + n.c)
+            if n.is_mine:
+                self.game_over = True
+                self.victory = False
+                continue
+            self._hidden_safe -= 1
+            if n.adj == 0:
+                changed.extend(self._flood_fill(n.r, n.c))
+
+        if self._check_win():
+            self.game_over = True
+            self.victory = True
+
+        if self.debug:
+            self._verify_counters()
+        return changed
+
+    def reveal_all(self):
+        """Reveal every cell on the board (used after loss banner)."""
+        for row in self.grid:
+            for cell in row:
+                cell.revealed = True
+        self._hidden_safe = 0
+
+    def remaining_mines_estimate(self):
+        return max(0, self.mines_count - self._flag_count)
+
+    def _check_win(self):
+        return self._hidden_safe == 0
+
+    def _verify_counters(self):
+        """Debug aid: compare the running counters with a full-board scan."""
+        hidden_safe = sum(1 for row in self.grid for c in row if not c.is_mine and not c.revealed)
+        flags = sum(1 for row in self.grid for c in row if c.flagged)
+        assert hidden_safe == self._hidden_safe, (hidden_safe, self._hidden_safe)
+        assert flags == self._flag_count, (flags, self._flag_count)
+
+
+def first_click_zone(rows, cols, r, c) -> set:
+    """Flat indices of (r, c) and its neighbours, kept free of mines."""
+    offsets, indices = neighbor_table(rows, cols)
+    safe = r * cols + c
+    zone = {safe}
+    zone.update(indices[offsets[safe]:offsets[safe + 1]])
+    return zone
+
+
+def reveal_all_cells(board):
+    """Reveal every cell on the board (used after loss banner)."""
+    board.reveal_all()
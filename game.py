@@ -1,5 +1,22 @@
+import time
+
 import pygame
-from ms_board import Board
+
+import board_code
+import replay
+import resources
+import savefile
+from board_pool import BoardPool
+from chunked_board import ChunkedBoard
+from history import History
+from pacing import FramePacer
+from profiler import PROFILER
+from viewport import MIN_CELL_SIZE, PAN_STEP, Camera
+
+try:
+    from np_board import ArrayBoard as Board
+except ImportError:  # NumPy not installed: fall back to the object grid
+    from ms_board import Board
 
 MARGIN = 30
 TOP_UI = 60
@@ -8,6 +25,7 @@ BG_COLOR = (245, 245, 245)
 GRID_COLOR = (180, 180, 180)
 REVEALED_COLOR = (220, 220, 220)
 HIDDEN_COLOR = (200, 200, 200)
+HOVER_COLOR = (210, 210, 210)
 TEXT_COLOR = (20, 20, 20)
 
 NUMBER_COLORS = {
@@ -23,36 +41,37 @@ NUMBER_COLORS = {
 
 MAX_WINDOW_WIDTH = 1000
 MAX_WINDOW_HEIGHT = 800
+ENDLESS_CELL_SIZE = 30
+ENDLESS_DENSITY = 0.16
 
 
 def compute_geometry(rows: int, cols: int):
-    """Pick a cell size so the board fits nicely in the window."""
-    cell_size = min(
-        40,
-        (MAX_WINDOW_WIDTH - 2 * MARGIN) // cols,
-        (MAX_WINDOW_HEIGHT - (MARGIN + TOP_UI) - MARGIN) // rows,
-    )
-    width = cols * cell_size + 2 * MARGIN
-    height = rows * cell_size + TOP_UI + MARGIN
+    """
+    Pick a cell size so the board fits nicely in the window. Cells never
+    shrink below MIN_CELL_SIZE; bigger boards are scrolled with a Camera.
+    """
+    max_grid_w = MAX_WINDOW_WIDTH - 2 * MARGIN
+    max_grid_h = MAX_WINDOW_HEIGHT - (MARGIN + TOP_UI) - MARGIN
+    cell_size = max(MIN_CELL_SIZE, min(40, max_grid_w // cols, max_grid_h // rows))
+    width = min(cols * cell_size, max_grid_w) + 2 * MARGIN
+    height = min(rows * cell_size, max_grid_h) + TOP_UI + MARGIN
     return cell_size, width, height
 
 
 def load_images(cell_size: int):
-    mine_img = pygame.image.load("assets/mine.png").convert_alpha()
-    flag_img = pygame.image.load("assets/flag.png").convert_alpha()
-
     size = cell_size - 8
-    mine_img = pygame.transform.smoothscale(mine_img, (size, size))
-    flag_img = pygame.transform.smoothscale(flag_img, (size, size))
+    mine_img = resources.get_image("assets/mine.png", (size, size))
+    flag_img = resources.get_image("assets/flag.png", (size, size))
     return mine_img, flag_img
 
 
-def draw_game(screen, font, board: Board, mine_img, flag_img, cell_size: int):
-    screen.fill(BG_COLOR)
+def draw_status_bar(screen, font, board: Board):
+    """Draw the status line and the Menu/Quit buttons above the grid."""
     width, _ = screen.get_size()
-
     top_text_y = 15
     grid_top = MARGIN + 30
+    pygame.draw.rect(screen, BG_COLOR, (0, 0, width, grid_top))
+
     if board.game_over:
         status = "You Win! 🎉" if board.victory else "Boom! 💥"
     else:
@@ -61,7 +80,7 @@ def draw_game(screen, font, board: Board, mine_img, flag_img, cell_size: int):
     text_surf = font.render(status, True, TEXT_COLOR)
     screen.blit(text_surf, (MARGIN, top_text_y))
 
-    button_font = pygame.font.SysFont("consolas", 20)
+    button_font = resources.get_font("consolas", 20)
     btn_w, btn_h = 90, 30
     quit_rect = pygame.Rect(width - MARGIN - btn_w, top_text_y - 5, btn_w, btn_h)
     menu_rect = pygame.Rect(width - MARGIN - 2 * btn_w - 10, top_text_y - 5, btn_w, btn_h)
@@ -73,36 +92,181 @@ def draw_game(screen, font, board: Board, mine_img, flag_img, cell_size: int):
         label_rect = label_surf.get_rect(center=rect.center)
         screen.blit(label_surf, label_rect)
 
-    left_offset = MARGIN
-    for r in range(board.rows):
-        for c in range(board.cols):
-            cell = board.grid[r][c]
-            x = left_offset + c * cell_size
-            y = grid_top + r * cell_size
-            rect = pygame.Rect(x, y, cell_size, cell_size)
-            color = REVEALED_COLOR if cell.revealed else HIDDEN_COLOR
-            pygame.draw.rect(screen, color, rect)
-            pygame.draw.rect(screen, GRID_COLOR, rect, 1)
-            if cell.revealed:
-                if cell.is_mine:
-                    img_rect = mine_img.get_rect(center=rect.center)
-                    screen.blit(mine_img, img_rect)
-                elif cell.adjacent_mines > 0:
-                    num = cell.adjacent_mines
-                    color = NUMBER_COLORS.get(num, TEXT_COLOR)
-                    num_surf = font.render(str(num), True, color)
-                    num_rect = num_surf.get_rect(center=rect.center)
-                    screen.blit(num_surf, num_rect)
-            else:
-                if cell.flagged:
-                    img_rect = flag_img.get_rect(center=rect.center)
-                    screen.blit(flag_img, img_rect)
+    return {"menu": menu_rect, "quit": quit_rect, "grid_top": grid_top}
+
+
+def draw_cell(screen, font, board: Board, row: int, col: int, mine_img, flag_img,
+              cell_size: int, grid_top: int, hovered: bool = False,
+              camera: Camera | None = None) -> pygame.Rect:
+    cell = board.grid[row][col]
+    if camera is None:
+        x = MARGIN + col * cell_size
+        y = grid_top + row * cell_size
+    else:
+        x, y = camera.cell_origin(row, col)
+    rect = pygame.Rect(x, y, cell_size, cell_size)
+    if cell.revealed:
+        color = REVEALED_COLOR
+    else:
+        color = HOVER_COLOR if hovered else HIDDEN_COLOR
+    pygame.draw.rect(screen, color, rect)
+    pygame.draw.rect(screen, GRID_COLOR, rect, 1)
+    # Keep oversized glyphs inside the cell so redrawing one cell on its
+    # own gives the same pixels as a full repaint.
+    prev_clip = screen.get_clip()
+    screen.set_clip(rect.clip(prev_clip))
+    if cell.revealed:
+        if cell.is_mine:
+            img_rect = mine_img.get_rect(center=rect.center)
+            screen.blit(mine_img, img_rect)
+        elif cell.adjacent_mines > 0:
+            num = cell.adjacent_mines
+            color = NUMBER_COLORS.get(num, TEXT_COLOR)
+            num_surf = font.render(str(num), True, color)
+            num_rect = num_surf.get_rect(center=rect.center)
+            screen.blit(num_surf, num_rect)
+    else:
+        if cell.flagged:
+            img_rect = flag_img.get_rect(center=rect.center)
+            screen.blit(flag_img, img_rect)
+    screen.set_clip(prev_clip)
+    return rect
+
+
+def draw_grid(screen, font, board: Board, mine_img, flag_img, cell_size: int,
+              grid_top: int, hover=None, camera: Camera | None = None) -> pygame.Rect:
+    """Draw the cells in view (all of them without a camera); returns the grid rect."""
+    if camera is None:
+        r0, r1, c0, c1 = 0, board.rows, 0, board.cols
+        view = pygame.Rect(MARGIN, grid_top, board.cols * cell_size, board.rows * cell_size)
+    else:
+        r0, r1, c0, c1 = camera.visible_range()
+        view = pygame.Rect(camera.view_rect())
+
+    prev_clip = screen.get_clip()
+    screen.set_clip(view)
+    screen.fill(BG_COLOR, view)
+    for r in range(r0, r1):
+        for c in range(c0, c1):
+            draw_cell(screen, font, board, r, c, mine_img, flag_img,
+                      cell_size, grid_top, hovered=(r, c) == hover, camera=camera)
+    screen.set_clip(prev_clip)
+    return view
+
+
+def draw_game(screen, font, board: Board, mine_img, flag_img, cell_size: int,
+              hover=None, camera: Camera | None = None):
+    screen.fill(BG_COLOR)
+    draw_info = draw_status_bar(screen, font, board)
+    draw_grid(screen, font, board, mine_img, flag_img, cell_size,
+              draw_info["grid_top"], hover, camera)
 
     pygame.display.flip()
-    return {"menu": menu_rect, "quit": quit_rect, "grid_top": grid_top}
+    return draw_info
 
 
-def get_cell_from_mouse(pos, board: Board, cell_size: int, grid_top: int):
+class BoardRenderer:
+    """
+    Retained-mode renderer for draw_game.
+
+    The whole window is painted once (and again after invalidate(), e.g.
+    when a new board starts); after that only the cells passed to mark()
+    or mark_cells() plus hover changes are redrawn, and only their rects are pushed with
+    pygame.display.update. A frame where nothing changed does no drawing.
+    Only cells inside the camera view are ever drawn, and scrolling
+    repaints just the grid area.
+    """
+
+    def __init__(self, screen, font, mine_img, flag_img, cell_size: int, camera: Camera):
+        self.screen = screen
+        self.font = font
+        self.mine_img = mine_img
+        self.flag_img = flag_img
+        self.cell_size = cell_size
+        self.camera = camera
+        self._scrolled = False
+        self._board = None
+        self._status = None
+        self._hover = None
+        self._dirty = set()
+        self._draw_info = None
+
+    def invalidate(self):
+        self._board = None
+
+    def scroll(self, dx: int, dy: int):
+        if self.camera.pan(dx, dy):
+            self._scrolled = True
+
+    def mark(self, changed):
+        """Queue flat cell indices (as returned by the Board actions) for redraw."""
+        cols = self.camera.cols
+        self._dirty.update(divmod(i, cols) for i in changed)
+
+    def mark_cells(self, cells):
+        """Queue (row, col) pairs for redraw (ChunkedBoard has no flat indices)."""
+        self._dirty.update(cells)
+
+    def set_hover(self, cell_pos):
+        if cell_pos == self._hover:
+            return
+        for pos in (self._hover, cell_pos):
+            if pos is not None:
+                self._dirty.add(pos)
+        self._hover = cell_pos
+
+    def render(self, board: Board):
+        if board is not self._board:
+            self._board = board
+            self._status = (board.game_over, board.victory)
+            self._dirty.clear()
+            self._scrolled = False
+            with PROFILER.phase("full"):
+                self._draw_info = draw_game(self.screen, self.font, board, self.mine_img,
+                                            self.flag_img, self.cell_size, self._hover, self.camera)
+            return self._draw_info
+
+        rects = []
+        status = (board.game_over, board.victory)
+        if status != self._status:
+            self._status = status
+            with PROFILER.phase("status"):
+                self._draw_info = draw_status_bar(self.screen, self.font, board)
+            rects.append(pygame.Rect(0, 0, self.screen.get_width(), self._draw_info["grid_top"]))
+
+        grid_top = self._draw_info["grid_top"]
+        if self._scrolled:
+            self._scrolled = False
+            self._dirty.clear()
+            with PROFILER.phase("grid"):
+                rects.append(draw_grid(self.screen, self.font, board, self.mine_img, self.flag_img,
+                                       self.cell_size, grid_top, self._hover, self.camera))
+
+        if self._dirty:
+            with PROFILER.phase("cells"):
+                r0, r1, c0, c1 = self.camera.visible_range()
+                self.screen.set_clip(self.camera.view_rect())
+                for r, c in self._dirty:
+                    if not (r0 <= r < r1 and c0 <= c < c1):
+                        continue
+                    rect = draw_cell(self.screen, self.font, board, r, c, self.mine_img,
+                                     self.flag_img, self.cell_size, grid_top,
+                                     hovered=(r, c) == self._hover, camera=self.camera)
+                    rects.append(rect.clip(self.camera.view_rect()))
+                self.screen.set_clip(None)
+            self._dirty.clear()
+
+        if rects:
+            with PROFILER.phase("update"):
+                pygame.display.update(rects)
+        return self._draw_info
+
+
+def get_cell_from_mouse(pos, board: Board, cell_size: int, grid_top: int,
+                        camera: Camera | None = None):
+    if camera is not None:
+        return camera.cell_at(pos)
+
     x, y = pos
     left_offset = MARGIN
 
@@ -117,87 +281,234 @@ def get_cell_from_mouse(pos, board: Board, cell_size: int, grid_top: int):
     return None
 
 
-def run_game(rows: int, cols: int, mines: int) -> str:
+def run_game(rows: int, cols: int, mines: int, pool: BoardPool = None, saved=None,
+             seed: int = None) -> str:
     """
-    Runs one game.
+    Runs one game. New boards come from `pool` when one is given; `saved`
+    is a loaded board to continue instead, and `seed` deals that one board
+    (again on every restart).
     Returns:
         "menu" if player clicked Menu
         "quit" if player clicked Quit / closed window
+        ("load", board) if F9 loaded a saved game
     """
     cell_size, width, height = compute_geometry(rows, cols)
     screen = pygame.display.set_mode((width, height))
     pygame.display.set_caption("Minesweeper")
 
-    font = pygame.font.SysFont("consolas", 22)
-    clock = pygame.time.Clock()
+    font = resources.get_font("consolas", 22)
+    pacer = FramePacer()
     mine_img, flag_img = load_images(cell_size)
 
-    board = Board(rows, cols, mines)
-
+    def new_board():
+        if seed is not None:
+            return Board(rows, cols, mines, seed)
+        return pool.take(rows, cols, mines) if pool is not None else Board(rows, cols, mines)
+
+    board = new_board() if saved is None else saved
+    grid_top = TOP_UI
+    camera = Camera(rows, cols, cell_size, width - 2 * MARGIN,
+                    height - TOP_UI - MARGIN, origin=(MARGIN, grid_top))
+    renderer = BoardRenderer(screen, font, mine_img, flag_img, cell_size, camera)
+    # A resumed save has no recorded start, so it can't be replayed.
+    recorder = replay.recorder_for(board) if saved is None else None
+    history = History(board)
+
+    def finish(result):
+        if recorder is not None:
+            recorder.close()  # flush the log's buffered tail
+        return result
+
+    def play(changed, action, r, c):
+        renderer.mark(changed)
+        if changed and recorder is not None:
+            recorder.record(action, r, c)
+
+    caption_key = None
     running = True
     while running:
-        clock.tick(60)
-        mouse_pos = pygame.mouse.get_pos()
-
-        draw_info = draw_game(screen, font, board, mine_img, flag_img, cell_size)
+        # Only a new board or its first click changes the key; encode just then.
+        key = board_code.key_of(board)
+        if key != caption_key:
+            pygame.display.set_caption(f"Minesweeper – {board_code.encode(key)}")
+            caption_key = key
+
+        keys = pygame.key.get_pressed()
+        dx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * PAN_STEP
+        dy = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * PAN_STEP
+        if dx or dy:
+            renderer.scroll(dx, dy)
+
+        draw_info = renderer.render(board)
+        if PROFILER.visible:
+            pygame.display.update(PROFILER.draw_overlay(screen, resources.get_font("consolas", 13)))
+        PROFILER.end_frame()
         grid_top = draw_info["grid_top"]
         menu_rect = draw_info["menu"]
         quit_rect = draw_info["quit"]
 
-        hover_cell = get_cell_from_mouse(mouse_pos, board, cell_size, grid_top)
+        # Nothing in game.py animates: sleep until input arrives, except
+        # while a pan key is held down.
+        events = pacer.next_events(deadline=time.time() if (dx or dy) else None)
 
-        for event in pygame.event.get():
+        hover_cell = get_cell_from_mouse(pygame.mouse.get_pos(), board, cell_size, grid_top, camera)
+        renderer.set_hover(hover_cell)
+
+        for event in events:
             if event.type == pygame.QUIT:
-                return "quit"
+                return finish("quit")
+
+            elif event.type == pygame.WINDOWEXPOSED:
+                renderer.invalidate()
+
+            elif event.type == pygame.MOUSEMOTION and event.buttons[1]:
+                # Middle-button drag pans the board.
+                renderer.scroll(-event.rel[0], -event.rel[1])
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     if menu_rect.collidepoint(event.pos):
-                        return "menu"
+                        return finish("menu")
                     if quit_rect.collidepoint(event.pos):
-                        return "quit"
+                        return finish("quit")
 
-                    cell_pos = get_cell_from_mouse(event.pos, board, cell_size, grid_top)
+                    cell_pos = get_cell_from_mouse(event.pos, board, cell_size, grid_top, camera)
                     if cell_pos and not board.game_over:
                         r, c = cell_pos
-                        board.reveal_cell(r, c)
+                        play(history.do(board.reveal_cell, r, c), replay.REVEAL, r, c)
 
                 elif event.button == 3:
-                    cell_pos = get_cell_from_mouse(event.pos, board, cell_size, grid_top)
+                    cell_pos = get_cell_from_mouse(event.pos, board, cell_size, grid_top, camera)
                     if cell_pos and not board.game_over:
                         r, c = cell_pos
-                        board.toggle_flag(r, c)
+                        play(history.do(board.toggle_flag, r, c), replay.FLAG, r, c)
 
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_q:
-                    return "quit"
+                    return finish("quit")
                 if event.key == pygame.K_m:
-                    return "menu"
+                    return finish("menu")
                 if event.key == pygame.K_r:
-                    board = Board(rows, cols, mines)
+                    board = new_board()
+                    if recorder is not None:
+                        recorder.close()
+                    recorder = replay.recorder_for(board)
+                    history = History(board)
+                if event.key in (pygame.K_z, pygame.K_y) and event.mod & pygame.KMOD_CTRL:
+                    changed = history.undo() if event.key == pygame.K_z else history.redo()
+                    if changed:
+                        renderer.mark(changed)
+                        if recorder is not None:
+                            recorder.close()  # a replay log can't express undo; it ends here
+                            recorder = None
+                if event.key == pygame.K_F5:
+                    savefile.save(savefile.SAVE_PATH, board)
+                    print(f"Saved to {savefile.SAVE_PATH}")
+                if event.key == pygame.K_F9:
+                    try:
+                        loaded, _ = savefile.load(savefile.SAVE_PATH, Board)
+                    except (OSError, ValueError) as exc:
+                        print(f"Could not load {savefile.SAVE_PATH}: {exc}")
+                        continue
+                    return finish(("load", loaded))
+                if event.key == pygame.K_F3:
+                    PROFILER.toggle_overlay()
+                    renderer.invalidate()
                 if event.key == pygame.K_c and hover_cell and not board.game_over:
                     r, c = hover_cell
-                    board.chord(r, c)
+                    play(history.do(board.chord, r, c), replay.CHORD, r, c)
+
+    return finish("quit")
 
-    return "quit"
+def run_endless() -> str:
+    """
+    Plays an endless ChunkedBoard through an endless Camera; pan with the
+    arrow keys or a middle-button drag. Returns "menu" or "quit".
+    """
+    width, height = MAX_WINDOW_WIDTH, MAX_WINDOW_HEIGHT
+    cell_size = ENDLESS_CELL_SIZE
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption("Minesweeper – Endless")
+
+    font = resources.get_font("consolas", 22)
+    pacer = FramePacer()
+    mine_img, flag_img = load_images(cell_size)
+    camera = Camera(None, None, cell_size, width - 2 * MARGIN, height - TOP_UI - MARGIN,
+                    origin=(MARGIN, TOP_UI))
+    camera.center_on(0, 0)
+    renderer = BoardRenderer(screen, font, mine_img, flag_img, cell_size, camera)
+    board = ChunkedBoard(ENDLESS_DENSITY)
+    hover_cell = None
+
+    try:
+        while True:
+            keys = pygame.key.get_pressed()
+            dx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * PAN_STEP
+            dy = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * PAN_STEP
+            if dx or dy:
+                renderer.scroll(dx, dy)
+
+            # Panning repaints the grid; otherwise only the changed cells are drawn.
+            draw_info = renderer.render(board)
+            events = pacer.next_events(deadline=time.time() if (dx or dy) else None)
+            hover_cell = camera.cell_at(pygame.mouse.get_pos())
+            renderer.set_hover(hover_cell)
+
+            for event in events:
+                if event.type == pygame.QUIT:
+                    return "quit"
 
-def run_menu() -> tuple[int, int, int] | None:
+                elif event.type == pygame.MOUSEMOTION and event.buttons[1]:
+                    renderer.scroll(-event.rel[0], -event.rel[1])
+
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    cell_pos = camera.cell_at(event.pos)
+                    if event.button == 1:
+                        if draw_info["menu"].collidepoint(event.pos):
+                            return "menu"
+                        if draw_info["quit"].collidepoint(event.pos):
+                            return "quit"
+                        if cell_pos and not board.game_over:
+                            renderer.mark_cells(board.reveal_cell(*cell_pos))
+                    elif event.button == 3 and cell_pos and not board.game_over:
+                        renderer.mark_cells(board.toggle_flag(*cell_pos))
+
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_q:
+                        return "quit"
+                    if event.key == pygame.K_m:
+                        return "menu"
+                    if event.key == pygame.K_r:
+                        board.close()
+                        board = ChunkedBoard(ENDLESS_DENSITY)
+                        camera.center_on(0, 0)
+                    if event.key == pygame.K_c and hover_cell and not board.game_over:
+                        renderer.mark_cells(board.chord(*hover_cell))
+    finally:
+        board.close()
+
+
+def run_menu() -> tuple[int, int, int, int | None] | str | None:
     """
     Show a simple menu.
-    Returns (rows, cols, mines) or None if user quits.
+    Returns (rows, cols, mines, seed), "endless", or None if user quits;
+    seed is None for random boards.
     """
-    width, height = 600, 400
+    width, height = 600, 580
     screen = pygame.display.set_mode((width, height))
     pygame.display.set_caption("Minesweeper – Menu")
 
-    font_title = pygame.font.SysFont("consolas", 32)
-    font_btn = pygame.font.SysFont("consolas", 24)
+    font_title = resources.get_font("consolas", 32)
+    font_btn = resources.get_font("consolas", 24)
     clock = pygame.time.Clock()
     options = [
         ("Easy 9 x 9", 9, 9, 10),
         ("Medium 20 x 20", 20, 20, 60),
         ("Hard 50 x 80", 50, 80, 400),
         ("Custom", None, None, None),
+        ("Daily 50 x 80", 50, 80, 400),
+        ("Board code", None, None, None),
+        ("Endless", None, None, None),
     ]
 
     btn_rects = []
@@ -231,34 +542,62 @@ def run_menu() -> tuple[int, int, int] | None:
                 for (rect, label), opt in zip(btn_rects, options):
                     if rect.collidepoint(event.pos):
                         name, r, c, m = opt
+                        if name == "Endless":
+                            return "endless"
+                        if name.startswith("Daily"):
+                            seed = board_code.daily_seed()
+                            code = board_code.encode(board_code.BoardKey(r, c, m, None, seed))
+                            print(f"Daily challenge {code}")
+                            return r, c, m, seed
+                        if name == "Board code":
+                            try:
+                                key = board_code.decode(input("Board code: "))
+                            except ValueError as exc:
+                                print(f"{exc}; using 9x9.")
+                                return 9, 9, 10, None
+                            if key.first_click is not None:
+                                print("That code is for minesweeper.py; using 9x9.")
+                                return 9, 9, 10, None
+                            return key.rows, key.cols, key.mines, key.seed
                         if name != "Custom":
-                            return r, c, m
+                            return r, c, m, None
                         else:
                             try:
-                                rows = int(input("Rows (1–600): "))
-                                cols = int(input("Cols (1–600): "))
+                                rows = int(input(f"Rows (1–{board_code.MAX_SIDE}): "))
+                                cols = int(input(f"Cols (1–{board_code.MAX_SIDE}): "))
                             except ValueError:
                                 print("Invalid input; using 9x9.")
                                 rows, cols = 9, 9
 
-                            rows = max(1, min(600, rows))
-                            cols = max(1, min(600, cols))
+                            rows = max(1, min(board_code.MAX_SIDE, rows))
+                            cols = max(1, min(board_code.MAX_SIDE, cols))
                             mines = max(1, (rows * cols) // 6)
-                            return rows, cols, mines
+                            return rows, cols, mines, None
 
 
 def main():
     pygame.init()
+    pool = BoardPool(Board)
 
     while True:
         choice = run_menu()
         if choice is None:
             break
-        rows, cols, mines = choice
-        result = run_game(rows, cols, mines)
+        if choice == "endless":
+            if run_endless() == "quit":
+                break
+            continue
+        rows, cols, mines, seed = choice
+        result = run_game(rows, cols, mines, pool, seed=seed)
+        while isinstance(result, tuple):  # F9: carry on with the loaded game
+            _, loaded = result
+            result = run_game(loaded.rows, loaded.cols, loaded.mines_count, pool, loaded)
         if result == "quit":
             break
 
+    pool.close()
+    PROFILER.dump()
+    resources.clear()
     pygame.quit()
 
 
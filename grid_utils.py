@@ -0,0 +1,116 @@
+"""Board-independent grid helpers shared by the Board implementations."""
+import os
+import random
+from array import array
+from functools import lru_cache
+from itertools import accumulate
+
+# Set MINESWEEPER_DEBUG=1 to have every Board cross-check its running
+# counters against a full scan after each move.
+DEBUG = os.environ.get("MINESWEEPER_DEBUG", "") not in ("", "0")
+
+# Above this fraction of mines among the allowed cells, rejection sampling
+# wastes too many draws and sample_mines shuffles the full index list.
+DENSE_PLACEMENT_THRESHOLD = 0.5
+
+
+def adjacency_counts(mines, rows: int, cols: int) -> list:
+    """
+    Count mines in the 3x3 neighbourhood of every cell in one pass.
+
+    `mines` is a flat, row-major sequence of truthy/falsy mine flags.
+    Returns a flat list of counts with -1 marking the mines themselves,
+    exactly like the per-cell neighbour loop it replaces.
+    """
+    mines = [1 if m else 0 for m in mines]
+
+    # Horizontal 3-sums of every row (zero padded at both ends) ...
+    row_sums = []
+    for r in range(rows):
+        padded = [0, *mines[r * cols:(r + 1) * cols], 0]
+        row_sums.append([a + b + c for a, b, c in zip(padded, padded[1:], padded[2:])])
+
+    # ... then add up the sums of the rows above/below.
+    zero = [0] * cols
+    counts = []
+    for r in range(rows):
+        above = row_sums[r - 1] if r > 0 else zero
+        below = row_sums[r + 1] if r + 1 < rows else zero
+        row = mines[r * cols:(r + 1) * cols]
+        counts.extend(
+            -1 if m else a + b + c
+            for m, a, b, c in zip(row, above, row_sums[r], below)
+        )
+    return counts
+
+
+@lru_cache(maxsize=8)
+def neighbor_table(rows: int, cols: int):
+    """
+    CSR-style neighbour table for a rows x cols grid, built once per shape.
+
+    Returns (offsets, indices): the flat indices of the neighbours of flat
+    cell i are indices[offsets[i]:offsets[i + 1]]. Tables are cached by
+    (rows, cols), so every Board of a given size - including the fresh one
+    created on restart - shares the same read-only arrays.
+    """
+    def row_template(row_deltas):
+        # Relative neighbour indices for every column of one row.
+        template = []
+        for c in range(cols):
+            cell = []
+            for dr in row_deltas:
+                for dc in (-1, 0, 1):
+                    if (dr == 0 and dc == 0) or not 0 <= c + dc < cols:
+                        continue
+                    cell.append(dr * cols + c + dc)
+            template.append(cell)
+        return template
+
+    templates = {}
+    counts_per_cell = []
+    indices = array("i")
+    for r in range(rows):
+        deltas = tuple(dr for dr in (-1, 0, 1) if 0 <= r + dr < rows)
+        if deltas not in templates:
+            template = row_template(deltas)
+            templates[deltas] = (
+                [n for cell in template for n in cell],
+                [len(cell) for cell in template],
+            )
+        flat, counts = templates[deltas]
+        base = r * cols
+        indices.extend([base + n for n in flat])
+        counts_per_cell.extend(counts)
+    offsets = array("i", accumulate(counts_per_cell, initial=0))
+    return offsets, indices
+
+
+def sample_mines(total: int, count: int, forbidden=(), rng=random) -> list:
+    """
+    Pick `count` distinct flat indices in range(total) for the mines,
+    never using an index from `forbidden` (e.g. the first-click 3x3 zone).
+
+    Sparse boards are sampled directly by rejection, costing O(count) time
+    and memory regardless of the board area. When the mines fill more than
+    DENSE_PLACEMENT_THRESHOLD of the allowed cells it falls back to
+    shuffling the full list of allowed positions.
+    """
+    forbidden = set(forbidden)
+    allowed = total - len(forbidden)
+    count = max(0, min(count, allowed))
+    if count == 0:
+        return []
+
+    if count > allowed * DENSE_PLACEMENT_THRESHOLD:
+        positions = [i for i in range(total) if i not in forbidden]
+        rng.shuffle(positions)
+        return positions[:count]
+
+    chosen = set()
+    randrange = rng.randrange
+    while len(chosen) < count:
+        i = randrange(total)
+        if i not in forbidden:
+            chosen.add(i)
+    return list(chosen)
@@ -0,0 +1,444 @@
+"""
+Mine probabilities for the frontier when deduction gets stuck.
+
+The frontier constraints from solver.Solver are split into independent
+components. Each component is enumerated exactly (solutions counted per
+number of mines) or, past EXACT_NODE_LIMIT search nodes, counted by a
+dynamic program and estimated from uniformly sampled solutions, and
+marked approximate. The components are then combined and weighted by the
+number of ways the remaining mines fit into the unconstrained interior,
+C(interior, mines left). Component results are cached, so a move only
+pays for the components it changed.
+
+HintEngine runs this on a worker thread; a new request() cancels the
+computation in flight.
+"""
+import math
+import random
+import threading
+from collections import OrderedDict, namedtuple
+
+EXACT_NODE_LIMIT = 200_000
+SAMPLES = 400
+SAMPLE_STATE_LIMIT = 500_000
+# Cells traced back across all samples of one component.
+SAMPLE_CELL_LIMIT = 2_000_000
+MAX_CACHED_COMPONENTS = 256
+# Search nodes between two checks for cancellation.
+CHECK_EVERY = 2048
+
+# cell: flat index of the safest cell, probability: its mine probability,
+# exact: False if a component was too large to enumerate.
+Hint = namedtuple("Hint", "cell probability exact")
+
+
+class Cancelled(Exception):
+    pass
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+def components(constraints) -> list:
+    """Group (cells, mines) constraints that share cells into independent lists."""
+    parent = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for cells, _ in constraints:
+        first = None
+        for cell in cells:
+            parent.setdefault(cell, cell)
+            if first is None:
+                first = find(cell)
+            else:
+                root = find(cell)
+                if root != first:
+                    parent[root] = first
+
+    groups = {}
+    for constraint in constraints:
+        root = find(next(iter(constraint[0])))
+        groups.setdefault(root, []).append(constraint)
+    return list(groups.values())
+
+
+def _search(cell_cons, targets, sizes, on_leaf, budget, cancelled=None):
+    """
+    Iterative backtracking over 0/1 assignments that satisfy every
+    constraint; on_leaf(values) is called per solution and may return True
+    to stop.
+    """
+    n = len(cell_cons)
+    sums = [0] * len(targets)
+    free = list(sizes)
+    values = [-1] * n
+    tried = [0] * n
+    nodes = 0
+    i = 0
+    while i >= 0:
+        if i == n:
+            if on_leaf(values):
+                return
+            i -= 1
+            continue
+        v = values[i]
+        if v >= 0:
+            for c in cell_cons[i]:
+                sums[c] -= v
+                free[c] += 1
+            values[i] = -1
+        if tried[i] == 2:
+            tried[i] = 0
+            i -= 1
+            continue
+        v = tried[i]
+        tried[i] += 1
+
+        nodes += 1
+        if nodes > budget:
+            raise _BudgetExceeded
+        if cancelled is not None and nodes % CHECK_EVERY == 0 and cancelled():
+            raise Cancelled
+
+        ok = True
+        for c in cell_cons[i]:
+            sums[c] += v
+            free[c] -= 1
+            if sums[c] > targets[c] or sums[c] + free[c] < targets[c]:
+                ok = False
+        values[i] = v
+        if ok:
+            i += 1
+
+
+def _sample(component, order, by_cell, rng, cancelled=None):
+    """
+    Uniform random solutions for a component too large to enumerate.
+
+    A dynamic program over the cells in order counts the partial solutions
+    reaching each state (mines so far, partial sums of the constraints
+    still open), which gives counts[k] exactly. For every k, up to SAMPLES
+    solutions (fewer on huge components, see SAMPLE_CELL_LIMIT) are then
+    traced back from the end state, each predecessor picked with
+    probability proportional to its count, so every k-mine solution is
+    equally likely; mine_counts[k][j] is counts[k] times the fraction of
+    them with a mine on cells[j]. Counts are floats scaled by a common
+    power of two. Raises _BudgetExceeded past SAMPLE_STATE_LIMIT states.
+    """
+    targets = [mines for _, mines in component]
+    pos = {cell: i for i, cell in enumerate(order)}
+    last = [max(pos[cell] for cell in cells) for cells, _ in component]
+
+    layers = []  # per cell: {state: (count, [(count, previous state, value), ...])}
+    reach = {((), 0): 1}
+    open_cons = []
+    states = 0
+    for i, cell in enumerate(order):
+        cons = by_cell[cell]
+        grown = open_cons + [c for c in cons if c not in open_cons]
+        slot = {c: j for j, c in enumerate(grown)}
+        closing = [c for c in cons if last[c] == i]
+        kept = [c for c in grown if last[c] != i]
+        nxt, links = {}, {}
+        for state, count in reach.items():
+            sums, k = state
+            sums = list(sums) + [0] * (len(grown) - len(sums))
+            for v in (0, 1):
+                if v:
+                    for c in cons:
+                        sums[slot[c]] += 1
+                    if any(sums[slot[c]] > targets[c] for c in cons):
+                        break
+                if any(sums[slot[c]] != targets[c] for c in closing):
+                    continue
+                key = (tuple(sums[slot[c]] for c in kept), k + v)
+                nxt[key] = nxt.get(key, 0) + count
+                links.setdefault(key, []).append((count, state, v))
+        states += len(nxt)
+        if states > SAMPLE_STATE_LIMIT:
+            raise _BudgetExceeded
+        if cancelled is not None and cancelled():
+            raise Cancelled
+        layers.append({key: (nxt[key], links[key]) for key in nxt})
+        open_cons, reach = kept, nxt
+
+    n = len(order)
+    samples = max(1, min(SAMPLES, SAMPLE_CELL_LIMIT // (n * max(1, len(reach)))))
+    shift = max(0, max(reach.values(), default=1).bit_length() - 64)
+    counts, mine_counts = {}, {}
+    for (_, k), count in reach.items():
+        hits = [0] * n
+        for _ in range(samples):
+            state = ((), k)
+            for i in range(n - 1, -1, -1):
+                total, links = layers[i][state]
+                if len(links) == 1:
+                    _, previous, v = links[0]
+                else:
+                    pick = rng.randrange(total)
+                    for link_count, previous, v in links:
+                        pick -= link_count
+                        if pick < 0:
+                            break
+                hits[i] += v
+                state = previous
+            if cancelled is not None and cancelled():
+                raise Cancelled
+        counts[k] = count / (1 << shift)
+        mine_counts[k] = [counts[k] * h / samples for h in hits]
+    return counts, mine_counts
+
+
+def solve_component(component, cancelled=None, rng=None):
+    """
+    Solutions of one component by number of mines.
+
+    Returns (cells, counts, mine_counts, exact): counts[k] is the number
+    of solutions with k mines (up to a common factor if not exact) and
+    mine_counts[k][j] how many of them put a mine on cells[j] (estimated
+    from uniform samples if not exact, see _sample()).
+    """
+    # Breadth-first cell order so constraints close as early as possible.
+    by_cell = {}
+    for ci, (cells, _) in enumerate(component):
+        for cell in cells:
+            by_cell.setdefault(cell, []).append(ci)
+    start = min(by_cell)
+    order, seen = [start], {start}
+    for cell in order:
+        for ci in by_cell[cell]:
+            for other in sorted(component[ci][0]):
+                if other not in seen:
+                    seen.add(other)
+                    order.append(other)
+
+    cell_cons = [by_cell[cell] for cell in order]
+    targets = [mines for _, mines in component]
+    sizes = [len(cells) for cells, _ in component]
+    counts, mine_counts = {}, {}
+
+    def tally(values):
+        k = sum(values)
+        counts[k] = counts.get(k, 0) + 1
+        per_cell = mine_counts.get(k)
+        if per_cell is None:
+            per_cell = mine_counts[k] = [0] * len(values)
+        for j, v in enumerate(values):
+            if v:
+                per_cell[j] += 1
+
+    try:
+        _search(cell_cons, targets, sizes, tally, EXACT_NODE_LIMIT, cancelled=cancelled)
+        return order, counts, mine_counts, True
+    except _BudgetExceeded:
+        pass
+
+    try:
+        counts, mine_counts = _sample(component, order, by_cell, rng or random.Random(0),
+                                      cancelled)
+    except _BudgetExceeded:
+        return order, {}, {}, False  # no estimate: probabilities() gives up on the hint
+    return order, counts, mine_counts, False
+
+
+def _log_comb(n: int, k: int) -> float:
+    if k < 0 or k > n:
+        return -math.inf
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+def _convolve(a: list, b: list) -> list:
+    out = [0.0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                out[i + j] += x * y
+    return out
+
+
+def probabilities(solved, interior: int, mines_left: int):
+    """
+    Combine solved components into per-cell mine probabilities.
+
+    Returns ({flat index: probability}, interior probability or None), or
+    None if no mine count is consistent with the constraints.
+    """
+    polys = []
+    for _, counts, _, _ in solved:
+        total = sum(counts.values())
+        if not total:
+            return None
+        poly = [0.0] * (max(counts) + 1)
+        for k, count in counts.items():
+            poly[k] = count / total  # each component's scale cancels out
+        polys.append(poly)
+
+    # others[i]: distribution of frontier mines outside component i.
+    prefix = [[1.0]]
+    for poly in polys:
+        prefix.append(_convolve(prefix[-1], poly))
+    suffix = [[1.0]]
+    for poly in reversed(polys):
+        suffix.append(_convolve(suffix[-1], poly))
+    suffix.reverse()
+    everything = prefix[-1]
+
+    log_w = [_log_comb(interior, mines_left - k) for k in range(len(everything))]
+    top = max(log_w)
+    if top == -math.inf:
+        return None
+    weight = [math.exp(x - top) for x in log_w]
+    z = sum(p * w for p, w in zip(everything, weight))
+    if z <= 0:
+        return None
+
+    cell_p = {}
+    for i, (cells, counts, mine_counts, _) in enumerate(solved):
+        others = _convolve(prefix[i], suffix[i + 1])
+        poly = polys[i]
+        acc = [0.0] * len(cells)
+        for k, count in counts.items():
+            factor = sum(o * weight[k + j] for j, o in enumerate(others))
+            scale = poly[k] * factor / count
+            for j, m in enumerate(mine_counts.get(k, ())):
+                if m:
+                    acc[j] += m * scale
+        for cell, value in zip(cells, acc):
+            cell_p[cell] = value / z
+
+    interior_p = None
+    if interior:
+        interior_p = sum(p * w * (mines_left - k) / interior
+                         for k, (p, w) in enumerate(zip(everything, weight))) / z
+    return cell_p, interior_p
+
+
+def snapshot(board, solver):
+    """
+    Everything the worker needs, taken on the UI thread so the worker
+    never reads a board the player is changing.
+    """
+    constraints = solver.constraints()
+    frontier = set()
+    for cells, _ in constraints:
+        frontier |= cells
+
+    total = board.rows * board.cols
+    revealed = (total - board.mines_count) - board._hidden_safe
+    hidden = total - revealed - board._flag_count
+    excluded = frontier | solver.mines | solver.safe
+    interior = hidden - len(excluded)
+    mines_left = board.mines_count - board._flag_count - len(solver.mines)
+
+    interior_cell = None
+    if interior:
+        is_revealed, is_flagged = solver._revealed, solver._flagged
+        for i in range(total):
+            if not is_revealed(i) and not is_flagged(i) and i not in excluded:
+                interior_cell = i
+                break
+    return constraints, interior, mines_left, interior_cell
+
+
+class HintEngine:
+    """
+    Background worker publishing the safest cell for the latest request.
+
+    request() snapshots the board and supersedes any earlier request; the
+    worker abandons a computation as soon as a newer one arrives. When a
+    hint is ready, `result` is set and on_ready() is called from the worker
+    thread (e.g. to post a pygame event).
+    """
+
+    def __init__(self, on_ready=None):
+        self.on_ready = on_ready
+        self.result = None
+        self._cond = threading.Condition()
+        self._generation = 0
+        self._pending = None
+        self._closed = False
+        self._cache = OrderedDict()  # frozenset(component) -> solve_component result
+        self._thread = threading.Thread(target=self._run, name="hints", daemon=True)
+        self._thread.start()
+
+    def request(self, board, solver):
+        if solver.safe:
+            # Deduction already has an answer; no need to wake the worker.
+            with self._cond:
+                self._generation += 1
+                self._pending = None
+                self.result = Hint(min(solver.safe), 0.0, True)
+            return
+        job = snapshot(board, solver)
+        with self._cond:
+            self._generation += 1
+            self._pending = (self._generation, job)
+            self.result = None
+            self._cond.notify()
+
+    def cancel(self):
+        with self._cond:
+            self._generation += 1
+            self._pending = None
+            self.result = None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._generation += 1
+            self._cond.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                generation, job = self._pending
+                self._pending = None
+            try:
+                hint = self._compute(job, lambda: self._generation != generation)
+            except Cancelled:
+                continue
+            with self._cond:
+                if self._generation != generation:
+                    continue
+                self.result = hint
+            if hint is not None and self.on_ready is not None:
+                self.on_ready()
+
+    def _solve_cached(self, component, cancelled):
+        key = frozenset(component)
+        solved = self._cache.get(key)
+        if solved is not None:
+            self._cache.move_to_end(key)
+            return solved
+        solved = solve_component(component, cancelled)
+        self._cache[key] = solved
+        if len(self._cache) > MAX_CACHED_COMPONENTS:
+            self._cache.popitem(last=False)
+        return solved
+
+    def _compute(self, job, cancelled):
+        constraints, interior, mines_left, interior_cell = job
+        solved = [self._solve_cached(component, cancelled)
+                  for component in components(constraints)]
+        result = probabilities(solved, interior, mines_left)
+        if result is None:
+            return None
+        cell_p, interior_p = result
+        exact = all(s[3] for s in solved)
+        best = min(cell_p.items(), key=lambda item: (item[1], item[0]), default=None)
+        if interior_cell is not None and (best is None or interior_p < best[1]):
+            return Hint(interior_cell, interior_p, exact)
+        if best is None:
+            return None
+        return Hint(best[0], best[1], exact)
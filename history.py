@@ -0,0 +1,159 @@
+"""
+Undo/redo for board moves, stored as deltas.
+
+A step keeps the flat indices the move changed (the list every Board
+action returns, flood-fill cascades included) packed into an array, plus
+the game_over/victory flags before and after. Undo and redo flip exactly
+those cells back or forth, so a step costs 4 bytes per changed cell
+whatever the board size. Steps are dropped oldest-first to stay within
+max_bytes; a single step larger than the budget can't be undone.
+
+The first click of a classic_board.Board also deals the mines. Its step
+keeps the layout too, so undoing it takes the mines back off and the next
+first click is safe again; redoing it deals the same layout.
+"""
+from array import array
+from collections import deque
+
+MAX_HISTORY_BYTES = 8 * 1024 * 1024
+# Rough per-step cost besides the index array (tuple, array header, deque slot).
+STEP_OVERHEAD = 160
+
+REVEAL, FLAG = 0, 1
+
+
+def _cell_access(board):
+    """(revealed(i), set_revealed(indices, value), toggle_flag(i), mines_among(indices)) for any engine."""
+    if hasattr(board, "_revealed_buf"):  # np_board.ArrayBoard: vectorised on its NumPy views
+        import numpy as np
+
+        revealed, flagged = board._revealed_buf, board._flagged_buf
+        flat_revealed, flat_mines = board.revealed.reshape(-1), board.is_mine.reshape(-1)
+
+        def set_revealed(indices, value):
+            flat_revealed[np.frombuffer(indices, dtype=np.uint32)] = value
+
+        def toggle_flag(i):
+            flagged[i] ^= 1
+            return flagged[i]
+
+        def mines_among(indices):
+            return int(flat_mines[np.frombuffer(indices, dtype=np.uint32)].sum())
+
+        return revealed.__getitem__, set_revealed, toggle_flag, mines_among
+
+    cells = board._cells
+
+    def set_revealed(indices, value):
+        for i in indices:
+            cells[i].revealed = value
+
+    def toggle_flag(i):
+        cell = cells[i]
+        cell.flagged = not cell.flagged
+        return cell.flagged
+
+    def mines_among(indices):
+        return sum(1 for i in indices if cells[i].is_mine)
+
+    return lambda i: cells[i].revealed, set_revealed, toggle_flag, mines_among
+
+
+class History:
+    """
+    Wrap moves in do() to make them undoable:
+
+        changed = history.do(board.reveal, r, c)
+        changed = history.undo()   # cells to redraw, [] if nothing to undo
+    """
+
+    def __init__(self, board, max_bytes: int = MAX_HISTORY_BYTES):
+        self.board = board
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._undo = deque()
+        self._redo = []
+        self._revealed, self._set_revealed, self._toggle_flag, self._mines_among = \
+            _cell_access(board)
+
+    def do(self, action, *args) -> list:
+        """Run a Board action and record what it changed."""
+        board = self.board
+        before = (board.game_over, board.victory)
+        placed = getattr(board, "mines_placed", True)
+        changed = action(*args)
+        if not changed:
+            return changed
+        # A flag toggle changes one hidden cell; anything else reveals.
+        kind = REVEAL if self._revealed(changed[0]) else FLAG
+        dealt = None
+        if not placed and board.mines_placed:
+            mines = [i for i, cell in enumerate(board._cells) if cell.is_mine]
+            dealt = (board.first_click, array("I", mines))
+        step = (kind, array("I", changed), before, (board.game_over, board.victory), dealt)
+        self._redo.clear()
+        self._push(step)
+        return changed
+
+    def _size(self, step) -> int:
+        indices, dealt = step[1], step[4]
+        size = STEP_OVERHEAD + indices.itemsize * len(indices)
+        if dealt is not None:
+            size += dealt[1].itemsize * len(dealt[1])
+        return size
+
+    def _push(self, step):
+        self._undo.append(step)
+        self.bytes += self._size(step)
+        while self.bytes > self.max_bytes and self._undo:
+            self.bytes -= self._size(self._undo.popleft())
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> list:
+        if not self._undo:
+            return []
+        step = self._undo.pop()
+        self.bytes -= self._size(step)
+        self._apply(step, forward=False)
+        self._redo.append(step)
+        return step[1].tolist()
+
+    def redo(self) -> list:
+        if not self._redo:
+            return []
+        step = self._redo.pop()
+        self._apply(step, forward=True)
+        self._push(step)
+        return step[1].tolist()
+
+    def clear(self):
+        """Forget everything, e.g. after a change made outside do()."""
+        self._undo.clear()
+        self._redo.clear()
+        self.bytes = 0
+
+    def _apply(self, step, forward: bool):
+        kind, indices, before, after, dealt = step
+        board = self.board
+        if dealt is not None and forward:
+            board.set_mines(dealt[1])
+            board.first_click = dealt[0]
+        if kind == FLAG:
+            flagged = self._toggle_flag(indices[0])
+            board._flag_count += 1 if flagged else -1
+        else:
+            self._set_revealed(indices, forward)
+            safe = len(indices)
+            if after[0] and not after[1] and not before[0]:
+                safe -= self._mines_among(indices)  # only a losing move reveals mines
+            board._hidden_safe += -safe if forward else safe
+        if dealt is not None and not forward:
+            board.clear_mines()
+        board.game_over, board.victory = after if forward else before
+        if board.debug:
+            board._verify_counters()
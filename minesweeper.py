@@ -1,8 +1,22 @@
 import pygame
-import random
 import time
 import math
 
+import board_code
+import replay
+import resources
+import savefile
+from board_pool import BoardPool
+from pacing import FramePacer
+from profiler import PROFILER
+from classic_board import Board, Cell, reveal_all_cells
+from grid_utils import DEBUG
+from hints import HintEngine
+from history import History
+import no_guess
+from solver import Solver
+from viewport import MIN_CELL_SIZE, PAN_STEP, Camera
+
 def draw_glass_panel_from_bg(surface, blurred_bg, rect, radius=18, fog_alpha=100):
     """Draw a frosted Apple-like glass panel clipped from blurred background."""
     x, y, w, h = rect
@@ -43,6 +57,7 @@ def draw_glass_panel_from_bg(surface, blurred_bg, rect, radius=18, fog_alpha=100
 BEGINNER = (9, 9, 10)
 INTERMEDIATE = (16, 16, 40)
 EXPERT = (16, 30, 99)
+MAX_ROWS, MAX_COLS = 24, 30  # largest custom board
 
 CELL_SIZE = 28
 BORDER = 12
@@ -59,6 +74,10 @@ GRID_COLOR = (120, 130, 150)
 
 CELL_DARK = (160, 160, 160)
 CELL_LIGHT = (235, 240, 248)
+HINT_COLOR = (40, 200, 120)
+
+# Posted by the hint worker thread when a new hint is ready.
+HINT_READY = pygame.USEREVENT + 1
 
 NUMBER_COLORS = {
     1: (0, 0, 255),
@@ -77,16 +96,23 @@ FACE_LOSE = 2
 FACE_PRESSED = 3
 
 
-def draw_seaside_background(surface, t: float) -> None:
-    """
-    Draw an animated seaside background: sky, ocean, sand, and moving waves.
-    t = time in seconds (we'll use pygame.time.get_ticks inside draw_board).
-    """
-    w, h = surface.get_size()
+WAVE_AMP = 6
+WAVE_LEN = 80
+WAVE_SPEED = 1.5
+WAVE_COLOR = (245, 250, 255)
+
 
+def seaside_layout(h: int):
+    """Heights of the sky and sea bands; the sand fills the rest."""
     sky_h = int(h * 0.45)
     sea_h = int(h * 0.25)
-    sand_h = h - sky_h - sea_h
+    return sky_h, sea_h, h - sky_h - sea_h
+
+
+def draw_seaside_gradient(surface) -> None:
+    """Draw the static part of the seaside background: sky, ocean and sand."""
+    w, h = surface.get_size()
+    sky_h, sea_h, sand_h = seaside_layout(h)
 
     for y in range(sky_h):
         u = y / max(1, sky_h - 1)
@@ -113,20 +139,71 @@ def draw_seaside_background(surface, t: float) -> None:
         y = sand_top + i
         pygame.draw.line(surface, (r, g, b), (0, y), (w, y))
 
-    shoreline_y = sand_top
-    wave_amp = 6
-    wave_len = 80
-    wave_speed = 1.5
 
+def draw_waves(surface, shoreline_y: int, t: float, x0: int = 0, width=None) -> None:
+    """Draw the three shoreline wave bands at time t."""
+    w = surface.get_width() if width is None else width
     for band in range(3):
-        phase = t * wave_speed + band * 0.7
+        phase = t * WAVE_SPEED + band * 0.7
         pts = []
         for x in range(0, w, 4):
-            offset = math.sin(2 * math.pi * (x / wave_len) + phase) * wave_amp
+            offset = math.sin(2 * math.pi * (x / WAVE_LEN) + phase) * WAVE_AMP
             y = shoreline_y - 4 - band * 4 + offset
-            pts.append((x, y))
+            pts.append((x0 + x, y))
         if len(pts) > 1:
-            pygame.draw.lines(surface, (245, 250, 255), False, pts, 2)
+            pygame.draw.lines(surface, WAVE_COLOR, False, pts, 2)
+
+
+class SeasideBackground:
+    """
+    Cached seaside background for one window size.
+
+    The sky/sea/sand gradient (and its blurred copy for the glass panels)
+    is rendered once and only rebuilt when the size changes or after
+    invalidate() (VIDEORESIZE). All three wave bands scroll at the same
+    speed, so they are pre-drawn once into a strip one wavelength wider
+    than the window; animating them is a single offset blit per frame.
+    """
+
+    def __init__(self):
+        self.size = None
+        self.static = None
+        self.blurred = None
+        self._waves = None
+        self._waves_top = 0
+
+    def invalidate(self):
+        self.size = None
+
+    def _build(self, size):
+        w, h = size
+        self.size = size
+        self.static = pygame.Surface(size)
+        draw_seaside_gradient(self.static)
+        with PROFILER.phase("blur"):
+            self.blurred = blur_surface(self.static, scale_factor=0.2)
+
+        sky_h, sea_h, _ = seaside_layout(h)
+        shoreline_y = sky_h + sea_h
+        margin = WAVE_AMP + 2
+        self._waves_top = shoreline_y - 12 - margin
+        strip_h = 8 + 2 * margin + 2
+        self._waves = pygame.Surface((w + WAVE_LEN + 4, strip_h), pygame.SRCALPHA)
+        draw_waves(self._waves, shoreline_y - self._waves_top, 0.0,
+                   width=self._waves.get_width())
+
+    def draw(self, surface, t: float):
+        """Blit the static layer and the wave strip for time t."""
+        size = surface.get_size()
+        if size != self.size:
+            self._build(size)
+        surface.blit(self.static, (0, 0))
+        # sin(2*pi*x/L + phase) is the t=0 strip shifted left by phase*L/(2*pi).
+        shift = int((t * WAVE_SPEED / (2 * math.pi)) * WAVE_LEN) % WAVE_LEN
+        surface.blit(self._waves, (-shift, self._waves_top))
+
+
+SEASIDE = SeasideBackground()
 
 
 def blur_surface(source: pygame.Surface, scale_factor: float = 0.25) -> pygame.Surface:
@@ -141,262 +218,109 @@ def blur_surface(source: pygame.Surface, scale_factor: float = 0.25) -> pygame.S
     return blurred
 
 
-def draw_glass_tile_from_bg(surface: pygame.Surface,
-                            blurred_bg: pygame.Surface,
-                            rect: pygame.Rect,
-                            cell) -> None:
-    """
-    Improved Apple glass tile renderer:
-    - unrevealed: darker, heavier frost, more opaque
-    - revealed blank (adj = 0): bright translucent glass
-    - revealed number: same but with text
-    """
-    x, y, w, h = rect
-    tile = pygame.Surface((w, h), pygame.SRCALPHA)
+TILE_HIDDEN = "hidden"
+TILE_FLAG = "flag"
+TILE_MINE = "mine"
 
-    tile.blit(blurred_bg, (0, 0), area=rect)
+# (fog, highlight, shadow, border) alphas per tile look.
+_TILE_GLASS = {
+    "hidden": (160, 70, 90, 180),
+    "blank": (60, 130, 40, 220),
+    "number": (80, 120, 60, 220),
+}
 
-    if not cell.revealed:
-        fog_alpha = 160
-        highlight_alpha = 70
-        shadow_alpha = 90
-        border_alpha = 180
-        border_color = (255, 255, 255, border_alpha)
 
-    else:
-        if cell.adj == 0:
-            fog_alpha = 60
-            highlight_alpha = 130
-            shadow_alpha = 40
-            border_alpha = 220
-            border_color = (255, 255, 255, border_alpha)
-        else:
-            fog_alpha = 80
-            highlight_alpha = 120
-            shadow_alpha = 60
-            border_alpha = 220
-            border_color = (255, 255, 255, border_alpha)
+def build_glass_tile(size: int, look: str) -> pygame.Surface:
+    """One frosted-glass tile overlay (no background) of size x size."""
+    fog_alpha, highlight_alpha, shadow_alpha, border_alpha = _TILE_GLASS[look]
+    tile = pygame.Surface((size, size), pygame.SRCALPHA)
 
-    fog = pygame.Surface((w, h), pygame.SRCALPHA)
+    fog = pygame.Surface((size, size), pygame.SRCALPHA)
     pygame.draw.rect(fog, (255, 255, 255, fog_alpha), fog.get_rect(), border_radius=8)
     tile.blit(fog, (0, 0))
 
-    highlight_rect = pygame.Rect(0, 0, w, h // 2)
     pygame.draw.rect(tile, (255, 255, 255, highlight_alpha),
-                     highlight_rect, border_radius=8)
-    shadow_rect = pygame.Rect(0, h // 3, w, h * 2 // 3)
+                     (0, 0, size, size // 2), border_radius=8)
     pygame.draw.rect(tile, (0, 0, 0, shadow_alpha),
-                     shadow_rect, border_radius=8)
-
-    pygame.draw.rect(tile, border_color, tile.get_rect(),
+                     (0, size // 3, size, size * 2 // 3), border_radius=8)
+    pygame.draw.rect(tile, (255, 255, 255, border_alpha), tile.get_rect(),
                      width=1, border_radius=8)
+    return tile
 
-    surface.blit(tile, (x, y))
 
-
-def draw_glass_tile_from_bg(surface: pygame.Surface,
-                            blurred_bg: pygame.Surface,
-                            rect: pygame.Rect,
-                            revealed: bool) -> None:
+def build_tile_atlas(cell_size: int, font) -> dict:
     """
-    Misty Apple-glass tile: shows a blurred version of the seaside behind it.
-    You can roughly see shapes but not clearly.
+    Pre-composite every cell state for one CELL_SIZE: hidden, flagged,
+    revealed 0-8 and mine. Keys are TILE_HIDDEN, TILE_FLAG, TILE_MINE and
+    the adjacency count 0-8.
     """
-    x, y, w, h = rect
-    tile = pygame.Surface((w, h), pygame.SRCALPHA)
-
-    tile.blit(blurred_bg, (0, 0), area=rect)
-
-    fog_alpha = 150 if not revealed else 100
-    fog = pygame.Surface((w, h), pygame.SRCALPHA)
-    pygame.draw.rect(fog, (255, 255, 255, fog_alpha),
-                     fog.get_rect(), border_radius=8)
-    tile.blit(fog, (0, 0))
-
-    highlight_rect = pygame.Rect(0, 0, w, h // 2)
-    pygame.draw.rect(tile, (255, 255, 255, 120),
-                     highlight_rect, border_radius=8)
-
-    shadow_rect = pygame.Rect(0, h // 3, w, h * 2 // 3)
-    pygame.draw.rect(tile, (0, 0, 0, 60),
-                     shadow_rect, border_radius=8)
-
-    pygame.draw.rect(tile, (255, 255, 255, 220),
-                     tile.get_rect(), width=1, border_radius=8)
-
-    surface.blit(tile, (x, y))
-
-class Cell:
-    def __init__(self, r, c):
-        self.r = r
-        self.c = c
-        self.is_mine = False
-        self.adj = 0
-        self.revealed = False
-        self.flagged = False
-
-    def reset(self):
-        self.is_mine = False
-        self.adj = 0
-        self.revealed = False
-        self.flagged = False
-
-
-class Board:
-    def __init__(self, rows, cols, mines):
-        self.rows = rows
-        self.cols = cols
-        self.mines_count = mines
-        self.grid = [[Cell(r, c) for c in range(cols)] for r in range(rows)]
-        self.mines_placed = False
-        self.game_over = False
-        self.victory = False
-
-    def in_bounds(self, r, c):
-        return 0 <= r < self.rows and 0 <= c < self.cols
-
-    def neighbors(self, r, c):
-        for dr in (-1, 0, 1):
-            for dc in (-1, 0, 1):
-                if dr == 0 and dc == 0:
-                    continue
-                nr, nc = r + dr, c + dc
-                if self.in_bounds(nr, nc):
-                    yield self.grid[nr][nc]
-
-    def _compute_adjacencies(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                cell = self.grid[r][c]
-                if cell.is_mine:
-                    cell.adj = -1
-                    continue
-                cell.adj = sum(1 for n in self.neighbors(r, c) if n.is_mine)
-
-    def place_mines(self, safe_r, safe_c):
-        """
-        Windows-7-style: first click is guaranteed a 0.
-        We generate mines AFTER the first click, and ensure that
-        the clicked cell and its neighbors have no mines.
-        """
-        forbidden = {(safe_r, safe_c)}
-        for n in self.neighbors(safe_r, safe_c):
-            forbidden.add((n.r, n.c))
-
-        positions = [
-            (r, c)
-            for r in range(self.rows)
-            for c in range(self.cols)
-            if (r, c) not in forbidden
-        ]
-        random.shuffle(positions)
-        for r, c in positions[: self.mines_count]:
-            self.grid[r][c].is_mine = True
-
-        self._compute_adjacencies()
-        self.mines_placed = True
-        assert self.grid[safe_r][safe_c].adj == 0
-
-    def reveal(self, r, c):
-        if not self.in_bounds(r, c) or self.game_over:
-            return
-
-        cell = self.grid[r][c]
-
-        if not self.mines_placed:
-            self.place_mines(r, c)
-
-        if cell.revealed or cell.flagged:
-            return
-
-        cell.revealed = True
-
-        if cell.is_mine:
-            self.game_over = True
-            self.victory = False
-            return
+    size = max(1, cell_size - 4)
+    rect = pygame.Rect(0, 0, size, size)
+    atlas = {TILE_HIDDEN: build_glass_tile(size, "hidden")}
+
+    flag = atlas[TILE_HIDDEN].copy()
+    pole_x = rect.w // 3
+    pole_y1 = rect.h // 5
+    pole_y2 = rect.bottom - rect.h // 6
+    pygame.draw.line(flag, (20, 20, 20), (pole_x, pole_y1), (pole_x, pole_y2), 2)
+    pygame.draw.polygon(flag, (255, 90, 90), [
+        (pole_x, pole_y1),
+        (pole_x + rect.w // 2, pole_y1 + rect.h // 5),
+        (pole_x, pole_y1 + rect.h // 2),
+    ])
+    atlas[TILE_FLAG] = flag
+
+    atlas[0] = build_glass_tile(size, "blank")
+    number_tile = build_glass_tile(size, "number")
+    for n in range(1, 9):
+        tile = number_tile.copy()
+        text = font.render(str(n), True, NUMBER_COLORS.get(n, (0, 0, 0)))
+        tile.blit(text, text.get_rect(center=rect.center))
+        atlas[n] = tile
+
+    mine = number_tile.copy()
+    pygame.draw.circle(mine, (0, 0, 0), rect.center, cell_size // 5)
+    atlas[TILE_MINE] = mine
+    return atlas
+
+
+class TileAtlas:
+    """Caches build_tile_atlas for the current CELL_SIZE (and font)."""
+
+    def __init__(self):
+        self._key = None
+        self._tiles = None
+
+    def get(self, cell_size: int, font) -> dict:
+        key = (cell_size, font)
+        if key != self._key:
+            self._tiles = build_tile_atlas(cell_size, font)
+            self._key = key
+        return self._tiles
+
+
+TILE_ATLAS = TileAtlas()
 
-        if cell.adj == 0:
-            self._flood_fill(r, c)
-
-        if self._check_win():
-            self.game_over = True
-            self.victory = True
-
-    def _flood_fill(self, r, c):
-        stack = [(r, c)]
-        while stack:
-            cr, cc = stack.pop()
-            cell = self.grid[cr][cc]
-            for n in self.neighbors(cr, cc):
-                if n.revealed or n.flagged or n.is_mine:
-                    continue
-                n.revealed = True
-                if n.adj == 0:
-                    stack.append((n.r, n.c))
-
-    def toggle_flag(self, r, c):
-        if not self.in_bounds(r, c) or self.game_over:
-            return
-        cell = self.grid[r][c]
-        if cell.revealed:
-            return
-        cell.flagged = not cell.flagged
-
-    def chord(self, r, c):
-        """
-        Windows-style chord:
-        If we are on a revealed number and the number of
-        flagged neighbors equals that number, reveal the others.
-        """
-        if not self.in_bounds(r, c) or self.game_over:
-            return
-        cell = self.grid[r][c]
-        if not cell.revealed or cell.adj <= 0:
-            return
-
-        neigh = list(self.neighbors(r, c))
-        flagged = sum(1 for n in neigh if n.flagged)
-
-        if flagged != cell.adj:
-            return
-
-        for n in neigh:
-            if n.flagged or n.revealed:
-                continue
-            n.revealed = True
-            if n.is_mine:
-                self.game_over = True
-                self.victory = False
-            elif n.adj == 0:
-                self._flood_fill(n.r, n.c)
-
-        if self._check_win():
-            self.game_over = True
-            self.victory = True
-
-    def remaining_mines_estimate(self):
-        flags = sum(1 for row in self.grid for c in row if c.flagged)
-        return max(0, self.mines_count - flags)
-
-    def _check_win(self):
-        for row in self.grid:
-            for c in row:
-                if not c.is_mine and not c.revealed:
-                    return False
-        return True
-
-def reveal_all_cells(board):
-    """Reveal every cell on the board (used after loss banner)."""
-    for row in board.grid:
-        for cell in row:
-            cell.revealed = True
 
 def calc_window_size(rows, cols):
     width = max(cols * CELL_SIZE + BORDER * 2, MIN_WINDOW_WIDTH)
     height = rows * CELL_SIZE + BORDER * 2 + TOP_PANEL + BOTTOM_PANEL
     return width, height
 
+
+def fit_board(width, height, camera):
+    """
+    Pick CELL_SIZE for a width x height window and resize the camera to
+    match. Boards that don't fit at the minimum cell size scroll instead.
+    """
+    global CELL_SIZE
+    rows, cols = camera.rows, camera.cols
+    available_w = width - 2 * BORDER
+    available_h = height - TOP_PANEL - BOTTOM_PANEL - 2 * BORDER
+    CELL_SIZE = max(MIN_CELL_SIZE, min(available_w // cols, available_h // rows))
+    camera.resize(min(available_w, cols * CELL_SIZE),
+                  min(available_h, rows * CELL_SIZE), cell_size=CELL_SIZE)
+
 def draw_3d_rect(surface, rect, raised=True, fill=None):
     x, y, w, h = rect
     if fill:
@@ -577,17 +501,16 @@ def draw_face(surface, rect, state):
 
 
 def draw_board(surface, board, font, mine_font, elapsed, face_state,
-               banner_text=None, show_quit_button=False):
+               banner_text=None, show_quit_button=False, camera=None, t=None,
+               hint=None):
     rows, cols = board.rows, board.cols
     width, height = surface.get_size()
 
-    bg = pygame.Surface((width, height))
-    t = pygame.time.get_ticks() / 1000.0
-    draw_seaside_background(bg, t)
-
-    blurred_bg = blur_surface(bg, scale_factor=0.2)
-
-    surface.blit(bg, (0, 0))
+    if t is None:
+        t = pygame.time.get_ticks() / 1000.0
+    with PROFILER.phase("background"):
+        SEASIDE.draw(surface, t)
+    blurred_bg = SEASIDE.blurred
 
     top_rect = pygame.Rect(
         BORDER,
@@ -595,7 +518,8 @@ def draw_board(surface, board, font, mine_font, elapsed, face_state,
         width - 2 * BORDER,
         TOP_PANEL - 10,
     )
-    draw_glass_panel_from_bg(surface, blurred_bg, top_rect, radius=18)
+    with PROFILER.phase("glass"):
+        draw_glass_panel_from_bg(surface, blurred_bg, top_rect, radius=18)
 
     digit_font = mine_font
     counter_rect = pygame.Rect(
@@ -617,14 +541,25 @@ def draw_board(surface, board, font, mine_font, elapsed, face_state,
         36,
     )
 
-    draw_counter(surface, counter_rect, board.remaining_mines_estimate(), digit_font)
-    draw_counter(surface, timer_rect, int(elapsed), digit_font)
-    draw_face(surface, face_rect, face_state)
+    with PROFILER.phase("hud"):
+        draw_counter(surface, counter_rect, board.remaining_mines_estimate(), digit_font)
+        draw_counter(surface, timer_rect, int(elapsed), digit_font)
+        draw_face(surface, face_rect, face_state)
 
-    grid_w = cols * CELL_SIZE
-    grid_h = rows * CELL_SIZE
+    if camera is None:
+        grid_w = cols * CELL_SIZE
+        grid_h = rows * CELL_SIZE
+        r0, r1, c0, c1 = 0, rows, 0, cols
+    else:
+        _, _, grid_w, grid_h = camera.view_rect()
     grid_x = (width - grid_w) // 2
     grid_y = BORDER + TOP_PANEL
+    origin_x, origin_y = grid_x, grid_y
+    if camera is not None:
+        camera.origin = (grid_x, grid_y)
+        r0, r1, c0, c1 = camera.visible_range()
+        origin_x -= camera.x
+        origin_y -= camera.y
 
     board_rect = pygame.Rect(
         grid_x - 14,
@@ -632,78 +567,52 @@ def draw_board(surface, board, font, mine_font, elapsed, face_state,
         grid_w + 28,
         grid_h + 28,
     )
-    draw_glass_panel_from_bg(surface, blurred_bg, board_rect, radius=26)
-
-    for r in range(rows):
-        for c in range(cols):
-            cell = board.grid[r][c]
-            x = grid_x + c * CELL_SIZE
-            y = grid_y + r * CELL_SIZE
-
-            tile_rect = pygame.Rect(
-                x + 2,
-                y + 2,
-                CELL_SIZE - 4,
-                CELL_SIZE - 4,
-            )
-
-            draw_glass_tile_from_bg(surface, blurred_bg, tile_rect, cell)
-
-            if cell.revealed:
-                if cell.is_mine:
-                    pygame.draw.circle(
-                        surface,
-                        (0, 0, 0),
-                        tile_rect.center,
-                        CELL_SIZE // 5,
-                    )
-                elif cell.adj > 0:
-                    color = NUMBER_COLORS.get(cell.adj, (0, 0, 0))
-                    text = font.render(str(cell.adj), True, color)
-                    trect = text.get_rect(center=tile_rect.center)
-                    surface.blit(text, trect)
-            else:
-                if cell.flagged:
-                    pole_x = tile_rect.left + tile_rect.w // 3
-                    pole_y1 = tile_rect.top + tile_rect.h // 5
-                    pole_y2 = tile_rect.bottom - tile_rect.h // 6
-                    pygame.draw.line(
-                        surface,
-                        (20, 20, 20),
-                        (pole_x, pole_y1),
-                        (pole_x, pole_y2),
-                        2,
-                    )
-                    flag_points = [
-                        (pole_x, pole_y1),
-                        (pole_x + tile_rect.w // 2, pole_y1 + tile_rect.h // 5),
-                        (pole_x, pole_y1 + tile_rect.h // 2),
-                    ]
-                    pygame.draw.polygon(surface, (255, 90, 90), flag_points)
+    with PROFILER.phase("glass"):
+        draw_glass_panel_from_bg(surface, blurred_bg, board_rect, radius=26)
+
+    with PROFILER.phase("tiles"):
+        tiles = TILE_ATLAS.get(CELL_SIZE, font)
+        blit = surface.blit
+        surface.set_clip((grid_x, grid_y, grid_w, grid_h))
+        for r in range(r0, r1):
+            y = origin_y + r * CELL_SIZE + 2
+            for c, cell in enumerate(board.grid[r][c0:c1], c0):
+                if cell.revealed:
+                    key = TILE_MINE if cell.is_mine else cell.adj
+                else:
+                    key = TILE_FLAG if cell.flagged else TILE_HIDDEN
+                blit(tiles[key], (origin_x + c * CELL_SIZE + 2, y))
+        if hint is not None:
+            r, c = divmod(hint, cols)
+            hint_rect = pygame.Rect(origin_x + c * CELL_SIZE + 1, origin_y + r * CELL_SIZE + 1,
+                                    CELL_SIZE - 2, CELL_SIZE - 2)
+            pygame.draw.rect(surface, HINT_COLOR, hint_rect, 2, border_radius=4)
+        surface.set_clip(None)
 
     quit_rect = None
     if banner_text:
-        banner_font = pygame.font.SysFont("SF Pro Display", 14, bold=True)
-        text_surf = banner_font.render(banner_text, True, (0, 0, 0))
-        text_w, text_h = text_surf.get_size()
+        with PROFILER.phase("banner"):
+            banner_font = resources.get_font("SF Pro Display", 14, bold=True)
+            text_surf = banner_font.render(banner_text, True, (0, 0, 0))
+            text_w, text_h = text_surf.get_size()
 
-        max_banner_w = width - 2 * BORDER - 20
-        banner_w = min(max_banner_w, text_w + 40)
-        banner_h = text_h + 24
+            max_banner_w = width - 2 * BORDER - 20
+            banner_w = min(max_banner_w, text_w + 40)
+            banner_h = text_h + 24
 
-        banner_x = (width - banner_w) // 2
-        banner_y = (height - banner_h) // 2
+            banner_x = (width - banner_w) // 2
+            banner_y = (height - banner_h) // 2
 
-        banner_rect = pygame.Rect(banner_x, banner_y, banner_w, banner_h)
-        draw_glass_panel_from_bg(surface, blurred_bg, banner_rect, radius=14)
+            banner_rect = pygame.Rect(banner_x, banner_y, banner_w, banner_h)
+            draw_glass_panel_from_bg(surface, blurred_bg, banner_rect, radius=14)
 
-        fog = pygame.Surface((banner_w, banner_h), pygame.SRCALPHA)
-        pygame.draw.rect(fog, (255, 255, 255, 200),
-                         fog.get_rect(), border_radius=14)
-        surface.blit(fog, (banner_x, banner_y))
+            fog = pygame.Surface((banner_w, banner_h), pygame.SRCALPHA)
+            pygame.draw.rect(fog, (255, 255, 255, 200),
+                             fog.get_rect(), border_radius=14)
+            surface.blit(fog, (banner_x, banner_y))
 
-        text_rect = text_surf.get_rect(center=banner_rect.center)
-        surface.blit(text_surf, text_rect)
+            text_rect = text_surf.get_rect(center=banner_rect.center)
+            surface.blit(text_surf, text_rect)
 
     if show_quit_button:
         btn_w, btn_h = 88, 32
@@ -724,7 +633,9 @@ def draw_board(surface, board, font, mine_font, elapsed, face_state,
 
     return face_rect, (grid_x, grid_y), quit_rect
 
-def cell_from_pos(pos, board, grid_origin):
+def cell_from_pos(pos, board, grid_origin, camera=None):
+    if camera is not None:
+        return camera.cell_at(pos)
     gx, gy = grid_origin
     x, y = pos
     if x < gx or y < gy:
@@ -735,20 +646,69 @@ def cell_from_pos(pos, board, grid_origin):
         return row, col
     return None
 
-def run_game(rows, cols, mines):
+def run_game(rows, cols, mines, hint_engine=None, generator=None, pool=None, saved=None,
+             key=None):
+    """
+    Play until the window is closed; `saved` is a (board, elapsed) pair to
+    resume, `key` a board_code.BoardKey to deal (again on every restart).
+    Returns "quit", or ("load", (board, elapsed)) after F9 loaded a save.
+    """
     pygame.display.set_caption("Minesweeper")
     width, height = calc_window_size(rows, cols)
     screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
-    font = pygame.font.SysFont("consolas", 18, bold=True)
-    digit_font = pygame.font.SysFont("consolas", 22, bold=True)
+    font = resources.get_font("consolas", 18, bold=True)
+    digit_font = resources.get_font("consolas", 22, bold=True)
+
+    def new_board():
+        if key is not None:
+            return Board(rows, cols, mines, generator, key.seed)
+        if pool is not None:
+            return pool.take(rows, cols, mines)
+        return Board(rows, cols, mines, generator)
+
+    board = new_board() if saved is None else saved[0]
+    camera = Camera(rows, cols, MIN_CELL_SIZE, width, height)
+    pacer = FramePacer()
+    solver = None  # only kept up to date while hints are shown (H)
+    # A resumed save has no recorded start, so it can't be replayed.
+    recorder = replay.recorder_for(board) if saved is None else None
+    history = History(board)
+
+    def after_move(changed, action, r, c):
+        if changed and recorder is not None:
+            recorder.record(action, r, c)
+        if solver is None:
+            return
+        solver.update(changed)
+        if board.game_over:
+            hint_engine.cancel()
+        else:
+            hint_engine.request(board, solver)
+
+    def open_first_click():
+        """A board dealt from a code with a first click starts with it made."""
+        if key is not None and key.first_click is not None and not board.mines_placed:
+            r, c = divmod(key.first_click, cols)
+            after_move(history.do(board.reveal, r, c), replay.REVEAL, r, c)
+
+    def finish(result):
+        if recorder is not None:
+            recorder.close()  # flush the log's buffered tail
+        if solver is not None:
+            hint_engine.cancel()
+        return result
 
-    board = Board(rows, cols, mines)
-    clock = pygame.time.Clock()
+    if saved is None:
+        open_first_click()
+    caption_key = None
 
     running = True
     face_state = FACE_NEUTRAL
     start_time = None
     last_time = 0.0
+    if saved is not None and board.mines_placed:
+        last_time = saved[1]
+        start_time = time.time() - last_time
 
     banner_start_time = None
     banner_text = None
@@ -756,21 +716,21 @@ def run_game(rows, cols, mines):
     quit_button_visible = False
 
     while running:
-        dt = clock.tick(60) / 1000.0
         if start_time is not None and not board.game_over:
             last_time = time.time() - start_time
 
         width, height = screen.get_size()
         rows, cols = board.rows, board.cols
-
-        available_w = width - 2 * BORDER
-        available_h = height - TOP_PANEL - BOTTOM_PANEL - 2 * BORDER
-
-        new_cell_size = min(available_w // cols, available_h // rows)
-
-        new_cell_size = max(16, new_cell_size)
-        global CELL_SIZE
-        CELL_SIZE = new_cell_size
+        # Only a new board or its first click changes the key; encode just then.
+        key = board_code.key_of(board)
+        if key != caption_key:
+            # Complete (with the first click) once the mines are down.
+            pygame.display.set_caption(f"Minesweeper - {board_code.encode(key)}")
+            caption_key = key
+        fit_board(width, height, camera)
+        keys = pygame.key.get_pressed()
+        panning = camera.pan((keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * PAN_STEP,
+                             (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * PAN_STEP)
         if board.game_over and not board.victory:
             if banner_start_time is None:
                 banner_start_time = time.time()
@@ -784,6 +744,7 @@ def run_game(rows, cols, mines):
                 banner_text = None
                 banner_done = True
                 reveal_all_cells(board)
+                history.clear()  # the reveal above isn't a recorded step
                 quit_button_visible = True
         elif banner_done:
             banner_text = None
@@ -798,41 +759,99 @@ def run_game(rows, cols, mines):
             else:
                 face_state = FACE_NEUTRAL
 
-        face_rect, grid_origin, quit_rect = draw_board(
-            screen, board, font, digit_font, last_time, face_state,
-            banner_text=banner_text,
-            show_quit_button=quit_button_visible,
-        )
-        pygame.display.flip()
+        with PROFILER.phase("frame"):
+            face_rect, grid_origin, quit_rect = draw_board(
+                screen, board, font, digit_font, last_time, face_state,
+                banner_text=banner_text,
+                show_quit_button=quit_button_visible,
+                camera=camera,
+                t=pacer.clock,
+                hint=hint_engine.result.cell if solver and hint_engine.result else None,
+            )
+            if PROFILER.visible:
+                PROFILER.draw_overlay(screen, resources.get_font("consolas", 13))
+            with PROFILER.phase("flip"):
+                pygame.display.flip()
+        PROFILER.end_frame()
+
+        # Besides the waves, only the timer digit, the banner expiry and a
+        # held pan key need a redraw without new input.
+        deadlines = []
+        if start_time is not None and not board.game_over:
+            deadlines.append(start_time + int(last_time) + 1)
+        if banner_start_time is not None and not banner_done:
+            deadlines.append(banner_start_time + 5.0)
+        if panning:
+            deadlines.append(time.time())
+        events = pacer.next_events(animating=pacer.animating,
+                                   deadline=min(deadlines) if deadlines else None)
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
-                return "quit"
+                return finish("quit")
             
             if event.type == pygame.VIDEORESIZE:
                 screen = pygame.display.set_mode(event.size, pygame.RESIZABLE)
+                SEASIDE.invalidate()
+                continue
+
+            if event.type == pygame.MOUSEMOTION and event.buttons[1]:
+                # Middle-button drag pans boards bigger than the window.
+                camera.pan(-event.rel[0], -event.rel[1])
                 continue
             
+            # Undo also works during the loss banner, to take back the fatal click.
+            if (event.type == pygame.KEYDOWN and event.key in (pygame.K_z, pygame.K_y)
+                    and event.mod & pygame.KMOD_CTRL):
+                changed = history.undo() if event.key == pygame.K_z else history.redo()
+                if changed:
+                    if recorder is not None:
+                        recorder.close()  # a replay log can't express undo; it ends here
+                        recorder = None
+                    if not board.game_over:
+                        banner_start_time = None
+                        banner_text = None
+                    # The timer runs from the first click, so undoing it resets the timer.
+                    if not board.mines_placed:
+                        start_time, last_time = None, 0.0
+                    elif start_time is None:
+                        start_time = time.time()
+                    if solver is not None:
+                        solver.rebuild()
+                        if board.game_over:
+                            hint_engine.cancel()
+                        else:
+                            hint_engine.request(board, solver)
+                continue
+
             if banner_start_time is not None and not banner_done:
                 continue
 
             if event.type == pygame.MOUSEBUTTONDOWN and not board.game_over:
                 buttons = pygame.mouse.get_pressed(3)
                 pos = event.pos
-                cell_pos = cell_from_pos(pos, board, grid_origin)
+                cell_pos = cell_from_pos(pos, board, grid_origin, camera)
                 if cell_pos and buttons[0] and buttons[2]:
                     r, c = cell_pos
                     if start_time is None:
                         start_time = time.time()
-                    board.chord(r, c)
+                    after_move(history.do(board.chord, r, c), replay.CHORD, r, c)
 
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     if quit_rect and quit_button_visible and quit_rect.collidepoint(event.pos):
-                        return "quit"
+                        return finish("quit")
 
                     if face_rect.collidepoint(event.pos) and not (banner_start_time and not banner_done):
-                        board = Board(rows, cols, mines)
+                        board = new_board()
+                        if recorder is not None:
+                            recorder.close()
+                        recorder = replay.recorder_for(board)
+                        history = History(board)
+                        if solver is not None:
+                            solver = Solver(board)
+                            hint_engine.cancel()
+                        open_first_click()
                         start_time = None
                         last_time = 0.0
                         banner_start_time = None
@@ -841,24 +860,58 @@ def run_game(rows, cols, mines):
                         quit_button_visible = False
                         continue
 
-                    cell_pos = cell_from_pos(event.pos, board, grid_origin)
+                    cell_pos = cell_from_pos(event.pos, board, grid_origin, camera)
                     if cell_pos and not board.game_over:
                         r, c = cell_pos
+                        first_click = not board.mines_placed
+                        changed = history.do(board.reveal, r, c)
+                        if first_click and generator is not None and DEBUG:
+                            print(generator.report())
+                        # Started after the reveal so layout generation isn't timed.
                         if start_time is None:
                             start_time = time.time()
-                        board.reveal(r, c)
+                        after_move(changed, replay.REVEAL, r, c)
 
                 elif event.button == 3 and not board.game_over:
-                    cell_pos = cell_from_pos(event.pos, board, grid_origin)
+                    cell_pos = cell_from_pos(event.pos, board, grid_origin, camera)
                     if cell_pos:
                         r, c = cell_pos
-                        board.toggle_flag(r, c)
+                        after_move(history.do(board.toggle_flag, r, c), replay.FLAG, r, c)
 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    return "quit"
+                    return finish("quit")
+                if event.key == pygame.K_F3:
+                    PROFILER.toggle_overlay()
+                if event.key == pygame.K_h and hint_engine is not None:
+                    if solver is None:
+                        solver = Solver(board)
+                        if board.mines_placed and not board.game_over:
+                            hint_engine.request(board, solver)
+                    else:
+                        solver = None
+                        hint_engine.cancel()
+                if event.key == pygame.K_F5:
+                    savefile.save(savefile.SAVE_PATH, board, last_time)
+                    print(f"Saved to {savefile.SAVE_PATH}")
+                if event.key == pygame.K_F9:
+                    try:
+                        loaded, header = savefile.load(savefile.SAVE_PATH, Board)
+                    except (OSError, ValueError) as exc:
+                        print(f"Could not load {savefile.SAVE_PATH}: {exc}")
+                        continue
+                    loaded.generator = generator
+                    return finish(("load", (loaded, header.elapsed)))
                 if event.key == pygame.K_F2 and not (banner_start_time and not banner_done):
-                    board = Board(rows, cols, mines)
+                    board = new_board()
+                    if recorder is not None:
+                        recorder.close()
+                    recorder = replay.recorder_for(board)
+                    history = History(board)
+                    if solver is not None:
+                        solver = Solver(board)
+                        hint_engine.cancel()
+                    open_first_click()
                     start_time = None
                     last_time = 0.0
                     banner_start_time = None
@@ -866,46 +919,83 @@ def run_game(rows, cols, mines):
                     banner_done = False
                     quit_button_visible = False
 
-    return "quit"
+    return finish("quit")
 
 
 def difficulty_menu():
-    """Very simple text-based difficulty menu in terminal."""
+    """
+    Very simple text-based difficulty menu in terminal.
+    Returns (rows, cols, mines, key): key is a board_code.BoardKey for a
+    specific board, None for random ones.
+    """
     print("Minesweeper difficulty:")
     print("1) Beginner   (9x9, 10 mines)")
     print("2) Intermediate (16x16, 40 mines)")
     print("3) Expert     (16x30, 99 mines)")
     print("4) Custom")
+    print("5) Daily challenge (Expert)")
+    print("6) Board code")
 
-    choice = input("Choose 1-4 (Enter for Beginner): ").strip()
+    choice = input("Choose 1-6 (Enter for Beginner): ").strip()
     if choice == "2":
-        return INTERMEDIATE
+        return (*INTERMEDIATE, None)
     if choice == "3":
-        return EXPERT
+        return (*EXPERT, None)
+    if choice == "5":
+        rows, cols, mines = EXPERT
+        key = board_code.BoardKey(rows, cols, mines, (rows // 2) * cols + cols // 2,
+                                  board_code.daily_seed())
+        print(f"Daily challenge {board_code.encode(key)}")
+        return rows, cols, mines, key
+    if choice == "6":
+        try:
+            key = board_code.decode(input("Board code: "), MAX_ROWS, MAX_COLS)
+        except ValueError as exc:
+            print(f"{exc}, using Beginner.")
+            return (*BEGINNER, None)
+        if key.first_click is None:
+            print("That code is for game.py, using Beginner.")
+            return (*BEGINNER, None)
+        return key.rows, key.cols, key.mines, key
     if choice == "4":
         try:
-            rows = int(input("Rows (max 24): "))
-            cols = int(input("Cols (max 30): "))
+            rows = int(input(f"Rows (max {MAX_ROWS}): "))
+            cols = int(input(f"Cols (max {MAX_COLS}): "))
             mines = int(input("Mines: "))
         except ValueError:
             print("Invalid input, using Beginner.")
-            return BEGINNER
-        rows = max(1, min(24, rows))
-        cols = max(1, min(30, cols))
+            return (*BEGINNER, None)
+        rows = max(1, min(MAX_ROWS, rows))
+        cols = max(1, min(MAX_COLS, cols))
         mines = max(1, min(rows * cols - 1, mines))
-        return rows, cols, mines
-    return BEGINNER
+        return rows, cols, mines, None
+    return (*BEGINNER, None)
 
 
 def main():
     pygame.init()
-    rows, cols, mines = difficulty_menu()
+    rows, cols, mines, key = difficulty_menu()
+    hint_engine = HintEngine(
+        on_ready=lambda: pygame.event.post(pygame.event.Event(HINT_READY)))
+    generator = no_guess.NoGuessGenerator() if no_guess.ENABLED else None
+    pool = BoardPool(lambda r, c, m: Board(r, c, m, generator))
 
+    saved = None
     while True:
-        result = run_game(rows, cols, mines)
+        result = run_game(rows, cols, mines, hint_engine, generator, pool, saved, key)
         if result == "quit":
             break
-
+        _, saved = result  # F9: carry on with the loaded game
+        board = saved[0]
+        rows, cols, mines, key = board.rows, board.cols, board.mines_count, None
+
+    pool.close()
+    hint_engine.close()
+    if generator is not None:
+        print(generator.report())
+        generator.close()
+    PROFILER.dump()
+    resources.clear()
     pygame.quit()
 
 
@@ -1,49 +1,53 @@
-import random
 from cell import Cell
+from board_code import key_of, layout_rng, new_seed
+from grid_utils import DEBUG, adjacency_counts, neighbor_table, sample_mines
 
 
 class Board:
-    def __init__(self, rows: int, cols: int, mines: int):
+    debug = DEBUG
+
+    def __init__(self, rows: int, cols: int, mines: int, seed: int = None):
         self.rows = rows
         self.cols = cols
         self.mines_count = mines
+        # The seed fixes the layout (see board_code).
+        self.seed = new_seed() if seed is None else seed
 
         self.grid = [[Cell(r, c) for c in range(cols)] for r in range(rows)]
+        self._cells = [cell for row in self.grid for cell in row]
+        self._nbr_offsets, self._nbr_indices = neighbor_table(rows, cols)
         self.game_over = False
         self.victory = False
 
+        # Running counters so win checks never rescan the grid.
+        self._hidden_safe = rows * cols
+        self._flag_count = 0
+
         self._place_mines()
         self._compute_adjacencies()
 
     def _cells_iter(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                yield self.grid[r][c]
+        return iter(self._cells)
 
     def _place_mines(self):
-        all_positions = [(r, c) for r in range(self.rows) for c in range(self.cols)]
-        random.shuffle(all_positions)
-        for r, c in all_positions[: self.mines_count]:
-            self.grid[r][c].is_mine = True
+        total = self.rows * self.cols
+        placed = sample_mines(total, self.mines_count, rng=layout_rng(key_of(self)))
+        cells = self._cells
+        for i in placed:
+            cells[i].is_mine = True
+        self._hidden_safe = total - len(placed)
+
+    def _neighbor_ids(self, i: int):
+        return self._nbr_indices[self._nbr_offsets[i]:self._nbr_offsets[i + 1]]
 
     def _neighbors(self, row: int, col: int):
-        for dr in (-1, 0, 1):
-            for dc in (-1, 0, 1):
-                if dr == 0 and dc == 0:
-                    continue
-                nr, nc = row + dr, col + dc
-                if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                    yield self.grid[nr][nc]
+        cells = self._cells
+        return [cells[j] for j in self._neighbor_ids(row * self.cols + col)]
 
     def _compute_adjacencies(self):
-        for cell in self._cells_iter():
-            if cell.is_mine:
-                cell.adjacent_mines = -1
-                continue
-            count = 0
-            for n in self._neighbors(cell.row, cell.col):
-                if n.is_mine:
-                    count += 1
+        cells = self._cells
+        counts = adjacency_counts([cell.is_mine for cell in cells], self.rows, self.cols)
+        for cell, count in zip(cells, counts):
             cell.adjacent_mines = count
 
 
@@ -51,47 +55,100 @@ class Board:
         return 0 <= row < self.rows and 0 <= col < self.cols
 
     def reveal_cell(self, row: int, col: int):
-        """Reveal a cell and flood-fill if it's a zero. Handle game over/win."""
+        """
+        Reveal a cell and flood-fill if it's a zero. Handle game over/win.
+        Returns the flat indices (row * cols + col) of the cells that changed.
+        """
         if not self.in_bounds(row, col):
-            return
+            return []
 
         cell = self.grid[row][col]
         if cell.revealed or cell.flagged or self.game_over:
-            return
+            return []
 
         cell.reveal()
+        changed = [row * self.cols + col]
 
         if cell.is_mine:
             self.game_over = True
             self.victory = False
-            return
+            return changed
 
+        self._hidden_safe -= 1
         if cell.adjacent_mines == 0:
-            self._flood_fill(row, col)
+            changed.extend(self._flood_fill(row, col))
 
         if self._check_victory():
             self.game_over = True
             self.victory = True
 
+        if self.debug:
+            self._verify_counters()
+        return changed
+
     def _flood_fill(self, row: int, col: int):
-        stack = [(row, col)]
-        while stack:
-            r, c = stack.pop()
-            cell = self.grid[r][c]
-
-            for neighbor in self._neighbors(r, c):
-                if neighbor.revealed or neighbor.flagged:
-                    continue
-                if neighbor.is_mine:
-                    continue
-                neighbor.reveal()
-                if neighbor.adjacent_mines == 0:
-                    stack.append((neighbor.row, neighbor.col))
+        """
+        Reveal the region around a zero; returns the newly revealed indices.
+        A scanline fill, see np_board.ArrayBoard._flood_fill.
+        """
+        cells = self._cells
+        rows, cols = self.rows, self.cols
+        revealed = []
+        hidden_safe = self._hidden_safe
+
+        spans = [(row, col, col)]
+        while spans:
+            r, lo, hi = spans.pop()
+            c0 = lo - 1 if lo else 0
+            c1 = hi + 1 if hi + 1 < cols else hi
+            for rr in range(r - 1 if r else 0, r + 2 if r + 1 < rows else r + 1):
+                base = rr * cols
+                i, end = base + c0, base + c1
+                while i <= end:
+                    cell = cells[i]
+                    if cell.revealed or cell.flagged or cell.is_mine:
+                        i += 1
+                        continue
+                    cell.revealed = True
+                    revealed.append(i)
+                    hidden_safe -= 1
+                    if cell.adjacent_mines:
+                        i += 1
+                        continue
+                    left = i - 1
+                    while left >= base:
+                        cell = cells[left]
+                        if cell.revealed or cell.flagged or cell.adjacent_mines:
+                            break
+                        cell.revealed = True
+                        revealed.append(left)
+                        left -= 1
+                    right, last = i + 1, base + cols
+                    while right < last:
+                        cell = cells[right]
+                        if cell.revealed or cell.flagged or cell.adjacent_mines:
+                            break
+                        cell.revealed = True
+                        revealed.append(right)
+                        right += 1
+                    hidden_safe -= right - left - 2
+                    spans.append((rr, left + 1 - base, right - 1 - base))
+                    i = right
+        self._hidden_safe = hidden_safe
+        return revealed
 
     def toggle_flag(self, row: int, col: int):
         if not self.in_bounds(row, col) or self.game_over:
-            return
-        self.grid[row][col].toggle_flag()
+            return []
+        cell = self.grid[row][col]
+        if cell.revealed:
+            return []
+        cell.toggle_flag()
+        self._flag_count += 1 if cell.flagged else -1
+
+        if self.debug:
+            self._verify_counters()
+        return [row * self.cols + col]
 
     def chord(self, row: int, col: int):
         """
@@ -101,29 +158,41 @@ class Board:
         neighbors. If any of those are mines -> you die.
         """
         if not self.in_bounds(row, col) or self.game_over:
-            return
+            return []
 
         cell = self.grid[row][col]
         if not cell.revealed or cell.adjacent_mines <= 0:
-            return
+            return []
 
-        flagged_count = sum(1 for n in self._neighbors(row, col) if n.flagged)
+        neighbors = self._neighbors(row, col)
+        flagged_count = sum(1 for n in neighbors if n.flagged)
 
         if flagged_count != cell.adjacent_mines:
-            return
+            return []
 
-        for n in self._neighbors(row, col):
+        changed = []
+        for n in neighbors:
             if n.flagged or n.revealed:
                 continue
             if n.is_mine:
                 n.revealed = True
+                changed.append(n.row * self.cols + n.col)
                 self.game_over = True
                 self.victory = False
             else:
-                self.reveal_cell(n.row, n.col)
+                changed.extend(self.reveal_cell(n.row, n.col))
+
+        if self.debug:
+            self._verify_counters()
+        return changed
 
     def _check_victory(self) -> bool:
-        for cell in self._cells_iter():
-            if not cell.is_mine and not cell.revealed:
-                return False
-        return True
+        return self._hidden_safe == 0
+
+    def _verify_counters(self):
+        """Debug aid: compare the running counters with a full-board scan."""
+        hidden_safe = sum(1 for c in self._cells_iter() if not c.is_mine and not c.revealed)
+        flags = sum(1 for c in self._cells_iter() if c.flagged)
+        assert hidden_safe == self._hidden_safe, (hidden_safe, self._hidden_safe)
+        assert flags == self._flag_count, (flags, self._flag_count)
+
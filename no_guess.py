@@ -0,0 +1,207 @@
+"""
+No-guess mine layouts: boards the deduction solver clears from the first
+click without ever having to guess.
+
+Candidates are ordinary first-click-safe layouts (grid_utils.sample_mines)
+checked by playing them out with solver.Solver; most are rejected, so the
+search runs in batches across a ProcessPoolExecutor. Batch k draws its
+candidates from "<seed>:<k>", and the first accepted candidate of the
+lowest accepted batch wins, so a given seed always yields the same layout
+however many workers search and whichever finishes first. Once no lower
+batch can beat it, the other workers drop their batch at the next
+candidate. If nothing is found within the timeout, an ordinary layout
+drawn from the seed is returned instead and counted as a fallback.
+"""
+import multiprocessing
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import count
+
+from classic_board import Board, first_click_zone
+from grid_utils import sample_mines
+from solver import Solver
+
+# Set MINESWEEPER_NO_GUESS=1 to have minesweeper.py deal no-guess boards.
+ENABLED = os.environ.get("MINESWEEPER_NO_GUESS", "") not in ("", "0")
+GENERATION_TIMEOUT = 3.0
+# Candidates per pool task: small enough that results stream back quickly.
+BATCH = 8
+
+# mines: flat mine indices, no_guess: False for a timeout fallback,
+# candidates: layouts checked, seconds: wall time of the whole search.
+Generation = namedtuple("Generation", "mines no_guess candidates seconds")
+
+# Set in the worker processes by _init_worker: a shared counter bumped by
+# the parent whenever the current search is over.
+_search_id = None
+
+
+def solvable(rows: int, cols: int, mines, r: int, c: int) -> bool:
+    """True if deduction alone wins the layout after a first click on (r, c)."""
+    board = Board(rows, cols, len(mines))
+    board.set_mines(mines)
+    solver = Solver(board)
+    solver.update(board.reveal(r, c))
+    while not board.game_over:
+        if not solver.safe:
+            return False
+        solver.update(board.reveal(*divmod(solver.safe.pop(), cols)))
+    return board.victory
+
+
+def _init_worker(search_id):
+    global _search_id
+    _search_id = search_id
+
+
+def search(rows: int, cols: int, mines: int, r: int, c: int, seed,
+           batch: int = BATCH, search_id: int = None):
+    """
+    Check up to `batch` candidates; returns (layout or None, candidates checked).
+    In a worker, stops early once the parent has moved past `search_id`.
+    """
+    rng = random.Random(seed)
+    zone = first_click_zone(rows, cols, r, c)
+    checked = 0
+    while checked < batch:
+        if _search_id is not None and _search_id.value != search_id:
+            break
+        layout = sample_mines(rows * cols, mines, zone, rng)
+        checked += 1
+        if solvable(rows, cols, layout, r, c):
+            return layout, checked
+    return None, checked
+
+
+class NoGuessGenerator:
+    """
+    Layout source for classic_board.Board(generator=...).
+
+    The process pool is started on first use and reused for every board;
+    call close() when done. workers=0 searches in the calling process.
+    Running totals for report() are kept across boards.
+    """
+
+    def __init__(self, workers=None, timeout: float = GENERATION_TIMEOUT):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.workers = workers
+        self.timeout = timeout
+        self._pool = None
+        self._search_id = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.last = None
+        self.boards = 0
+        self.candidates = 0
+        self.accepted = 0
+        self.fallbacks = 0
+        self.latencies = []
+
+    def layout(self, rows, cols, mines, r, c, seed=None) -> list:
+        return self.generate(rows, cols, mines, r, c, seed).mines
+
+    def generate(self, rows, cols, mines, r, c, seed=None) -> Generation:
+        """The layout for `seed` (an int or string, random if None)."""
+        start = time.perf_counter()
+        if seed is None:
+            seed = random.getrandbits(64)
+        if self.workers > 0:
+            found, checked, accepted = self._search_pool(rows, cols, mines, r, c, seed, start)
+        else:
+            found, checked, accepted = self._search_here(rows, cols, mines, r, c, seed, start)
+
+        no_guess = found is not None
+        if not no_guess:
+            found = sample_mines(rows * cols, mines, first_click_zone(rows, cols, r, c),
+                                 random.Random(seed))
+            self.fallbacks += 1
+        result = Generation(found, no_guess, checked, time.perf_counter() - start)
+
+        self.last = result
+        self.boards += 1
+        self.candidates += checked
+        self.accepted += accepted
+        self.latencies.append(result.seconds)
+        return result
+
+    def _search_here(self, rows, cols, mines, r, c, seed, start):
+        checked = 0
+        batches = count()
+        while time.perf_counter() - start < self.timeout:
+            found, n = search(rows, cols, mines, r, c, f"{seed}:{next(batches)}")
+            checked += n
+            if found is not None:
+                return found, checked, 1
+        return None, checked, 0
+
+    def _search_pool(self, rows, cols, mines, r, c, seed, start):
+        if self._pool is None:
+            # Spawned workers start from a clean interpreter instead of a fork
+            # of the game, with its pygame display and hint threads.
+            context = multiprocessing.get_context("spawn")
+            self._search_id = context.Value("q", 0)
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=context,
+                                             initializer=_init_worker,
+                                             initargs=(self._search_id,))
+        search_id = self._search_id.value
+        batches = count()
+        pending = {}  # future -> batch number
+
+        def submit():
+            k = next(batches)
+            future = self._pool.submit(search, rows, cols, mines, r, c, f"{seed}:{k}",
+                                       BATCH, search_id)
+            pending[future] = k
+
+        # Two tasks per worker so nobody idles while a result travels back.
+        for _ in range(2 * self.workers):
+            submit()
+        found, best, checked, accepted = None, None, 0, 0
+        # Done once a batch accepted a layout and every lower batch has reported.
+        while pending and (best is None or min(pending.values()) < best):
+            left = self.timeout - (time.perf_counter() - start)
+            if left <= 0:
+                break
+            done, _ = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+            for future in done:
+                k = pending.pop(future)
+                layout, n = future.result()
+                checked += n
+                if layout is not None:
+                    accepted += 1
+                    if best is None or k < best:
+                        found, best = layout, k
+                if best is None:
+                    submit()
+
+        # Stop the rest; running batches return after their current
+        # candidate, and their counts still go into the acceptance rate.
+        with self._search_id.get_lock():
+            self._search_id.value += 1
+        running = [future for future in pending if not future.cancel()]
+        for future in wait(running).done:
+            layout, n = future.result()
+            checked += n
+            accepted += layout is not None
+        return found, checked, accepted
+
+    def report(self) -> str:
+        if not self.boards:
+            return "no-guess: no boards generated"
+        ordered = sorted(self.latencies)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        rate = self.accepted / self.candidates if self.candidates else 0.0
+        return (f"no-guess: {self.boards} boards, {rate:.1%} of {self.candidates} "
+                f"candidates accepted, latency mean {sum(ordered) / len(ordered):.2f} s, "
+                f"p95 {p95:.2f} s, {self.fallbacks} fallbacks")
+
+    def close(self):
+        if self._pool is not None:
+            self._search_id.value += 1
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,310 @@
+from array import array
+
+import numpy as np
+
+from board_code import key_of, layout_rng, new_seed
+from grid_utils import DEBUG, neighbor_table, sample_mines
+
+
+class CellView:
+    """Lightweight stand-in for cell.Cell that reads/writes the board arrays."""
+
+    __slots__ = ("_board", "row", "col", "_i")
+
+    def __init__(self, board, row: int, col: int):
+        self._board = board
+        self.row = row
+        self.col = col
+        self._i = row * board.cols + col
+
+    @property
+    def is_mine(self) -> bool:
+        return bool(self._board._mine_buf[self._i])
+
+    @property
+    def adjacent_mines(self) -> int:
+        return self._board._adj_buf[self._i]
+
+    @property
+    def revealed(self) -> bool:
+        return bool(self._board._revealed_buf[self._i])
+
+    @revealed.setter
+    def revealed(self, value: bool):
+        self._board._revealed_buf[self._i] = 1 if value else 0
+
+    @property
+    def flagged(self) -> bool:
+        return bool(self._board._flagged_buf[self._i])
+
+    @flagged.setter
+    def flagged(self, value: bool):
+        self._board._flagged_buf[self._i] = 1 if value else 0
+
+    def reveal(self):
+        if not self.flagged:
+            self.revealed = True
+
+    def toggle_flag(self):
+        if not self.revealed:
+            self.flagged = not self.flagged
+
+
+class _RowView:
+    __slots__ = ("_board", "_row")
+
+    def __init__(self, board, row: int):
+        self._board = board
+        self._row = row
+
+    def __len__(self):
+        return self._board.cols
+
+    def __getitem__(self, col: int) -> CellView:
+        if col < 0:
+            col += self._board.cols
+        if not 0 <= col < self._board.cols:
+            raise IndexError("column index out of range")
+        return CellView(self._board, self._row, col)
+
+    def __iter__(self):
+        for c in range(self._board.cols):
+            yield CellView(self._board, self._row, c)
+
+
+class _GridView:
+    __slots__ = ("_board",)
+
+    def __init__(self, board):
+        self._board = board
+
+    def __len__(self):
+        return self._board.rows
+
+    def __getitem__(self, row: int) -> _RowView:
+        if row < 0:
+            row += self._board.rows
+        if not 0 <= row < self._board.rows:
+            raise IndexError("row index out of range")
+        return _RowView(self._board, row)
+
+    def __iter__(self):
+        for r in range(self._board.rows):
+            yield _RowView(self._board, r)
+
+
+class ArrayBoard:
+    """
+    Drop-in replacement for ms_board.Board that keeps the cell state in
+    flat struct-of-arrays storage instead of one Cell object per square.
+
+    Every field lives in a bytearray/array('b') buffer (cheap scalar access
+    from Python loops) with a 2D NumPy view on top of the same memory
+    (is_mine, adjacent_mines, revealed, flagged) for bulk operations.
+    board.grid[r][c] hands out CellView objects on demand.
+    """
+
+    debug = DEBUG
+
+    def __init__(self, rows: int, cols: int, mines: int, seed: int = None):
+        self.rows = rows
+        self.cols = cols
+        self.mines_count = mines
+        # The seed fixes the layout (see board_code).
+        self.seed = new_seed() if seed is None else seed
+
+        n = rows * cols
+        self._mine_buf = bytearray(n)
+        self._adj_buf = array("b", bytes(n))
+        self._revealed_buf = bytearray(n)
+        self._flagged_buf = bytearray(n)
+
+        shape = (rows, cols)
+        self.is_mine = np.frombuffer(self._mine_buf, dtype=np.bool_).reshape(shape)
+        self.adjacent_mines = np.frombuffer(self._adj_buf, dtype=np.int8).reshape(shape)
+        self.revealed = np.frombuffer(self._revealed_buf, dtype=np.bool_).reshape(shape)
+        self.flagged = np.frombuffer(self._flagged_buf, dtype=np.bool_).reshape(shape)
+
+        self._nbr_offsets, self._nbr_indices = neighbor_table(rows, cols)
+
+        self.grid = _GridView(self)
+        self.game_over = False
+        self.victory = False
+
+        # Running counters so win checks never rescan the arrays.
+        self._hidden_safe = n
+        self._flag_count = 0
+
+        self._place_mines()
+        self._compute_adjacencies()
+
+    def _place_mines(self):
+        n = self.rows * self.cols
+        placed = sample_mines(n, self.mines_count, rng=layout_rng(key_of(self)))
+        for i in placed:
+            self._mine_buf[i] = 1
+        self._hidden_safe = n - len(placed)
+
+    def _neighbors(self, row: int, col: int):
+        """Flat indices of the in-bounds neighbors of (row, col)."""
+        i = row * self.cols + col
+        return self._nbr_indices[self._nbr_offsets[i]:self._nbr_offsets[i + 1]]
+
+    def _compute_adjacencies(self):
+        mines = self.is_mine.astype(np.int8)
+        padded = np.pad(mines, 1)
+        counts = np.zeros_like(mines)
+        for dr in range(3):
+            for dc in range(3):
+                if dr == 1 and dc == 1:
+                    continue
+                counts += padded[dr:dr + self.rows, dc:dc + self.cols]
+        counts[self.is_mine] = -1
+        self.adjacent_mines[...] = counts
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def reveal_cell(self, row: int, col: int):
+        """
+        Reveal a cell and flood-fill if it's a zero. Handle game over/win.
+        Returns the flat indices (row * cols + col) of the cells that changed.
+        """
+        if not self.in_bounds(row, col):
+            return []
+
+        i = row * self.cols + col
+        if self._revealed_buf[i] or self._flagged_buf[i] or self.game_over:
+            return []
+
+        self._revealed_buf[i] = 1
+        changed = [i]
+
+        if self._mine_buf[i]:
+            self.game_over = True
+            self.victory = False
+            return changed
+
+        self._hidden_safe -= 1
+        if self._adj_buf[i] == 0:
+            changed.extend(self._flood_fill(row, col))
+
+        if self._check_victory():
+            self.game_over = True
+            self.victory = True
+
+        if self.debug:
+            self._verify_counters()
+        return changed
+
+    def _flood_fill(self, row: int, col: int):
+        """
+        Reveal the region around a zero; returns the newly revealed indices.
+
+        Scanline fill: zeros are revealed a whole run along the row at a
+        time, and each run then reveals the three rows of cells around it
+        in one left-to-right pass, seeding new runs from the zeros it finds.
+        """
+        changed = []
+        revealed = self._revealed_buf
+        flagged = self._flagged_buf
+        mine = self._mine_buf
+        adj = self._adj_buf
+        rows, cols = self.rows, self.cols
+        hidden_safe = self._hidden_safe
+
+        spans = [(row, col, col)]  # runs of zeros whose neighbours are still to reveal
+        while spans:
+            r, lo, hi = spans.pop()
+            c0 = lo - 1 if lo else 0
+            c1 = hi + 1 if hi + 1 < cols else hi
+            for rr in range(r - 1 if r else 0, r + 2 if r + 1 < rows else r + 1):
+                base = rr * cols
+                i, end = base + c0, base + c1
+                while i <= end:
+                    if revealed[i] or flagged[i] or mine[i]:
+                        i += 1
+                        continue
+                    revealed[i] = 1
+                    changed.append(i)
+                    hidden_safe -= 1
+                    if adj[i]:
+                        i += 1
+                        continue
+                    # A new zero: grow it into a run in both directions.
+                    left = i - 1
+                    while left >= base and not (revealed[left] or flagged[left]) and adj[left] == 0:
+                        revealed[left] = 1
+                        changed.append(left)
+                        left -= 1
+                    right = i + 1
+                    last = base + cols
+                    while right < last and not (revealed[right] or flagged[right]) and adj[right] == 0:
+                        revealed[right] = 1
+                        changed.append(right)
+                        right += 1
+                    hidden_safe -= right - left - 2
+                    spans.append((rr, left + 1 - base, right - 1 - base))
+                    i = right
+        self._hidden_safe = hidden_safe
+        return changed
+
+    def toggle_flag(self, row: int, col: int):
+        if not self.in_bounds(row, col) or self.game_over:
+            return []
+        i = row * self.cols + col
+        if self._revealed_buf[i]:
+            return []
+        self._flagged_buf[i] ^= 1
+        self._flag_count += 1 if self._flagged_buf[i] else -1
+
+        if self.debug:
+            self._verify_counters()
+        return [i]
+
+    def chord(self, row: int, col: int):
+        """
+        Windows-style 'chord':
+        If you're on a revealed number cell and the number of
+        flagged neighbors equals that number, reveal all other
+        neighbors. If any of those are mines -> you die.
+        """
+        if not self.in_bounds(row, col) or self.game_over:
+            return []
+
+        i = row * self.cols + col
+        number = self._adj_buf[i]
+        if not self._revealed_buf[i] or number <= 0:
+            return []
+
+        neighbors = self._neighbors(row, col)
+        flagged_count = sum(self._flagged_buf[ni] for ni in neighbors)
+
+        if flagged_count != number:
+            return []
+
+        changed = []
+        for ni in neighbors:
+            if self._flagged_buf[ni] or self._revealed_buf[ni]:
+                continue
+            if self._mine_buf[ni]:
+                self._revealed_buf[ni] = 1
+                changed.append(ni)
+                self.game_over = True
+                self.victory = False
+            else:
+                changed.extend(self.reveal_cell(*divmod(ni, self.cols)))
+
+        if self.debug:
+            self._verify_counters()
+        return changed
+
+    def _check_victory(self) -> bool:
+        return self._hidden_safe == 0
+
+    def _verify_counters(self):
+        """Debug aid: compare the running counters with a full-array scan."""
+        hidden_safe = int(np.count_nonzero(~self.is_mine & ~self.revealed))
+        flags = int(np.count_nonzero(self.flagged))
+        assert hidden_safe == self._hidden_safe, (hidden_safe, self._hidden_safe)
+        assert flags == self._flag_count, (flags, self._flag_count)
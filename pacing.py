@@ -0,0 +1,79 @@
+"""
+Event-driven frame pacing shared by both front-ends.
+
+Instead of redrawing at a fixed 60 FPS, a loop asks FramePacer for its
+next batch of events. The pacer blocks in pygame.event.wait while the
+board is static and only wakes up early for time-based work: an
+animation frame, or a deadline such as the next timer second.
+
+Animations pause after ANIMATION_IDLE seconds without input, so an
+untouched window blocks until the next event. They run on the pacer's
+own clock, which stands still while paused, so they resume where they
+stopped.
+"""
+import os
+import time
+
+import pygame
+
+# Input (clicks, hover, key presses) is never handled faster than this.
+INPUT_FPS = 60
+# Cap for animation-driven redraws (seaside waves). 0 freezes animations,
+# so a static board costs nothing until the next input or deadline.
+ANIMATION_FPS = int(os.environ.get("MINESWEEPER_ANIMATION_FPS", "30"))
+# Seconds without input after which animations pause.
+ANIMATION_IDLE = float(os.environ.get("MINESWEEPER_ANIMATION_IDLE", "30"))
+
+
+class FramePacer:
+    def __init__(self, input_fps: int = INPUT_FPS, animation_fps: int = ANIMATION_FPS):
+        self.input_fps = input_fps
+        self.animation_fps = animation_fps
+        self._last_frame = self._last_input = time.time()
+        # Seconds of animation so far; only advances while animating.
+        self.clock = 0.0
+
+    @property
+    def animating(self) -> bool:
+        """Animations are on and there was input within ANIMATION_IDLE seconds."""
+        return self.animation_fps > 0 and time.time() - self._last_input < ANIMATION_IDLE
+
+    def next_events(self, animating: bool = False, deadline: float | None = None) -> list:
+        """
+        Wait until there is something to draw and return the pending events.
+
+        animating: something moves continuously; wake at animation_fps.
+        deadline:  time.time() value at which the frame must be redrawn
+                   anyway (timer digit, banner expiry, held pan key).
+        """
+        animating = animating and self.animating
+        wake = deadline
+        if animating:
+            frame = self._last_frame + 1.0 / self.animation_fps
+            # Stop at the idle limit so the last frame shows where the animation paused.
+            frame = min(frame, self._last_input + ANIMATION_IDLE)
+            wake = frame if wake is None else min(wake, frame)
+
+        min_gap = 1.0 / self.input_fps
+        since = time.time() - self._last_frame
+        if since < min_gap:
+            pygame.time.wait(int((min_gap - since) * 1000))
+
+        events = pygame.event.get()
+        if not events:
+            if wake is None:
+                events = [pygame.event.wait()] + pygame.event.get()
+            else:
+                timeout_ms = int(max(0.0, wake - time.time()) * 1000)
+                if timeout_ms > 0:
+                    event = pygame.event.wait(timeout_ms)
+                    if event.type != pygame.NOEVENT:
+                        events = [event] + pygame.event.get()
+
+        now = time.time()
+        if animating:
+            self.clock += min(now, self._last_input + ANIMATION_IDLE) - self._last_frame
+        self._last_frame = now
+        if events:
+            self._last_input = now
+        return events
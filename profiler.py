@@ -0,0 +1,152 @@
+"""
+Per-frame phase timing for the renderers.
+
+Wrap a phase of a frame in `with PROFILER.phase("tiles"):` and call
+PROFILER.end_frame() once the frame is on screen; a phase entered several
+times in one frame is summed. While the profiler is disabled, phase()
+hands back a shared no-op context manager and end_frame() returns at
+once, so the hooks cost one attribute check and a method call each.
+
+Set MINESWEEPER_PROFILE=<file.csv|file.json> to record from start-up and
+write the summary there on exit; F3 toggles the on-screen overlay (and
+recording) at any time.
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+PROFILE_PATH = os.environ.get("MINESWEEPER_PROFILE", "")
+DEFAULT_DUMP_PATH = "minesweeper_profile.json"
+# Number of most recent samples per phase the statistics are taken over.
+WINDOW = 240
+
+# Opaque, so redrawing it over a retained frame never shows stale text.
+OVERLAY_BG = (24, 24, 24)
+OVERLAY_TEXT = (235, 235, 235)
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("_pending", "_name", "_start")
+
+    def __init__(self, pending: dict, name: str):
+        self._pending = pending
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        self._pending[self._name] = self._pending.get(self._name, 0.0) + elapsed
+        return False
+
+
+class FrameProfiler:
+    """Rolling per-phase timings (mean, p95, max) over the last WINDOW frames."""
+
+    def __init__(self, enabled: bool = False, window: int = WINDOW,
+                 path: str = ""):
+        self.enabled = enabled
+        self.visible = False
+        self.window = window
+        self.path = path
+        self._samples = {}  # phase name -> deque of per-frame seconds, first-seen order
+        self._pending = {}  # phase name -> seconds spent in the current frame
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self._pending, name)
+
+    def end_frame(self):
+        """Close the current frame: push each phase's summed time into its window."""
+        if not self._pending:
+            return
+        for name, elapsed in self._pending.items():
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(elapsed)
+        self._pending.clear()
+
+    def toggle_overlay(self):
+        """F3: show/hide the overlay; recording follows unless forced on by the env var."""
+        self.visible = not self.visible
+        self.enabled = self.visible or bool(self.path)
+
+    def reset(self):
+        self._samples.clear()
+        self._pending.clear()
+
+    def stats(self) -> dict:
+        """{phase: {"count", "mean_ms", "p95_ms", "max_ms"}} over the rolling window."""
+        out = {}
+        for name, samples in self._samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            n = len(ordered)
+            out[name] = {
+                "count": n,
+                "mean_ms": sum(ordered) / n * 1000,
+                "p95_ms": ordered[min(n - 1, int(n * 0.95))] * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        return out
+
+    def draw_overlay(self, surface, font, pos=(8, 8)):
+        """Blit the stats table onto surface; returns the rect it covers, or None."""
+        if not self.visible:
+            return None
+        lines = [f"{'phase':<12}{'mean':>7}{'p95':>7}{'max':>7}  ms"]
+        for name, s in self.stats().items():
+            lines.append(f"{name:<12}{s['mean_ms']:>7.2f}{s['p95_ms']:>7.2f}{s['max_ms']:>7.2f}")
+        rendered = [font.render(line, True, OVERLAY_TEXT) for line in lines]
+
+        line_h = font.get_linesize()
+        w = max(s.get_width() for s in rendered) + 12
+        h = line_h * len(rendered) + 8
+        panel = pygame.Surface((w, h))
+        panel.fill(OVERLAY_BG)
+        for i, text in enumerate(rendered):
+            panel.blit(text, (6, 4 + i * line_h))
+        return surface.blit(panel, pos)
+
+    def dump(self, path: str | None = None):
+        """Write the current stats to a .csv or .json file; no-op if nothing was recorded."""
+        stats = self.stats()
+        if not stats:
+            return None
+        path = path or self.path or DEFAULT_DUMP_PATH
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["phase", "count", "mean_ms", "p95_ms", "max_ms"])
+                for name, s in stats.items():
+                    writer.writerow([name, s["count"], f"{s['mean_ms']:.4f}",
+                                     f"{s['p95_ms']:.4f}", f"{s['max_ms']:.4f}"])
+        else:
+            with open(path, "w") as f:
+                json.dump({"window": self.window, "phases": stats}, f, indent=2)
+        return path
+
+
+PROFILER = FrameProfiler(enabled=bool(PROFILE_PATH), path=PROFILE_PATH)
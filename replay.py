@@ -0,0 +1,308 @@
+"""
+Append-only replay logs and their playback.
+
+A log is a header (magic, version, rows, cols, mines, seed) followed by
+records of two varints: milliseconds since the previous record, and
+cell index * 4 + action. A LAYOUT record (its cell index is the byte
+length of the mine bit-plane that follows, see savefile.pack_bits) is
+written once the mines are down, so a log replays without regenerating
+the layout; playback lays it before the first move wherever it appears.
+A log cut short by a crash simply ends at its last complete record.
+
+Recording a move costs two varint encodings and a buffered write. Playback runs on
+classic_board.Board, headlessly at full speed or in real time through
+the minesweeper.py renderer:
+
+    python -m replay game.msr            # outcome, moves, duration
+    python -m replay replays/            # every *.msr in a directory
+    python -m replay game.msr --watch    # real time; Left/Right seek, Space pauses
+
+Seeking backwards restarts from the nearest keyframe, a savefile
+snapshot taken every KEYFRAME_EVERY moves as playback first passes it.
+Set MINESWEEPER_REPLAY_DIR to have minesweeper.py and game.py record
+every game there.
+"""
+import argparse
+import bisect
+import os
+import struct
+import sys
+import time
+
+import savefile
+from classic_board import Board
+
+MAGIC = b"MSRP"
+VERSION = 1
+REVEAL, FLAG, CHORD, LAYOUT = range(4)
+FLUSH_BYTES = 4096
+KEYFRAME_EVERY = 256
+RECORD_DIR = os.environ.get("MINESWEEPER_REPLAY_DIR", "")
+
+_HEADER = struct.Struct("<4sBIIIQ")
+
+
+def write_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos: int):
+    """(value, position after it); raises IndexError past the end of data."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _apply(board, action: int, r: int, c: int):
+    if action == REVEAL:
+        reveal = board.reveal if hasattr(board, "reveal") else board.reveal_cell
+        return reveal(r, c)
+    if action == FLAG:
+        return board.toggle_flag(r, c)
+    return board.chord(r, c)
+
+
+class Recorder:
+    """
+    Records the moves on one board to `path`. The file is created on the
+    first move, so boards that are never played leave nothing behind.
+    Writes go through a FLUSH_BYTES file buffer, flushed at game over and
+    when the recorder is closed or collected.
+    """
+
+    def __init__(self, path: str, board):
+        self.path = path
+        self.board = board
+        self._file = None
+        self._start = None
+        self._last = 0
+        self._layout = False
+
+    def record(self, action: int, r: int, c: int):
+        """Log a move that changed the board (call it after the move)."""
+        now = time.perf_counter()
+        out = bytearray()
+        if self._file is None:
+            self._file = open(self.path, "wb", buffering=FLUSH_BYTES)
+            self._start = now
+            board = self.board
+            out += _HEADER.pack(MAGIC, VERSION, board.rows, board.cols, board.mines_count,
+                                board.seed)
+        # A flag can come before the first reveal has placed the mines.
+        if not self._layout and getattr(self.board, "mines_placed", True):
+            board = self.board
+            plane = savefile.pack_bits(bytes(cell.is_mine for cell in board._cells)
+                                       if hasattr(board, "_cells") else board._mine_buf)
+            write_varint(out, 0)
+            write_varint(out, len(plane) << 2 | LAYOUT)
+            out += plane
+            self._layout = True
+        tick = int((now - self._start) * 1000)
+        write_varint(out, tick - self._last)
+        write_varint(out, (r * self.board.cols + c) << 2 | action)
+        self._last = tick
+        self._file.write(out)
+        if self.board.game_over:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def recorder_for(board):
+    """A Recorder writing into RECORD_DIR, or None if recording is off."""
+    if not RECORD_DIR:
+        return None
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    return Recorder(os.path.join(RECORD_DIR, f"game-{time.time_ns()}.msr"), board)
+
+
+class Replay:
+    """
+    A parsed log. `moves` holds (tick ms, action, flat index) tuples and
+    `board` the board after the first `position` of them. Without
+    keyframes, seeking backwards always restarts from the first move.
+    """
+
+    def __init__(self, data, keyframes: bool = True):
+        view = memoryview(data)
+        if len(view) < _HEADER.size:
+            raise ValueError("not a replay log")
+        magic, version, self.rows, self.cols, self.mines, self.seed = \
+            _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("not a replay log")
+        if version != VERSION:
+            raise ValueError(f"unsupported replay log version {version}")
+        self.keyframes = keyframes
+        self.layout = None
+        self.moves = []
+
+        pos, tick, n = _HEADER.size, 0, len(view)
+        try:
+            while pos < n:
+                delta, pos = read_varint(view, pos)
+                code, pos = read_varint(view, pos)
+                action, arg = code & 3, code >> 2
+                if action == LAYOUT:
+                    if pos + arg > n:
+                        break
+                    plane = savefile.unpack_bits(view[pos:pos + arg], self.rows * self.cols)
+                    self.layout = [i for i, m in enumerate(plane) if m]
+                    pos += arg
+                    continue
+                tick += delta
+                self.moves.append((tick, action, arg))
+        except IndexError:
+            pass  # torn final record
+        if self.layout is None and any(action != FLAG for _, action, _ in self.moves):
+            raise ValueError("replay log has no mine layout")
+
+        self.ticks = [tick for tick, _, _ in self.moves]
+        self._keyframes = {}
+        self.rewind()
+
+    @classmethod
+    def load(cls, path: str, keyframes: bool = True):
+        with open(path, "rb") as f:
+            return cls(f.read(), keyframes)
+
+    @property
+    def duration(self) -> int:
+        return self.ticks[-1] if self.ticks else 0
+
+    def rewind(self):
+        self.board = Board(self.rows, self.cols, self.mines, seed=self.seed)
+        if self.layout is not None:
+            self.board.set_mines(self.layout)
+        self.position = 0
+
+    def step(self) -> list:
+        """Apply the next move; returns the changed indices."""
+        _, action, i = self.moves[self.position]
+        changed = _apply(self.board, action, *divmod(i, self.cols))
+        self.position += 1
+        if (self.keyframes and self.position % KEYFRAME_EVERY == 0
+                and self.position not in self._keyframes):
+            self._keyframes[self.position] = savefile.dumps(self.board, adjacency=True)
+        return changed
+
+    def seek(self, position: int):
+        """Bring the board to just after `position` moves."""
+        position = max(0, min(position, len(self.moves)))
+        if position < self.position:
+            key = position - position % KEYFRAME_EVERY
+            if key in self._keyframes:
+                self.board, _ = savefile.loads(self._keyframes[key], Board)
+                self.position = key
+            else:
+                self.rewind()
+        while self.position < position:
+            self.step()
+
+    def seek_time(self, tick: int):
+        """Bring the board to the state at `tick` ms into the game."""
+        self.seek(bisect.bisect_right(self.ticks, tick))
+
+    def play(self):
+        """Fast-forward to the end; returns the final board."""
+        self.seek(len(self.moves))
+        return self.board
+
+
+def _watch(replay: Replay, speed: float):
+    import pygame
+    import minesweeper
+    from viewport import Camera
+
+    pygame.init()
+    width, height = minesweeper.calc_window_size(replay.rows, replay.cols)
+    screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+    pygame.display.set_caption("Minesweeper replay")
+    font = minesweeper.resources.get_font("consolas", 18, bold=True)
+    digit_font = minesweeper.resources.get_font("consolas", 22, bold=True)
+    camera = Camera(replay.rows, replay.cols, minesweeper.MIN_CELL_SIZE, width, height)
+    clock = pygame.time.Clock()
+
+    tick, paused = 0.0, False
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN
+                                             and event.key == pygame.K_ESCAPE):
+                pygame.quit()
+                return
+            if event.type == pygame.VIDEORESIZE:
+                screen = pygame.display.set_mode(event.size, pygame.RESIZABLE)
+                minesweeper.SEASIDE.invalidate()
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    step = 5000 if event.key == pygame.K_RIGHT else -5000
+                    tick = max(0.0, min(tick + step, replay.duration))
+                    replay.seek_time(int(tick))
+
+        dt = clock.tick(60)
+        if not paused:
+            tick = min(tick + dt * speed, replay.duration)
+            replay.seek_time(int(tick))
+
+        board = replay.board
+        if board.game_over:
+            face = minesweeper.FACE_WIN if board.victory else minesweeper.FACE_LOSE
+        else:
+            face = minesweeper.FACE_NEUTRAL
+        minesweeper.fit_board(*screen.get_size(), camera)
+        minesweeper.draw_board(screen, board, font, digit_font, tick / 1000, face, camera=camera)
+        pygame.display.flip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", help="a .msr log, or a directory of them")
+    parser.add_argument("--watch", action="store_true", help="play back in real time")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed with --watch")
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        _watch(Replay.load(args.path), args.speed)
+        return 0
+
+    if os.path.isdir(args.path):
+        paths = sorted(os.path.join(args.path, name) for name in os.listdir(args.path)
+                       if name.endswith(".msr"))
+    else:
+        paths = [args.path]
+    start = time.perf_counter()
+    wins = moves = 0
+    for path in paths:
+        try:
+            replay = Replay.load(path, keyframes=False)
+        except ValueError as exc:
+            print(f"{path}: {exc}", file=sys.stderr)
+            continue
+        board = replay.play()
+        wins += board.victory
+        moves += len(replay.moves)
+        if len(paths) == 1:
+            outcome = "won" if board.victory else "lost" if board.game_over else "unfinished"
+            print(f"{replay.rows}x{replay.cols}, {replay.mines} mines: {outcome} after "
+                  f"{len(replay.moves)} moves in {replay.duration / 1000:.1f} s")
+    seconds = time.perf_counter() - start
+    if len(paths) > 1:
+        print(f"{len(paths)} games, {wins} won, {moves} moves replayed in {seconds:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
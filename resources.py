@@ -0,0 +1,54 @@
+"""
+Process-wide cache for fonts and images shared by both front-ends.
+
+pygame.font.SysFont has to search the system font list on every call and
+image loading hits the disk, so both are done once per key and kept in a
+small LRU cache.
+"""
+from collections import OrderedDict
+
+import pygame
+
+MAX_FONTS = 32
+MAX_IMAGES = 64
+
+_fonts = OrderedDict()
+_images = OrderedDict()
+
+
+def _cached(cache, key, limit, factory):
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+        return value
+    value = factory()
+    cache[key] = value
+    if len(cache) > limit:
+        cache.popitem(last=False)
+    return value
+
+
+def get_font(name: str, size: int, bold: bool = False) -> pygame.font.Font:
+    """pygame.font.SysFont(name, size, bold), loaded once per key."""
+    return _cached(_fonts, (name, size, bold), MAX_FONTS,
+                   lambda: pygame.font.SysFont(name, size, bold=bold))
+
+
+def get_image(path: str, size: tuple[int, int] | None = None) -> pygame.Surface:
+    """
+    Image at `path` converted for fast alpha blits, smooth-scaled to `size`
+    if given. The unscaled image is cached too, so a new size does not
+    touch the disk again. Needs a display mode to be set (convert_alpha).
+    """
+    if size is None:
+        return _cached(_images, (path, None), MAX_IMAGES,
+                       lambda: pygame.image.load(path).convert_alpha())
+    size = tuple(size)
+    return _cached(_images, (path, size), MAX_IMAGES,
+                   lambda: pygame.transform.smoothscale(get_image(path), size))
+
+
+def clear():
+    """Drop every cached resource (e.g. before pygame.quit())."""
+    _fonts.clear()
+    _images.clear()
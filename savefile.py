@@ -0,0 +1,248 @@
+"""
+Compact binary save files for every Board engine.
+
+Layout (little-endian):
+
+    header  magic b"MSWP", version, flags, rows, cols, mines,
+            seed (u64), elapsed seconds (f64), state bits,
+            first click + 1 (u32, 0 for none; version 2 on)
+    planes  mines, revealed, flagged: one bit per cell, row-major, first
+            cell in the high bit of the first byte
+            [adjacency: one nibble per cell, 0xF for a mine, if FLAG_ADJACENCY]
+
+Each plane is stored as (encoding, length, data), zlib-compressed when
+that is smaller. Without the adjacency plane the counts are recomputed
+on load. Packing and unpacking go through int/bytes conversions and
+translate tables, so no Python loop runs per cell for ArrayBoard; object
+boards still pay for setting their Cell attributes. Files of
+MMAP_THRESHOLD bytes or more are read through mmap.
+
+Anything loads() can't use - a damaged or truncated file, a plane of the
+wrong size, a board larger than MAX_SIDE - raises ValueError.
+"""
+import mmap
+import os
+import struct
+import zlib
+from collections import namedtuple
+
+from grid_utils import adjacency_counts
+
+MAGIC = b"MSWP"
+VERSION = 2
+FLAG_ADJACENCY = 1
+STATE_PLACED, STATE_OVER, STATE_VICTORY = 1, 2, 4
+ENCODING_RAW, ENCODING_ZLIB = 0, 1
+MMAP_THRESHOLD = 1024 * 1024
+SAVE_PATH = "minesweeper.sav"
+# Largest rows or cols loads() accepts (game.py's custom boards go up to 600).
+MAX_SIDE = 600
+
+_HEADER = struct.Struct("<4sBBIIIQdBI")
+_HEADER_V1 = struct.Struct("<4sBBIIIQdB")
+_PLANE = struct.Struct("<BI")
+
+Header = namedtuple("Header", "rows cols mines seed elapsed")
+
+_TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+# Adjacency byte (-1 for a mine, as a signed byte) <-> hex digit.
+_TO_HEX = bytes(b"0123456789abcdef"[v & 15] for v in range(256))
+_FROM_HEX = bytes.maketrans(b"0123456789abcdef", bytes([*range(15), 255]))
+_ADJACENCY_VALUES = bytes([*range(9), 255])
+
+
+def pack_bits(flags) -> bytes:
+    """0/1 bytes -> one bit per byte of input."""
+    n = len(flags)
+    if not n:
+        return b""
+    pad = -n % 8
+    digits = bytes(flags).translate(_TO_DIGITS) + b"0" * pad
+    return int(digits, 2).to_bytes((n + pad) // 8, "big")
+
+
+def unpack_bits(data, n: int) -> bytes:
+    """Inverse of pack_bits: n bytes of 0/1."""
+    if not n:
+        return b""
+    digits = format(int.from_bytes(data, "big"), f"0{len(data) * 8}b")
+    return digits.encode()[:n].translate(_FROM_DIGITS)
+
+
+def pack_nibbles(values) -> bytes:
+    """Adjacency counts as signed bytes (-1..8) -> two cells per byte."""
+    digits = bytes(values).translate(_TO_HEX)
+    if len(digits) % 2:
+        digits += b"0"
+    return bytes.fromhex(digits.decode())
+
+
+def unpack_nibbles(data, n: int) -> bytes:
+    return bytes(data).hex().encode()[:n].translate(_FROM_HEX)
+
+
+def _planes(board):
+    """(mines, revealed, flagged, adjacency) as flat byte strings."""
+    if hasattr(board, "_mine_buf"):  # np_board.ArrayBoard
+        return (bytes(board._mine_buf), bytes(board._revealed_buf),
+                bytes(board._flagged_buf), board._adj_buf.tobytes())
+    cells = board._cells
+    adj = "adj" if hasattr(cells[0], "adj") else "adjacent_mines"
+    return (bytes(c.is_mine for c in cells), bytes(c.revealed for c in cells),
+            bytes(c.flagged for c in cells), bytes(getattr(c, adj) & 0xFF for c in cells))
+
+
+def _restore(board, mines, revealed, flagged, adjacency):
+    if hasattr(board, "_mine_buf"):
+        memoryview(board._mine_buf)[:] = mines
+        memoryview(board._revealed_buf)[:] = revealed
+        memoryview(board._flagged_buf)[:] = flagged
+        if adjacency is None:
+            board._compute_adjacencies()
+        else:
+            memoryview(board._adj_buf).cast("B")[:] = adjacency
+        return
+
+    cells = board._cells
+    if adjacency is None:
+        counts = adjacency_counts(mines, board.rows, board.cols)
+    else:
+        counts = [v - 256 if v > 127 else v for v in adjacency]
+    adj = "adj" if hasattr(cells[0], "adj") else "adjacent_mines"
+    for cell, m, r, f, a in zip(cells, mines, revealed, flagged, counts):
+        cell.is_mine = m == 1
+        cell.revealed = r == 1
+        cell.flagged = f == 1
+        setattr(cell, adj, a)
+
+
+def _write_plane(out: list, data: bytes):
+    packed = zlib.compress(data)
+    if len(packed) < len(data):
+        out += [_PLANE.pack(ENCODING_ZLIB, len(packed)), packed]
+    else:
+        out += [_PLANE.pack(ENCODING_RAW, len(data)), data]
+
+
+def _read_plane(view, pos: int, size: int):
+    """(plane as bytes, position after it); the plane must be `size` bytes."""
+    if pos + _PLANE.size > len(view):
+        raise ValueError("truncated save file")
+    encoding, length = _PLANE.unpack_from(view, pos)
+    pos += _PLANE.size
+    if pos + length > len(view):
+        raise ValueError("truncated save file")
+    if encoding == ENCODING_ZLIB:
+        inflate = zlib.decompressobj()
+        try:
+            # Never inflate past what the board needs, whatever the file claims.
+            data = inflate.decompress(view[pos:pos + length], size + 1)
+        except zlib.error as exc:
+            raise ValueError(f"damaged save file: {exc}") from None
+    elif encoding == ENCODING_RAW:
+        data = bytes(view[pos:pos + length])
+    else:
+        raise ValueError(f"unknown plane encoding {encoding}")
+    if len(data) != size:
+        raise ValueError("damaged save file: plane has the wrong size")
+    return data, pos + length
+
+
+def dumps(board, elapsed: float = 0.0, adjacency: bool = False) -> bytes:
+    """Serialize a board; adjacency=True also stores the counts (faster loads of object boards)."""
+    state = ((STATE_PLACED if getattr(board, "mines_placed", True) else 0)
+             | (STATE_OVER if board.game_over else 0)
+             | (STATE_VICTORY if board.victory else 0))
+    first_click = getattr(board, "first_click", None)
+    out = [_HEADER.pack(MAGIC, VERSION, FLAG_ADJACENCY if adjacency else 0,
+                        board.rows, board.cols, board.mines_count,
+                        getattr(board, "seed", None) or 0, elapsed, state,
+                        0 if first_click is None else first_click + 1)]
+    mines, revealed, flagged, counts = _planes(board)
+    for plane in (mines, revealed, flagged):
+        _write_plane(out, pack_bits(plane))
+    if adjacency:
+        _write_plane(out, pack_nibbles(counts))
+    return b"".join(out)
+
+
+def loads(data, board_cls):
+    """Rebuild a board of board_cls from dumps() output; returns (board, Header)."""
+    # Released on the way out, even on an error, so an mmap behind it can close.
+    with memoryview(data) as view:
+        return _loads(view, board_cls)
+
+
+def _loads(view, board_cls):
+    if len(view) < _HEADER_V1.size or bytes(view[:4]) != MAGIC:
+        raise ValueError("not a minesweeper save file")
+    version = view[4]
+    if version == 1:
+        fields = _HEADER_V1.unpack_from(view) + (0,)
+        pos = _HEADER_V1.size
+    elif version == VERSION:
+        if len(view) < _HEADER.size:
+            raise ValueError("truncated save file")
+        fields = _HEADER.unpack_from(view)
+        pos = _HEADER.size
+    else:
+        raise ValueError(f"unsupported save file version {version}")
+    _, _, flags, rows, cols, mines, seed, elapsed, state, first_click = fields
+    if not (0 < rows <= MAX_SIDE and 0 < cols <= MAX_SIDE):
+        raise ValueError(f"unsupported board size {rows}x{cols}")
+    n = rows * cols
+    if mines > n or first_click > n:
+        raise ValueError("damaged save file")
+
+    planes = []
+    for _ in range(3):
+        packed, pos = _read_plane(view, pos, (n + 7) // 8)
+        planes.append(packed)
+    counts = None
+    if flags & FLAG_ADJACENCY:
+        packed, pos = _read_plane(view, pos, (n + 1) // 2)
+        counts = unpack_nibbles(packed, n)
+        if counts.translate(None, _ADJACENCY_VALUES):
+            raise ValueError("damaged save file: adjacency count out of range")
+
+    board = board_cls(rows, cols, 0)  # no mines to place: everything comes from the file
+    board.mines_count = mines
+    if hasattr(board, "seed"):
+        board.seed = seed
+    if hasattr(board, "first_click"):
+        board.first_click = first_click - 1 if first_click else None
+    mine_bits, revealed_bits, flagged_bits = (int.from_bytes(p, "big") for p in planes)
+    if state & STATE_PLACED:
+        if mine_bits.bit_count() != mines:
+            raise ValueError("damaged save file: mine count doesn't match the mines")
+        _restore(board, *(unpack_bits(p, n) for p in planes), counts)
+        board._hidden_safe = n - mines - (revealed_bits & ~mine_bits).bit_count()
+        if hasattr(board, "mines_placed"):
+            board.mines_placed = True
+    else:
+        # Saved before the first click: no mines or reveals yet, but flags.
+        if mine_bits or revealed_bits:
+            raise ValueError("damaged save file: cells set before the mines were placed")
+        _restore(board, bytes(n), bytes(n), unpack_bits(planes[2], n), bytes(n))
+    board._flag_count = flagged_bits.bit_count()
+    board.game_over = bool(state & STATE_OVER)
+    board.victory = bool(state & STATE_VICTORY)
+    return board, Header(rows, cols, mines, seed, elapsed)
+
+
+def save(path: str, board, elapsed: float = 0.0, adjacency: bool = False):
+    data = dumps(board, elapsed, adjacency)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def load(path: str, board_cls):
+    """(board, Header) from a file written by save()."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return loads(f.read(), board_cls)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return loads(mapped, board_cls)
@@ -0,0 +1,293 @@
+"""
+Monte Carlo win-rate statistics from automated games.
+
+Games are played on classic_board.Board (the engine behind minesweeper.py)
+by a pluggable player, in shards of SHARD_GAMES on a process pool. Every
+shard has its own seed derived from the run seed and the shard number,
+so a run is reproducible whatever the number of workers. Shards only
+return a Stats accumulator, which the parent merges as they arrive;
+nothing grows with the number of games. Merged results and the finished
+shard numbers are written to a JSON checkpoint, and a run started with
+the same checkpoint and settings picks up where it stopped.
+
+    python -m simulate --size 16x30 --mines 99 --games 1000000 --checkpoint expert.json
+
+A player is a class with start(board, rng), called after the first
+click, and next(changed), returning the flat index to reveal next given
+the indices the previous move changed. It may count its guesses in
+`guesses`. Pass one of PLAYERS or a "module:Class" path with --player.
+"""
+import argparse
+import importlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import classic_board
+from classic_board import Board
+from grid_utils import neighbor_table
+from solver import Solver
+
+SHARD_GAMES = 1000
+# Seconds between checkpoint writes (one is always written at the end).
+CHECKPOINT_EVERY = 10.0
+
+
+class SolverPlayer:
+    """Reveals proven-safe cells; guesses a random unproven hidden cell when stuck."""
+
+    def start(self, board, rng):
+        self.board = board
+        self.rng = rng
+        self.solver = Solver(board)
+        self.guesses = 0
+
+    def next(self, changed):
+        solver = self.solver
+        solver.update(changed)
+        if solver.safe:
+            return solver.safe.pop()
+        self.guesses += 1
+        cells, mines = self.board._cells, solver.mines
+        hidden = [i for i, cell in enumerate(cells)
+                  if not cell.revealed and i not in mines]
+        return self.rng.choice(hidden)
+
+
+class RandomPlayer:
+    """Reveals a random hidden cell every move (a baseline, it rarely wins)."""
+
+    def start(self, board, rng):
+        self.board = board
+        self.rng = rng
+        self.guesses = 0
+
+    def next(self, changed):
+        self.guesses += 1
+        return self.rng.choice([i for i, cell in enumerate(self.board._cells)
+                                if not cell.revealed])
+
+
+PLAYERS = {"solver": SolverPlayer, "random": RandomPlayer}
+
+FIRST_CLICKS = {
+    "center": lambda rows, cols, rng: (rows // 2, cols // 2),
+    "corner": lambda rows, cols, rng: (0, 0),
+    "random": lambda rows, cols, rng: (rng.randrange(rows), rng.randrange(cols)),
+}
+
+
+def load_player(name: str):
+    if ":" in name:
+        module, _, attr = name.partition(":")
+        return getattr(importlib.import_module(module), attr)
+    return PLAYERS[name]
+
+
+class Stats:
+    """Mergeable running sums; mean and spread come from count, sum and sum of squares."""
+
+    FIELDS = ("games", "wins", "moves", "moves_sq", "guesses", "openings", "seconds",
+              "seconds_max")
+
+    def __init__(self, **values):
+        for name in self.FIELDS:
+            setattr(self, name, values.get(name, 0))
+
+    def add(self, won: bool, moves: int, guesses: int, openings: int, seconds: float):
+        self.games += 1
+        self.wins += won
+        self.moves += moves
+        self.moves_sq += moves * moves
+        self.guesses += guesses
+        self.openings += openings
+        self.seconds += seconds
+        self.seconds_max = max(self.seconds_max, seconds)
+
+    def merge(self, other: "Stats"):
+        for name in self.FIELDS:
+            if name == "seconds_max":
+                self.seconds_max = max(self.seconds_max, other.seconds_max)
+            else:
+                setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def summary(self) -> str:
+        n = self.games
+        if not n:
+            return "no games"
+        rate = self.wins / n
+        margin = 1.96 * math.sqrt(rate * (1 - rate) / n)
+        mean_moves = self.moves / n
+        sd_moves = math.sqrt(max(0.0, self.moves_sq / n - mean_moves * mean_moves))
+        return (f"{n} games, win rate {rate:.2%} +/- {margin:.2%}, "
+                f"moves {mean_moves:.1f} (sd {sd_moves:.1f}), "
+                f"guesses {self.guesses / n:.2f}, openings {self.openings / n:.2f}, "
+                f"{self.seconds / n * 1000:.2f} ms/game (max {self.seconds_max * 1000:.1f})")
+
+
+def count_openings(board) -> int:
+    """Connected regions of zero cells, i.e. the areas one click opens at once."""
+    offsets, indices = neighbor_table(board.rows, board.cols)
+    cells = board._cells
+    seen = bytearray(len(cells))
+    openings = 0
+    for start, cell in enumerate(cells):
+        if seen[start] or cell.is_mine or cell.adj:
+            continue
+        openings += 1
+        seen[start] = 1
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            for j in indices[offsets[i]:offsets[i + 1]]:
+                if not seen[j] and not cells[j].is_mine and not cells[j].adj:
+                    seen[j] = 1
+                    stack.append(j)
+    return openings
+
+
+def play_game(rows, cols, mines, first_click, player, rng):
+    """One game; returns (won, moves, guesses, openings)."""
+    board = Board(rows, cols, mines)
+    changed = board.reveal(*first_click(rows, cols, rng))
+    openings = count_openings(board)
+    player.start(board, rng)
+    moves = 1
+    while not board.game_over:
+        changed = board.reveal(*divmod(player.next(changed), cols))
+        moves += 1
+    return board.victory, moves, player.guesses, openings
+
+
+def shard_seed(seed: int, shard: int) -> str:
+    # String seeds are hashed with SHA-512, so neighbouring shards get unrelated streams.
+    return f"{seed}:{shard}"
+
+
+def run_shard(config: dict, shard: int) -> Stats:
+    """Play one shard's games in this process and return their Stats."""
+    # Simulated boards are never dealt twice, and each worker's BoardCache
+    # would enforce its byte cap alone on the shared directory.
+    classic_board.CACHE = None
+    random.seed(shard_seed(config["seed"], shard))  # Board.place_mines draws from here
+    rng = random.Random(shard_seed(config["seed"], shard))
+    first_click = FIRST_CLICKS[config["first_click"]]
+    player = load_player(config["player"])()
+    rows, cols, mines = config["rows"], config["cols"], config["mines"]
+
+    stats = Stats()
+    games = min(SHARD_GAMES, config["games"] - shard * SHARD_GAMES)
+    for _ in range(games):
+        start = time.perf_counter()
+        won, moves, guesses, openings = play_game(rows, cols, mines, first_click, player, rng)
+        stats.add(won, moves, guesses, openings, time.perf_counter() - start)
+    return stats
+
+
+def load_checkpoint(path: str, config: dict):
+    """(Stats, set of finished shards) from `path`, or empty ones if it doesn't exist."""
+    if not path or not os.path.exists(path):
+        return Stats(), set()
+    with open(path) as f:
+        data = json.load(f)
+    if data["config"] != config:
+        raise ValueError(f"{path} was written for different settings: {data['config']}")
+    return Stats(**data["stats"]), set(data["done"])
+
+
+def save_checkpoint(path: str, config: dict, stats: Stats, done: set):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"config": config, "stats": stats.to_dict(), "done": sorted(done)}, f)
+    os.replace(tmp, path)  # never leave a half-written checkpoint behind
+
+
+def simulate(config: dict, workers=None, checkpoint=None, progress=None) -> Stats:
+    """
+    Run every shard of `config` not yet recorded in `checkpoint`.
+    progress(stats), if given, is called after each merged shard.
+    """
+    stats, done = load_checkpoint(checkpoint, config)
+    shards = math.ceil(config["games"] / SHARD_GAMES)
+    todo = iter([s for s in range(shards) if s not in done])
+    workers = workers or os.cpu_count() or 1
+    last_save = time.monotonic()
+
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            # A bounded number of shards in flight, so a huge run never
+            # queues millions of futures.
+            pending = {}
+            for shard in todo:
+                pending[pool.submit(run_shard, config, shard)] = shard
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    shard = pending.pop(future)
+                    stats.merge(future.result())
+                    done.add(shard)
+                    if progress is not None:
+                        progress(stats)
+                    next_shard = next(todo, None)
+                    if next_shard is not None:
+                        pending[pool.submit(run_shard, config, next_shard)] = next_shard
+                if checkpoint and time.monotonic() - last_save >= CHECKPOINT_EVERY:
+                    save_checkpoint(checkpoint, config, stats, done)
+                    last_save = time.monotonic()
+    finally:
+        # Also on Ctrl-C: only fully merged shards are recorded.
+        if checkpoint:
+            save_checkpoint(checkpoint, config, stats, done)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", default="16x30", help="ROWSxCOLS")
+    parser.add_argument("--mines", type=int, help="mine count (default: from --density)")
+    parser.add_argument("--density", type=float, default=0.206,
+                        help="mines per cell when --mines is not given")
+    parser.add_argument("--first-click", choices=sorted(FIRST_CLICKS), default="center")
+    parser.add_argument("--player", default="solver",
+                        help=f"one of {', '.join(PLAYERS)} or module:Class")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", metavar="PATH",
+                        help="save progress to PATH and resume from it if it exists")
+    args = parser.parse_args(argv)
+
+    rows, cols = (int(x) for x in args.size.lower().split("x"))
+    mines = args.mines if args.mines is not None else round(rows * cols * args.density)
+    config = {"rows": rows, "cols": cols, "mines": mines, "first_click": args.first_click,
+              "player": args.player, "games": args.games, "seed": args.seed}
+    load_player(args.player)  # fail here rather than in every worker
+
+    start = time.perf_counter()
+
+    def progress(stats):
+        print(f"\r{stats.games}/{args.games} games, win rate {stats.wins / stats.games:.2%}",
+              end="", flush=True)
+
+    try:
+        stats = simulate(config, args.workers, args.checkpoint, progress)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    print()
+    print(stats.summary())
+    print(f"wall time {time.perf_counter() - start:.1f} s on {args.workers} workers")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
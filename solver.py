@@ -0,0 +1,185 @@
+"""
+Deterministic constraint-propagation solver over a board's visible state.
+
+Only revealed numbers and flags are read, never is_mine. Flags are taken
+at face value: a wrong flag leads to wrong deductions, as it would for a
+player.
+"""
+from grid_utils import neighbor_table
+
+
+def _visible_state(board):
+    """(revealed(i), flagged(i), number(i)) readers for any of the Board engines."""
+    if hasattr(board, "_revealed_buf"):  # np_board.ArrayBoard
+        return (board._revealed_buf.__getitem__, board._flagged_buf.__getitem__,
+                board._adj_buf.__getitem__)
+    cells = board._cells
+    if hasattr(cells[0], "adj"):  # classic_board
+        return (lambda i: cells[i].revealed, lambda i: cells[i].flagged,
+                lambda i: cells[i].adj)
+    return (lambda i: cells[i].revealed, lambda i: cells[i].flagged,
+            lambda i: cells[i].adjacent_mines)
+
+
+class Solver:
+    """
+    Incremental single-point and subset/superset deduction.
+
+    Every revealed number with hidden neighbours is a constraint "exactly
+    `mines` of these `cells` are mines". A constraint with 0 mines left
+    makes all its cells safe; one with as many mines as cells makes them
+    all mines; and when one constraint's cells are a subset of another's,
+    the difference carries the difference in mines.
+
+    Pass the flat indices returned by the Board actions to update(): only
+    constraints around those cells, and constraints touched by the
+    resulting deductions, are re-examined. Results are flat indices
+    (row * cols + col):
+
+        safe   cells proven safe that are still hidden
+        mines  unflagged cells proven to be mines
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.cols = board.cols
+        self._n = board.rows * board.cols
+        self._offsets, self._indices = neighbor_table(board.rows, board.cols)
+        self._revealed, self._flagged, self._number = _visible_state(board)
+
+        self.safe = set()
+        self.mines = set()
+        self._constraints = {}  # revealed cell -> (frozenset of hidden cells, mines among them)
+        self._by_cell = {}      # hidden cell -> constraints that mention it
+        self._flags = set()
+        self.rebuild()
+
+    def _neighbors(self, i: int):
+        return self._indices[self._offsets[i]:self._offsets[i + 1]]
+
+    def rebuild(self):
+        """Re-derive everything from the board (e.g. after a flag was removed)."""
+        self.safe.clear()
+        self.mines.clear()
+        self._constraints.clear()
+        self._by_cell.clear()
+        revealed, flagged = self._revealed, self._flagged
+        self._flags = {i for i in range(self._n) if flagged(i)}
+        self._propagate({i for i in range(self._n) if revealed(i)})
+
+    def update(self, changed):
+        """Account for the cells a reveal, chord or flag toggle just changed."""
+        revealed, flagged = self._revealed, self._flagged
+        work = set()
+        for i in changed:
+            if revealed(i):
+                self.safe.discard(i)
+                work.add(i)
+            elif flagged(i):
+                self._flags.add(i)
+                self.mines.discard(i)
+            elif i in self._flags:
+                # Deductions may have leaned on this flag.
+                self.rebuild()
+                return
+            work.update(self._neighbors(i))
+        self._propagate(work)
+
+    def _drop(self, i: int):
+        old = self._constraints.pop(i, None)
+        if old is not None:
+            for j in old[0]:
+                self._unindex(j, i)
+
+    def _unindex(self, cell: int, i: int):
+        refs = self._by_cell[cell]
+        refs.discard(i)
+        if not refs:
+            del self._by_cell[cell]
+
+    def _refresh(self, i: int):
+        """Recompute the constraint of cell i from the current state; None if it has none."""
+        if not self._revealed(i):
+            self._drop(i)
+            return None
+        left = self._number(i)
+        hidden = []
+        if left > 0:
+            revealed, flagged = self._revealed, self._flagged
+            safe, mines = self.safe, self.mines
+            for j in self._neighbors(i):
+                if revealed(j) or j in safe:
+                    continue
+                if flagged(j) or j in mines:
+                    left -= 1
+                else:
+                    hidden.append(j)
+        # No hidden cells, a revealed mine (-1) or contradicting flags.
+        if not hidden or not 0 <= left <= len(hidden):
+            self._drop(i)
+            return None
+
+        cells = frozenset(hidden)
+        old = self._constraints.get(i)
+        if old is None or old[0] != cells:
+            if old is not None:
+                for j in old[0] - cells:
+                    self._unindex(j, i)
+            for j in cells:
+                self._by_cell.setdefault(j, set()).add(i)
+        constraint = self._constraints[i] = (cells, left)
+        return constraint
+
+    def _mark(self, cells, target: set, work: set):
+        revealed, flagged = self._revealed, self._flagged
+        for j in cells:
+            # Stale constraints can still name cells the player has since opened.
+            if j in target or revealed(j) or flagged(j):
+                continue
+            target.add(j)
+            work.update(self._by_cell.get(j, ()))
+
+    def _propagate(self, work: set):
+        constraints, by_cell = self._constraints, self._by_cell
+        while work:
+            i = work.pop()
+            constraint = self._refresh(i)
+            if constraint is None:
+                continue
+            cells, left = constraint
+            if left == 0:
+                self._mark(cells, self.safe, work)
+                continue
+            if left == len(cells):
+                self._mark(cells, self.mines, work)
+                continue
+
+            # Subset/superset against every constraint sharing a cell. A
+            # constraint not yet refreshed after a deduction still holds,
+            # so stale entries are safe to reason with.
+            others = set()
+            for j in cells:
+                others.update(by_cell[j])
+            others.discard(i)
+            for k in others:
+                other_cells, other_left = constraints[k]
+                if cells < other_cells:
+                    diff, extra = other_cells - cells, other_left - left
+                elif other_cells < cells:
+                    diff, extra = cells - other_cells, left - other_left
+                else:
+                    continue
+                if extra == 0:
+                    self._mark(diff, self.safe, work)
+                elif extra == len(diff):
+                    self._mark(diff, self.mines, work)
+
+    def constraints(self) -> list:
+        """The current frontier as (frozenset of hidden cells, mines among them) pairs."""
+        return list(self._constraints.values())
+
+    def safe_cells(self) -> list:
+        return sorted(divmod(i, self.cols) for i in self.safe)
+
+    def mine_cells(self) -> list:
+        return sorted(divmod(i, self.cols) for i in self.mines)
@@ -0,0 +1,79 @@
+"""Engine list, state snapshots and the reference stack fill shared by the tests."""
+import classic_board
+import ms_board
+
+try:
+    from np_board import ArrayBoard
+except ImportError:  # NumPy not installed
+    ArrayBoard = None
+
+# (Board class, name of its reveal method) for every engine.
+ENGINES = [(classic_board.Board, "reveal"), (ms_board.Board, "reveal_cell")]
+if ArrayBoard is not None:
+    ENGINES.append((ArrayBoard, "reveal_cell"))
+ENGINE_IDS = [board_cls.__module__ for board_cls, _ in ENGINES]
+
+
+def cell_planes(board):
+    """(mines, revealed, flagged, adjacency) as flat bytes for any engine."""
+    if hasattr(board, "_mine_buf"):
+        return (bytes(board._mine_buf), bytes(board._revealed_buf),
+                bytes(board._flagged_buf), bytes(b & 0xFF for b in board._adj_buf))
+    cells = board._cells
+    adj = "adj" if hasattr(cells[0], "adj") else "adjacent_mines"
+    return (bytes(c.is_mine for c in cells), bytes(c.revealed for c in cells),
+            bytes(c.flagged for c in cells), bytes(getattr(c, adj) & 0xFF for c in cells))
+
+
+def state(board):
+    """Everything a move can change, comparable across save/load and undo/redo."""
+    return cell_planes(board) + (board._hidden_safe, board._flag_count,
+                                 board.game_over, board.victory, board.mines_count)
+
+
+def play_randomly(board, reveal_name, rng, moves):
+    """Up to `moves` random reveals, flags and chords; stops at game over."""
+    reveal = getattr(board, reveal_name)
+    for _ in range(moves):
+        if board.game_over:
+            break
+        r, c = rng.randrange(board.rows), rng.randrange(board.cols)
+        x = rng.random()
+        if x < 0.25:
+            board.toggle_flag(r, c)
+        elif x < 0.35:
+            board.chord(r, c)
+        else:
+            reveal(r, c)
+
+
+def reference_fill(board, start, state):
+    """The stack fill the boards used before: one cell per pop, every neighbour checked."""
+    offsets, indices = board._nbr_offsets, board._nbr_indices
+    revealed, blocked, zero = state
+    changed = []
+    stack = [start]
+    while stack:
+        i = stack.pop()
+        for j in indices[offsets[i]:offsets[i + 1]]:
+            if revealed[j] or blocked[j]:
+                continue
+            revealed[j] = 1
+            changed.append(j)
+            board._hidden_safe -= 1
+            if zero[j]:
+                stack.append(j)
+    return changed
+
+
+def cell_state(board):
+    """(revealed, flagged-or-mine, zero) as flat bytearrays."""
+    if hasattr(board, "_mine_buf"):
+        return (bytearray(board._revealed_buf),
+                bytearray(m | f for m, f in zip(board._mine_buf, board._flagged_buf)),
+                bytearray(a == 0 for a in board._adj_buf))
+    cells = board._cells
+    adj = "adj" if hasattr(cells[0], "adj") else "adjacent_mines"
+    return (bytearray(c.revealed for c in cells),
+            bytearray(c.is_mine or c.flagged for c in cells),
+            bytearray(getattr(c, adj) == 0 for c in cells))
@@ -0,0 +1,90 @@
+import datetime
+import random
+
+import pytest
+
+import board_code
+from board_code import BoardKey, decode, encode
+from classic_board import Board
+from tests.helpers import cell_planes
+
+
+def test_docstring_example():
+    assert encode(BoardKey(16, 30, 99, 255, 1234)) == "CAPG-HAAC-2IE2-U"
+
+
+def test_round_trip():
+    rng = random.Random(0)
+    for _ in range(2000):
+        rows, cols = rng.randint(1, board_code.MAX_SIDE), rng.randint(1, board_code.MAX_SIDE)
+        n = rows * cols
+        first_click = rng.choice([None, rng.randrange(n)])
+        key = BoardKey(rows, cols, rng.randrange(n), first_click,
+                       rng.getrandbits(board_code.SEED_BITS))
+        assert decode(encode(key)) == key
+
+
+def test_case_spaces_and_dashes_are_ignored():
+    key = BoardKey(9, 9, 10, 40, 77)
+    code = encode(key)
+    assert decode(code.lower()) == key
+    assert decode(" ".join(code.replace("-", ""))) == key
+
+
+def test_damaged_codes_raise_value_error():
+    code = encode(BoardKey(16, 30, 99, 255, 1234)).replace("-", "")
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+    rejected = 0
+    for i in range(len(code)):
+        for ch in alphabet:
+            if ch == code[i]:
+                continue
+            try:
+                decode(code[:i] + ch + code[i + 1:])
+            except ValueError:
+                rejected += 1
+    # The check byte is 8 bits, so a few substitutions slip through as other boards.
+    assert rejected > 0.95 * len(code) * (len(alphabet) - 1)
+    for bad in ("", "!!!!", code[:4], "1" + code[1:]):
+        with pytest.raises(ValueError):
+            decode(bad)
+
+
+@pytest.mark.parametrize("key", [
+    BoardKey(0, 9, 0, None, 1),
+    BoardKey(9, 9, 81, None, 1),
+    BoardKey(9, 9, 10, 82, 1),
+    BoardKey(board_code.MAX_SIDE + 1, 9, 10, None, 1),
+    BoardKey(9, board_code.MAX_SIDE + 1, 10, None, 1),
+])
+def test_impossible_or_oversized_boards_rejected(key):
+    with pytest.raises(ValueError):
+        decode(encode(key))
+
+
+def test_front_end_limits():
+    code = encode(BoardKey(25, 30, 99, 0, 1))
+    assert decode(code).rows == 25
+    with pytest.raises(ValueError):
+        decode(code, 24, 30)
+
+
+def test_same_key_deals_the_same_layout(monkeypatch):
+    monkeypatch.setattr("classic_board.CACHE", None)
+    key = BoardKey(16, 30, 99, 8 * 30 + 15, 4242)
+    layouts = set()
+    saved = random.getstate()
+    try:
+        for global_seed in range(3):
+            random.seed(global_seed)  # the layout must not depend on the global RNG
+            board = Board(key.rows, key.cols, key.mines, seed=key.seed)
+            board.reveal(*divmod(key.first_click, key.cols))
+            assert board_code.key_of(board) == key
+            layouts.add(cell_planes(board)[0])
+    finally:
+        random.setstate(saved)
+    assert len(layouts) == 1
+
+
+def test_daily_seed():
+    assert board_code.daily_seed(datetime.date(2026, 10, 17)) == 20261017
@@ -0,0 +1,64 @@
+import os
+
+from chunked_board import ChunkedBoard
+
+SIZE = 8
+
+
+def chunk_cells(board, cr, cc):
+    return [board.cell(r, c) for r in range(cr * SIZE, (cr + 1) * SIZE)
+            for c in range(cc * SIZE, (cc + 1) * SIZE)]
+
+
+def test_same_seed_and_coordinates_give_the_same_chunk():
+    coords = [(0, 0), (0, 1), (-1, 0), (-3, 7), (1000, -1000)]
+    a = ChunkedBoard(0.2, seed=42, chunk_size=SIZE)
+    b = ChunkedBoard(0.2, seed=42, chunk_size=SIZE)
+    for cr, cc in reversed(coords):  # built in a different order
+        b._chunk(cr, cc)
+    for cr, cc in coords:
+        chunk_a, chunk_b = a._chunk(cr, cc), b._chunk(cr, cc)
+        assert chunk_a.mines == chunk_b.mines and chunk_a.adj == chunk_b.adj
+        assert sum(chunk_a.mines) == a.mines_per_chunk
+
+    layouts = {bytes(a._layout(cr, cc)) for cr, cc in coords}
+    assert len(layouts) == len(coords)
+    other = ChunkedBoard(0.2, seed=43, chunk_size=SIZE)
+    assert all(bytes(other._layout(cr, cc)) not in layouts for cr, cc in coords)
+
+    # The first click moves mines out of its zone the same way on both boards.
+    a.reveal_cell(3, 3)
+    b.reveal_cell(3, 3)
+    for cr, cc in coords:
+        assert chunk_cells(a, cr, cc) == chunk_cells(b, cr, cc)
+
+
+def test_spilled_chunk_round_trips_through_the_cold_store(tmp_path):
+    spill_dir = str(tmp_path / "spill")
+    board = ChunkedBoard(0.2, seed=7, chunk_size=SIZE, max_chunks=1, spill_dir=spill_dir)
+    board.reveal_cell(3, 3)
+    board.toggle_flag(-5, -5)
+    touched = [(0, 0), (-1, -1)]
+    before = {key: chunk_cells(board, *key) for key in touched}
+    assert any(cell.revealed for cell in before[(0, 0)])
+    assert before[(-1, -1)][3 * SIZE + 3].flagged
+
+    board.toggle_flag(40 * SIZE, 40 * SIZE)  # far away: everything else goes cold
+    assert board.live_chunks() == 1
+    assert set(touched) <= board._spilled
+    assert len(os.listdir(spill_dir)) == len(board._spilled)
+
+    for key in touched:
+        assert chunk_cells(board, *key) == before[key]
+        assert key not in board._spilled
+
+
+def test_own_spill_dir_is_removed_on_close():
+    board = ChunkedBoard(0.2, seed=7, chunk_size=SIZE, max_chunks=1, max_cold=0)
+    board.toggle_flag(0, 0)
+    board.toggle_flag(10 * SIZE, 0)
+    spill_dir = board.spill_dir
+    assert spill_dir and os.listdir(spill_dir)
+    assert board.cell(0, 0).flagged
+    board.close()
+    assert not os.path.exists(spill_dir)
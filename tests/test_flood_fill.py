@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+import savefile
+from classic_board import Board
+from tests.helpers import ENGINE_IDS, ENGINES, cell_planes, cell_state, reference_fill
+
+# Sizes include single rows and columns, where a scanline run is the whole line.
+SIZES = [(1, 1), (1, 40), (40, 1), (9, 9), (30, 50)]
+DENSITIES = [0.0, 0.02, 0.1, 0.2]
+
+
+def dealt(rows, cols, density, seed):
+    """A classic_board.Board with its mines placed; other engines load its layout."""
+    board = Board(rows, cols, int(rows * cols * density), seed=seed)
+    board.place_mines(rows // 2, cols // 2)
+    return board
+
+
+def set_revealed(board, i):
+    if hasattr(board, "_revealed_buf"):
+        board._revealed_buf[i] = 1
+    else:
+        board._cells[i].revealed = True
+
+
+@pytest.mark.parametrize("board_cls, reveal", ENGINES, ids=ENGINE_IDS)
+def test_scanline_matches_stack_fill(board_cls, reveal):
+    for rows, cols in SIZES:
+        for density in DENSITIES:
+            for seed in range(3):
+                source = dealt(rows, cols, density, seed)
+                board, _ = savefile.loads(savefile.dumps(source), board_cls)
+                state = cell_state(board)
+                zeros = [i for i in range(rows * cols) if state[2][i] and not state[1][i]]
+                if not zeros:
+                    continue
+                start = random.Random(seed).choice(zeros)
+                hidden_safe = board._hidden_safe
+
+                state[0][start] = 1
+                expected = reference_fill(board, start, state)
+                expected_safe, board._hidden_safe = board._hidden_safe, hidden_safe
+
+                set_revealed(board, start)
+                changed = board._flood_fill(*divmod(start, cols))
+                assert sorted(changed) == sorted(expected)
+                assert cell_planes(board)[1] == bytes(state[0])
+                assert board._hidden_safe == expected_safe
+
+
+def test_engines_open_the_same_cells():
+    rng = random.Random(7)
+    for rows, cols in SIZES:
+        for density in DENSITIES:
+            source = dealt(rows, cols, density, rng.getrandbits(32))
+            clicks = [(rng.randrange(rows), rng.randrange(cols)) for _ in range(5)]
+            results = set()
+            for board_cls, reveal in ENGINES:
+                board, _ = savefile.loads(savefile.dumps(source), board_cls)
+                for r, c in clicks:
+                    if not board.game_over:
+                        getattr(board, reveal)(r, c)
+                results.add((cell_planes(board)[1], board._hidden_safe, board.game_over))
+            assert len(results) == 1
@@ -0,0 +1,54 @@
+import random
+
+import grid_utils
+from classic_board import first_click_zone
+from grid_utils import adjacency_counts, neighbor_table, sample_mines
+
+SHAPES = [(1, 1), (1, 7), (7, 1), (2, 2), (9, 9), (16, 30), (30, 16)]
+
+
+def naive_neighbors(rows, cols, r, c):
+    return [(r + dr) * cols + c + dc
+            for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+            if (dr or dc) and 0 <= r + dr < rows and 0 <= c + dc < cols]
+
+
+def test_adjacency_counts_match_brute_force():
+    rng = random.Random(5)
+    for rows, cols in SHAPES:
+        for density in (0.0, 0.2, 0.6, 1.0):
+            mines = [rng.random() < density for _ in range(rows * cols)]
+            want = [-1 if mines[r * cols + c] else
+                    sum(mines[j] for j in naive_neighbors(rows, cols, r, c))
+                    for r in range(rows) for c in range(cols)]
+            assert adjacency_counts(mines, rows, cols) == want
+
+
+def test_neighbor_table_matches_naive_loop():
+    for rows, cols in SHAPES + [(1, 40), (40, 1)]:
+        offsets, indices = neighbor_table(rows, cols)
+        assert len(offsets) == rows * cols + 1 and offsets[-1] == len(indices)
+        for r in range(rows):
+            for c in range(cols):
+                i = r * cols + c
+                got = list(indices[offsets[i]:offsets[i + 1]])
+                assert sorted(got) == naive_neighbors(rows, cols, r, c)
+
+
+def test_sample_mines_avoids_the_first_click_zone():
+    rng = random.Random(9)
+    for rows, cols in [(9, 9), (16, 30), (1, 20)]:
+        for density in (0.05, 0.3, 0.7, 1.0):  # rejection below the threshold, shuffle above
+            zone = first_click_zone(rows, cols, rng.randrange(rows), rng.randrange(cols))
+            allowed = rows * cols - len(zone)
+            count = int(allowed * density)
+            assert (count > allowed * grid_utils.DENSE_PLACEMENT_THRESHOLD) == (density > 0.5)
+            for _ in range(20):
+                mines = sample_mines(rows * cols, count, zone, rng)
+                assert len(mines) == len(set(mines)) == count
+                assert all(0 <= i < rows * cols and i not in zone for i in mines)
+
+
+def test_sample_mines_caps_count_at_the_allowed_cells():
+    mines = sample_mines(9, 20, {0, 1, 3, 4}, random.Random(0))
+    assert sorted(mines) == [2, 5, 6, 7, 8]
@@ -0,0 +1,63 @@
+import math
+import random
+
+import hints
+
+
+def layout_component(seed, cells=60, density=0.25):
+    """Overlapping constraints read off a random layout, so they are satisfiable."""
+    rng = random.Random(seed)
+    mines = {i for i in range(cells) if rng.random() < density}
+    component = []
+    for start in range(0, cells - 4, 3):
+        window = range(max(0, start - 3), min(cells, start + 8))
+        members = frozenset(rng.sample(window, 5)) | {start, start + 1}
+        component.append((members, len(members & mines)))
+    return component
+
+
+def test_sampled_fallback_matches_exact_enumeration(monkeypatch):
+    seeds = (0, 2, 3)
+    components = [layout_component(seed) for seed in seeds]
+    exact = [hints.solve_component(component) for component in components]
+    assert all(solved[3] for solved in exact)
+    monkeypatch.setattr(hints, "EXACT_NODE_LIMIT", 0)
+    monkeypatch.setattr(hints, "SAMPLES", 3000)
+
+    for seed, component, want in zip(seeds, components, exact):
+        got = hints.solve_component(component, rng=random.Random(seed))
+        assert not got[3] and got[0] == want[0]
+
+        # Solution counts per number of mines are exact, up to a common factor.
+        want_total, got_total = sum(want[1].values()), sum(got[1].values())
+        assert want[1].keys() == got[1].keys()
+        for k, count in want[1].items():
+            assert math.isclose(got[1][k] / got_total, count / want_total)
+
+        likeliest = max(want[1], key=want[1].get)
+        for interior, mines_left in ((0, likeliest), (100, 30)):
+            want_p, _ = hints.probabilities([want], interior, mines_left)
+            got_p, _ = hints.probabilities([got], interior, mines_left)
+            for cell, p in want_p.items():
+                assert abs(got_p[cell] - p) < 0.05
+
+
+def test_huge_solution_counts_stay_finite(monkeypatch):
+    # One mine in each of 1100 pairs, the pairs chained by constraints
+    # that always hold: 2 ** 1100 solutions, more than a float holds.
+    pairs = 1100
+    component = [(frozenset({2 * i, 2 * i + 1}), 1) for i in range(pairs)]
+    component += [(frozenset(range(2 * i, 2 * i + 4)), 2) for i in range(pairs - 1)]
+    monkeypatch.setattr(hints, "EXACT_NODE_LIMIT", 0)
+    solved = hints.solve_component(component)
+    assert list(solved[1]) == [pairs]
+    cell_p, _ = hints.probabilities([solved], 0, pairs)
+    assert all(0.2 < p < 0.8 for p in cell_p.values())
+
+
+def test_budget_exceeded_gives_no_hint(monkeypatch):
+    monkeypatch.setattr(hints, "EXACT_NODE_LIMIT", 0)
+    monkeypatch.setattr(hints, "SAMPLE_STATE_LIMIT", 10)
+    solved = hints.solve_component(layout_component(0))
+    assert not solved[3]
+    assert hints.probabilities([solved], 10, 5) is None
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from history import STEP_OVERHEAD, History
+from classic_board import Board
+from tests.helpers import ENGINE_IDS, ENGINES, cell_planes, state
+
+
+def visible(board):
+    return state(board) + (getattr(board, "first_click", None),)
+
+
+@pytest.mark.parametrize("board_cls, reveal", ENGINES, ids=ENGINE_IDS)
+def test_undo_redo_restores_state_and_counters(board_cls, reveal, monkeypatch):
+    monkeypatch.setattr(board_cls, "debug", True)  # cross-check counters after every move
+    rng = random.Random(1)
+    for game in range(20):
+        rows, cols, mines = rng.choice([(9, 9, 10), (16, 30, 99), (30, 30, 100)])
+        board = board_cls(rows, cols, mines, seed=game)
+        history = History(board)
+        actions = [getattr(board, reveal), board.toggle_flag, board.chord]
+        states, pos = [visible(board)], 0  # states along the undo line
+        for _ in range(200):
+            x = rng.random()
+            if x < 0.2 and history.can_undo():
+                assert history.undo()
+                pos -= 1
+            elif x < 0.3 and history.can_redo():
+                assert history.redo()
+                pos += 1
+            elif not board.game_over:
+                r, c = rng.randrange(rows), rng.randrange(cols)
+                if history.do(rng.choice(actions), r, c):
+                    pos += 1
+                    del states[pos:]
+                    states.append(visible(board))
+            assert visible(board) == states[pos]
+            board._verify_counters()
+            assert history.can_undo() == (pos > 0)
+            assert history.can_redo() == (pos < len(states) - 1)
+
+
+def test_undoing_the_first_click_takes_the_mines_back():
+    board = Board(9, 9, 10, seed=3)
+    history = History(board)
+    history.do(board.toggle_flag, 0, 0)
+    history.do(board.reveal, 4, 4)
+    dealt = cell_planes(board)[0]
+    assert history.undo()
+    assert not board.mines_placed and board.first_click is None
+    assert not any(cell_planes(board)[0]) and board._hidden_safe == 81
+    assert board.grid[0][0].flagged
+
+    assert history.redo()
+    assert board.first_click == 4 * 9 + 4 and cell_planes(board)[0] == dealt
+    history.undo()
+    history.do(board.reveal, 8, 8)  # a new first click is safe again
+    assert board.first_click == 8 * 9 + 8 and board.grid[8][8].adj == 0
+
+
+def test_nothing_to_undo_or_redo():
+    board_cls, _ = ENGINES[0]
+    history = History(board_cls(9, 9, 10))
+    assert history.undo() == [] and history.redo() == []
+    assert history.bytes == 0
+
+
+def test_byte_budget_drops_oldest_steps():
+    board_cls, _ = ENGINES[0]
+    board = board_cls(10, 10, 0)
+    history = History(board, max_bytes=10 * (STEP_OVERHEAD + 4))
+    for col in range(10):
+        history.do(board.toggle_flag, 0, col)
+    assert history.bytes == 10 * (STEP_OVERHEAD + 4)
+    history.do(board.toggle_flag, 1, 0)
+    assert history.bytes == 10 * (STEP_OVERHEAD + 4)
+    undone = 0
+    while history.undo():
+        undone += 1
+    assert undone == 10 and history.bytes == 0
+    assert board._flag_count == 1  # the first flag can no longer be undone
+    assert cell_planes(board)[2][0]
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+import replay
+from solver import Solver
+from tests.helpers import ENGINE_IDS, ENGINES, cell_planes, state
+
+
+def record_game(board, reveal, path, rng):
+    """Play one solver-guided game to the end, recording every move."""
+    recorder = replay.Recorder(path, board)
+    actions = {replay.REVEAL: getattr(board, reveal), replay.FLAG: board.toggle_flag,
+               replay.CHORD: board.chord}
+
+    def move(action, r, c):
+        changed = actions[action](r, c)
+        if changed:
+            recorder.record(action, r, c)
+        return changed
+
+    solver = Solver(board)
+    solver.update(move(replay.REVEAL, board.rows // 2, board.cols // 2))
+    while not board.game_over:
+        x = rng.random()
+        if solver.mines and x < 0.3:
+            changed = move(replay.FLAG, *divmod(solver.mines.pop(), board.cols))
+        elif x < 0.4:
+            changed = move(replay.CHORD, rng.randrange(board.rows), rng.randrange(board.cols))
+        elif solver.safe:
+            changed = move(replay.REVEAL, *divmod(solver.safe.pop(), board.cols))
+        else:
+            changed = move(replay.REVEAL, rng.randrange(board.rows), rng.randrange(board.cols))
+        solver.update(changed)
+    recorder.close()
+
+
+@pytest.mark.parametrize("board_cls, reveal", ENGINES, ids=ENGINE_IDS)
+def test_playback_matches_the_game(board_cls, reveal, tmp_path):
+    rng = random.Random(5)
+    for game, (rows, cols, mines) in enumerate([(9, 9, 10), (16, 30, 99), (40, 60, 400)]):
+        board = board_cls(rows, cols, mines, seed=game)
+        path = str(tmp_path / f"game-{game}.msr")
+        record_game(board, reveal, path, rng)
+
+        final = replay.Replay.load(path).play()
+        assert cell_planes(final)[:3] == cell_planes(board)[:3]
+        assert (final.game_over, final.victory) == (board.game_over, board.victory)
+
+
+def test_seek_matches_stepping(tmp_path, monkeypatch):
+    monkeypatch.setattr(replay, "KEYFRAME_EVERY", 8)
+    board_cls, reveal = ENGINES[0]
+    path = str(tmp_path / "game.msr")
+    record_game(board_cls(40, 60, 400, seed=1), reveal, path, random.Random(1))
+
+    playback = replay.Replay.load(path)
+    states = [state(playback.board)]
+    while playback.position < len(playback.moves):
+        playback.step()
+        states.append(state(playback.board))
+    rng = random.Random(2)
+    for _ in range(30):
+        position = rng.randrange(len(states))
+        playback.seek(position)
+        assert state(playback.board) == states[position]
+
+
+def test_torn_log_plays_up_to_the_tear(tmp_path):
+    board_cls, reveal = ENGINES[0]
+    path = str(tmp_path / "game.msr")
+    record_game(board_cls(16, 30, 99, seed=3), reveal, path, random.Random(3))
+    with open(path, "rb") as f:
+        data = f.read()
+    moves = len(replay.Replay(data).moves)
+    for cut in (len(data) - 1, len(data) - 3):
+        torn = replay.Replay(data[:cut])
+        assert len(torn.moves) < moves
+        torn.play()
+
+
+def test_not_a_replay_log():
+    for bad in (b"", b"XXXX" + bytes(40)):
+        with pytest.raises(ValueError):
+            replay.Replay(bad)
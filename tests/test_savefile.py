@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+import savefile
+from classic_board import Board
+from tests.helpers import ENGINE_IDS, ENGINES, play_randomly, state
+
+SIZES = [(1, 1, 0), (3, 5, 2), (9, 9, 10), (16, 30, 99), (7, 13, 30)]
+
+
+@pytest.mark.parametrize("board_cls, reveal", ENGINES, ids=ENGINE_IDS)
+@pytest.mark.parametrize("adjacency", [False, True])
+def test_round_trip(board_cls, reveal, adjacency):
+    rng = random.Random(3)
+    for rows, cols, mines in SIZES:
+        for moves in (0, 3, 40):
+            board = board_cls(rows, cols, mines, seed=rng.getrandbits(32))
+            play_randomly(board, reveal, rng, moves)
+            loaded, header = savefile.loads(savefile.dumps(board, 12.5, adjacency), board_cls)
+            assert state(loaded) == state(board)
+            assert loaded.seed == board.seed
+            assert header == (rows, cols, mines, board.seed, 12.5)
+
+
+def test_first_click_survives():
+    board = Board(16, 30, 99, seed=7)
+    board.reveal(4, 11)
+    loaded, _ = savefile.loads(savefile.dumps(board), Board)
+    assert loaded.first_click == board.first_click == 4 * 30 + 11
+    assert loaded.mines_placed
+
+    fresh, _ = savefile.loads(savefile.dumps(Board(9, 9, 10)), Board)
+    assert fresh.first_click is None and not fresh.mines_placed
+
+
+def test_flags_before_the_first_click_survive():
+    board = Board(9, 9, 10)
+    board.toggle_flag(0, 0)
+    board.toggle_flag(4, 7)
+    loaded, _ = savefile.loads(savefile.dumps(board), Board)
+    assert not loaded.mines_placed
+    assert loaded.grid[0][0].flagged and loaded.grid[4][7].flagged
+    assert loaded._flag_count == 2
+    assert state(loaded) == state(board)
+
+
+@pytest.mark.parametrize("count", [9, 12, 14])
+def test_adjacency_out_of_range_rejected(count):
+    board = Board(9, 9, 10, seed=1)
+    board.reveal(4, 4)
+    board.grid[0][0].adj = count
+    with pytest.raises(ValueError):
+        savefile.loads(savefile.dumps(board, adjacency=True), Board)
+
+
+def test_damaged_files_raise_value_error():
+    board = Board(16, 30, 99, seed=11)
+    board.reveal(8, 15)
+    data = savefile.dumps(board, adjacency=True)
+    rng = random.Random(0)
+    damaged = [data[:cut] for cut in range(len(data))]
+    for _ in range(500):
+        flipped = bytearray(data)
+        flipped[rng.randrange(len(data))] ^= 1 << rng.randrange(8)
+        damaged.append(bytes(flipped))
+    for bad in damaged:
+        try:
+            savefile.loads(bad, Board)
+        except ValueError:
+            pass
+
+
+def test_oversized_header_rejected():
+    data = bytearray(savefile.dumps(Board(9, 9, 10)))
+    savefile._HEADER.pack_into(data, 0, savefile.MAGIC, savefile.VERSION, 0,
+                               100_000, 100_000, 10, 0, 0.0, 0, 0)
+    with pytest.raises(ValueError):
+        savefile.loads(bytes(data), Board)
+
+
+def test_save_and_load_through_mmap(tmp_path, monkeypatch):
+    monkeypatch.setattr(savefile, "MMAP_THRESHOLD", 0)
+    board = Board(40, 60, 400, seed=5)
+    board.reveal(20, 30)
+    path = str(tmp_path / "game.sav")
+    savefile.save(path, board, 3.0)
+    loaded, header = savefile.load(path, Board)
+    assert state(loaded) == state(board) and header.elapsed == 3.0
+
+    with open(path, "r+b") as f:
+        f.truncate(40)
+    with pytest.raises(ValueError):
+        savefile.load(path, Board)
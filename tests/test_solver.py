@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from solver import Solver
+from tests.helpers import ENGINE_IDS, ENGINES, cell_planes
+
+
+@pytest.mark.parametrize("board_cls, reveal", ENGINES, ids=ENGINE_IDS)
+def test_deductions_are_sound(board_cls, reveal):
+    """Play solver-guided games; every proven cell must be what the solver says."""
+    rng = random.Random(2024)
+    wins = 0
+    for game in range(30):
+        rows, cols, mines = rng.choice([(9, 9, 10), (16, 16, 40), (16, 30, 99)])
+        board = board_cls(rows, cols, mines, seed=game)
+        solver = Solver(board)
+        solver.update(getattr(board, reveal)(rows // 2, cols // 2))
+        while not board.game_over:
+            is_mine = cell_planes(board)[0]
+            assert not any(is_mine[i] for i in solver.safe)
+            assert all(is_mine[i] for i in solver.mines)
+            if solver.mines:
+                changed = board.toggle_flag(*divmod(min(solver.mines), cols))
+            elif solver.safe:
+                changed = getattr(board, reveal)(*divmod(min(solver.safe), cols))
+                assert not board.game_over or board.victory
+            else:
+                _, revealed, flagged, _ = cell_planes(board)
+                hidden = [i for i in range(rows * cols) if not revealed[i] and not flagged[i]]
+                changed = getattr(board, reveal)(*divmod(rng.choice(hidden), cols))
+            solver.update(changed)
+        wins += board.victory
+    assert wins  # the guesses aren't all unlucky on a fixed seed
+
+
+def test_rebuild_matches_incremental_updates():
+    board_cls, reveal = ENGINES[0]
+    board = board_cls(16, 30, 99, seed=99)
+    solver = Solver(board)
+    solver.update(getattr(board, reveal)(8, 15))
+    assert solver.safe
+    while solver.safe and not board.game_over:
+        solver.update(getattr(board, reveal)(*divmod(min(solver.safe), 30)))
+        fresh = Solver(board)
+        assert (fresh.safe, fresh.mines) == (solver.safe, solver.mines)
@@ -0,0 +1,105 @@
+"""Scrollable camera onto a board grid, shared by both front-ends."""
+
+MIN_CELL_SIZE = 16
+PAN_STEP = 24  # pixels per arrow-key press / held frame
+
+
+class Camera:
+    """
+    Maps between screen pixels and board cells for a grid that may be
+    larger than the window.
+
+    (x, y) is the pixel offset of the view into the full grid
+    (cols * cell_size by rows * cell_size) and is clamped so the view never
+    leaves the board. The view itself is view_w x view_h pixels, drawn at
+    the screen position `origin`. With rows and cols None the grid is
+    endless (chunked_board.ChunkedBoard): nothing is clamped and rows and
+    columns may be negative.
+    """
+
+    def __init__(self, rows: int, cols: int, cell_size: int,
+                 view_w: int, view_h: int, origin=(0, 0)):
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.view_w = view_w
+        self.view_h = view_h
+        self.origin = origin
+        self.x = 0
+        self.y = 0
+
+    @property
+    def endless(self) -> bool:
+        return self.rows is None
+
+    @property
+    def grid_w(self) -> int:
+        return self.view_w if self.endless else self.cols * self.cell_size
+
+    @property
+    def grid_h(self) -> int:
+        return self.view_h if self.endless else self.rows * self.cell_size
+
+    def resize(self, view_w: int, view_h: int, origin=None, cell_size=None):
+        if origin is not None:
+            self.origin = origin
+        if cell_size is not None:
+            self.cell_size = cell_size
+        self.view_w = view_w
+        self.view_h = view_h
+        self._clamp()
+
+    def _clamp(self):
+        if self.endless:
+            return
+        self.x = max(0, min(self.x, self.grid_w - self.view_w))
+        self.y = max(0, min(self.y, self.grid_h - self.view_h))
+
+    def pan(self, dx: int, dy: int) -> bool:
+        """Scroll by (dx, dy) pixels; returns True if the view moved."""
+        old = (self.x, self.y)
+        self.x += dx
+        self.y += dy
+        self._clamp()
+        return (self.x, self.y) != old
+
+    def center_on(self, row: int, col: int):
+        self.x = col * self.cell_size + self.cell_size // 2 - self.view_w // 2
+        self.y = row * self.cell_size + self.cell_size // 2 - self.view_h // 2
+        self._clamp()
+
+    def scrollable(self) -> bool:
+        return self.endless or self.grid_w > self.view_w or self.grid_h > self.view_h
+
+    def visible_range(self):
+        """(first_row, end_row, first_col, end_col) of the cells in view, end exclusive."""
+        cs = self.cell_size
+        r0 = self.y // cs
+        c0 = self.x // cs
+        r1 = -(-(self.y + self.view_h) // cs)
+        c1 = -(-(self.x + self.view_w) // cs)
+        if not self.endless:
+            r1, c1 = min(self.rows, r1), min(self.cols, c1)
+        return r0, r1, c0, c1
+
+    def view_rect(self):
+        """(x, y, w, h) of the on-screen area the grid occupies."""
+        ox, oy = self.origin
+        return ox, oy, min(self.view_w, self.grid_w), min(self.view_h, self.grid_h)
+
+    def cell_origin(self, row: int, col: int):
+        """Screen position of the top-left corner of a cell."""
+        ox, oy = self.origin
+        return ox + col * self.cell_size - self.x, oy + row * self.cell_size - self.y
+
+    def cell_at(self, pos):
+        """Board (row, col) under a screen position, or None."""
+        ox, oy = self.origin
+        px, py = pos[0] - ox, pos[1] - oy
+        if not (0 <= px < min(self.view_w, self.grid_w) and 0 <= py < min(self.view_h, self.grid_h)):
+            return None
+        row = (py + self.y) // self.cell_size
+        col = (px + self.x) // self.cell_size
+        if self.endless or (0 <= row < self.rows and 0 <= col < self.cols):
+            return int(row), int(col)
+        return None